@@ -0,0 +1,241 @@
+"""
+Constant-Memory Statistics Accumulators
+=======================================
+Collect summary statistics of a sample stream without storing the samples:
+
+- SampleAccumulator: count, mean and variance (Welford), min, max and a
+  histogram for quantiles (p50/p95/p99): linear bins of BIN_WIDTH up to
+  NUM_BINS * BIN_WIDTH, log-spaced bins above, added as larger values occur,
+  so long horizons keep meaningful tail quantiles. Accumulators of parallel
+  replications can be merged. ci_halfwidth() gives the 95% confidence
+  interval of the mean, e.g. over the averages of independent replications.
+- TimeWeightedAccumulator: time average and time-in-state histogram of an
+  integer state (e.g. swimmers inside, queue length), updated only when the
+  state changes.
+
+USAGE:
+    waits = SampleAccumulator()
+    waits.add(3.5)
+    total = SampleAccumulator.merged([waits_of_experiment_1, waits_of_experiment_2])
+    print(total.mean, total.quantile(0.95))
+"""
+
+import math
+
+import numpy as np
+
+BIN_WIDTH = 0.1  # Histogram resolution (minutes for waiting times)
+NUM_BINS = 10000  # Linear bins, up to NUM_BINS * BIN_WIDTH
+BIN_GROWTH = 1.001  # Above that every bin is 0.1% wider than the one before
+
+# Two-sided 95% Student t quantiles for 1..30 degrees of freedom
+T_975 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+         2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+         2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+
+def t_quantile_975(df):
+    """0.975 quantile of Student's t distribution with df degrees of freedom"""
+    if df <= len(T_975):
+        return T_975[df - 1]
+    # Cornish-Fisher expansion around the normal quantile, within 0.001 for df > 30
+    z = 1.959964
+    return z + (z ** 3 + z) / (4 * df) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+
+
+class SampleAccumulator:
+    """Streaming count/mean/variance/min/max with a linear-then-logarithmic quantile histogram"""
+    def __init__(self, bin_width=BIN_WIDTH, num_bins=NUM_BINS, bin_growth=BIN_GROWTH):
+        self.bin_width = bin_width
+        self.num_bins = num_bins
+        self.bin_growth = bin_growth
+        self.linear_range = num_bins * bin_width
+        self._log_growth = math.log(bin_growth)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared deviations from the mean
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.bins = [0] * num_bins  # Extended by log-spaced bins when a value beyond linear_range occurs
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        index = int(value / self.bin_width)
+        if 0 <= index < self.num_bins:
+            self.bins[index] += 1
+        else:
+            self._count_outside(self._log_bin_index(value) if index > 0 else 0, 1)
+
+    def _log_bin_index(self, value):
+        # A value just at linear_range may round to a tiny negative logarithm, int() makes it 0
+        return self.num_bins + int(math.log(value / self.linear_range) / self._log_growth)
+
+    def _count_outside(self, index, count):
+        if index >= len(self.bins):
+            self.bins.extend([0] * (index + 1 - len(self.bins)))
+        self.bins[index] += count
+
+    def _bin_edges(self, index):
+        if index < self.num_bins:
+            return index * self.bin_width, (index + 1) * self.bin_width
+        lower = self.linear_range * self.bin_growth ** (index - self.num_bins)
+        return lower, lower * self.bin_growth
+
+    def add_many(self, values):
+        """Add a NumPy array of values at once"""
+        values = np.asarray(values, dtype=float)
+        if values.size == 0:
+            return
+        mean = float(values.mean())
+        self._merge_moments(int(values.size), mean, float(((values - mean) ** 2).sum()),
+                            float(values.sum()), float(values.min()), float(values.max()))
+        index = (values / self.bin_width).astype(np.int64)
+        above = index >= self.num_bins
+        if above.any():
+            index[above] = self.num_bins + (np.log(values[above] / self.linear_range) / self._log_growth).astype(np.int64)
+        index[index < 0] = 0
+        # Only touch the bins that occur in this batch
+        for bin_index, bin_count in zip(*np.unique(index, return_counts=True)):
+            self._count_outside(int(bin_index), int(bin_count))
+
+    def merge(self, other):
+        """Add the samples of another accumulator"""
+        if (other.bin_width, other.num_bins, other.bin_growth) != (self.bin_width, self.num_bins, self.bin_growth):
+            raise ValueError("Cannot merge accumulators with different histogram bins")
+        if other.count == 0:
+            return
+        self._merge_moments(other.count, other.mean, other.m2, other.sum, other.min, other.max)
+        if len(other.bins) > len(self.bins):
+            self.bins.extend([0] * (len(other.bins) - len(self.bins)))
+        for index, bin_count in enumerate(other.bins):
+            self.bins[index] += bin_count
+
+    def _merge_moments(self, count, mean, m2, total, minimum, maximum):
+        # Chan et al. parallel variance
+        new_count = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / new_count
+        self.m2 += m2 + delta * delta * self.count * count / new_count
+        self.count = new_count
+        self.sum += total
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+
+    @classmethod
+    def merged(cls, accumulators):
+        total = None
+        for accumulator in accumulators:
+            if total is None:
+                total = cls(accumulator.bin_width, accumulator.num_bins, accumulator.bin_growth)
+            total.merge(accumulator)
+        return total if total is not None else cls()
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def ci_halfwidth(self):
+        """Half width of the 95% t confidence interval of the mean, inf below 2 samples"""
+        if self.count < 2:
+            return math.inf
+        return t_quantile_975(self.count - 1) * self.std / math.sqrt(self.count)
+
+    def quantile(self, q):
+        """Approximate q-quantile, exact to within one bin (BIN_WIDTH, or 0.1% above the linear range)"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, bin_count in enumerate(self.bins):
+            if bin_count and cumulative + bin_count >= rank:
+                # Interpolate within the bin, clamped to the observed range
+                lower, upper = self._bin_edges(index)
+                value = lower + (rank - cumulative) / bin_count * (upper - lower)
+                return min(max(value, self.min), self.max)
+            cumulative += bin_count
+        return self.max
+
+    def summary(self, digits=2):
+        """Dictionary of the reported statistics"""
+        return {
+            'count': self.count,
+            'mean': round(self.mean, digits),
+            'std': round(self.std, digits),
+            'min': round(self.min, digits) if self.count else 0,
+            'max': round(self.max, digits) if self.count else 0,
+            'p50': round(self.quantile(0.5), digits),
+            'p95': round(self.quantile(0.95), digits),
+            'p99': round(self.quantile(0.99), digits),
+        }
+
+
+class TimeWeightedAccumulator:
+    """Time average and time-in-state histogram of an integer state such as occupancy
+
+    Only call update()/add() when the state changes; the time since the last
+    change is credited to the previous state. The hot path is a single list
+    update, the time average is derived from the histogram when it is read.
+    """
+    def __init__(self, max_value=0, value=0, start_time=0.0):
+        self.value = value
+        self.start_time = start_time
+        self.last_time = start_time
+        self.time_in_state = [0.0] * (max_value + 1)  # Grows if a larger state occurs
+
+    def update(self, now, value):
+        try:
+            self.time_in_state[self.value] += now - self.last_time
+        except IndexError:
+            self.time_in_state.extend([0.0] * (self.value + 1 - len(self.time_in_state)))
+            self.time_in_state[self.value] += now - self.last_time
+        self.last_time = now
+        self.value = value
+
+    def add(self, now, delta):
+        self.update(now, self.value + delta)
+
+    def finish(self, now):
+        """Credit the time up to the end of the run to the current state"""
+        self.update(now, self.value)
+
+    @property
+    def elapsed(self):
+        return self.last_time - self.start_time
+
+    @property
+    def mean(self):
+        area = sum(state * duration for state, duration in enumerate(self.time_in_state))
+        return area / self.elapsed if self.elapsed > 0 else 0.0
+
+    def time_fractions(self):
+        """Fraction of the time spent in each state 0, 1, ..., max"""
+        elapsed = self.elapsed
+        return [t / elapsed if elapsed > 0 else 0.0 for t in self.time_in_state]
+
+    def merge(self, other):
+        """Add the observation period of another run (e.g. another replication)"""
+        self.start_time -= other.elapsed  # Keep elapsed as the total observed time
+        if len(other.time_in_state) > len(self.time_in_state):
+            self.time_in_state.extend([0.0] * (len(other.time_in_state) - len(self.time_in_state)))
+        for state, duration in enumerate(other.time_in_state):
+            self.time_in_state[state] += duration
+
+    @classmethod
+    def merged(cls, accumulators):
+        total = cls()
+        for accumulator in accumulators:
+            total.merge(accumulator)
+        return total
@@ -0,0 +1,73 @@
+"""
+Admission Benchmark: polling vs event-driven waiting
+====================================================
+Runs swimmingpool_simple.py in-process with both admission modes over the same
+pool capacity / simulation duration grid as performance_test.py and reports how
+many SimPy events were processed and how long the runs took.
+
+- 'polling': every waiting customer re-checks the gate with env.timeout(1)
+- 'event':   waiting customers are woken only when the gate opens or a swimmer leaves
+
+USAGE:
+python benchmark_admission.py --num-experiments 5
+"""
+
+import argparse
+import time
+
+import swimmingpool_simple as model
+
+# Same grid as PerformanceTestRunner in performance_test.py
+POOL_CAPACITIES = [25, 50, 100, 200]
+SIM_DURATIONS = [2400, 4800, 7200, 9600, 12000]  # in minutes
+
+
+def run_mode(admission_mode, num_experiments):
+    """Run all experiments of the current configuration, return (events, milliseconds, avg wait)"""
+    model.ADMISSION_MODE = admission_mode
+    events = 0
+    elapsed = 0.0
+    avg_wait_times = []
+    for experiment in range(1, num_experiments + 1):
+        start_time = time.perf_counter()
+        stats = model.run_single_experiment(experiment)
+        elapsed += (time.perf_counter() - start_time) * 1000  # Convert to milliseconds
+        events += stats.events_processed
+        avg_wait_times.append(stats.waits.mean)
+    return events, elapsed, sum(avg_wait_times) / len(avg_wait_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark polling vs event-driven admission')
+    parser.add_argument('--num-experiments', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'Capacity':>8} {'Duration':>8} {'Events (poll)':>14} {'Events (event)':>15} "
+          f"{'Ratio':>7} {'ms (poll)':>10} {'ms (event)':>11} {'Speedup':>8} {'Wait poll/event':>16}")
+    print("-" * 105)
+
+    total_poll_ms = total_event_ms = 0.0
+    total_poll_events = total_event_events = 0
+    for capacity in POOL_CAPACITIES:
+        for duration in SIM_DURATIONS:
+            model.POOL_CAPACITY = capacity
+            model.SIM_DURATION = duration
+            poll_events, poll_ms, poll_wait = run_mode('polling', args.num_experiments)
+            event_events, event_ms, event_wait = run_mode('event', args.num_experiments)
+            total_poll_ms += poll_ms
+            total_event_ms += event_ms
+            total_poll_events += poll_events
+            total_event_events += event_events
+            print(f"{capacity:>8} {duration:>8} {poll_events:>14} {event_events:>15} "
+                  f"{poll_events / event_events:>7.2f} {poll_ms:>10.1f} {event_ms:>11.1f} "
+                  f"{poll_ms / event_ms:>7.2f}x {poll_wait:>7.2f}/{event_wait:<8.2f}")
+
+    print("-" * 105)
+    print(f"Total events: {total_poll_events} (polling) vs {total_event_events} (event), "
+          f"{total_poll_events / total_event_events:.2f}x fewer")
+    print(f"Total time: {total_poll_ms / 1000:.2f} s (polling) vs {total_event_ms / 1000:.2f} s (event), "
+          f"{total_poll_ms / total_event_ms:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
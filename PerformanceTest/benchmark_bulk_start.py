@@ -0,0 +1,57 @@
+"""
+Bulk Start Benchmark: env.process() per car vs process_bulk()
+=============================================================
+Runs cardemo_simple.py with and without --bulk, each run in its own process so that
+peak_rss_mb is the peak of that variant alone, and reports the setup time (starting
+the cars), run time and peak RSS per car count:
+
+- 'loop': every car is started up front with env.process() and parks with env.timeout()
+- 'bulk': process_bulk() of bulk_processes.py starts each car when it finishes
+          parking, with one cursor event on the event queue
+
+Both variants must simulate the same thing: their average waiting time, maximum toll
+queue, final simulated time and event count must be identical.
+
+USAGE:
+python benchmark_bulk_start.py --cars 10000 1000000 --rounds 1
+"""
+
+import argparse
+import sys
+
+from run_summary import best_of_rounds
+
+MODEL_METRICS = ['avg_cars', 'average_waiting_time', 'max_toll_queue', 'final_time', 'events_processed']
+
+
+def variant_command(cars, bulk, num_experiments):
+    """Command line of cardemo_simple.py with or without --bulk"""
+    cmd = [sys.executable, 'cardemo_simple.py', '--cars', str(cars), '--num-experiments', str(num_experiments)]
+    return cmd + ['--bulk'] if bulk else cmd
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bulk process starts in the car demo')
+    parser.add_argument('--cars', type=int, nargs='+', default=[10000, 1000000])
+    parser.add_argument('--rounds', type=int, default=1)
+    parser.add_argument('--num-experiments', type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{args.num_experiments} experiment(s) per run, best of {args.rounds} rounds")
+    print(f"{'Cars':>8} {'Variant':<8} {'Setup (ms)':>11} {'Run (ms)':>10} {'Total (ms)':>11} {'Peak RSS (MB)':>14}")
+    print("-" * 67)
+    for cars in args.cars:
+        commands = {name: variant_command(cars, bulk, args.num_experiments)
+                    for name, bulk in (('loop', False), ('bulk', True))}
+        best, last = best_of_rounds(commands, args.rounds, ['average_setup_time', 'average_time', 'peak_rss_mb'])
+        metrics = {name: {key: summary[key] for key in MODEL_METRICS} for name, summary in last.items()}
+        for name, result in best.items():
+            run_time = result['average_time'] - result['average_setup_time']
+            print(f"{cars:>8} {name:<8} {result['average_setup_time']:>11.1f} {run_time:>10.1f} "
+                  f"{result['average_time']:>11.1f} {result['peak_rss_mb']:>14.1f}")
+        if metrics['loop'] != metrics['bulk']:
+            print(f"WARNING: the simulations differ: {metrics['loop']} / {metrics['bulk']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Dish Source Benchmark: all dishes started up front vs the lazy DishSource
+=========================================================================
+Runs dishwashing_simple.py with and without --lookahead, each run in its own process
+so that peak_rss_mb is the peak of that variant alone, and reports the setup time
+(creating the DishExampleSimulation), run time and peak RSS:
+
+- 'eager': DishExampleSimulation starts a process for every dish in its constructor
+- 'lazy':  a DishSource starts the next dish whenever a pre-rinser is granted, with
+           at most --lookahead dishes waiting for one
+
+Both variants must simulate the same thing. That is checked in-process at --check-n
+dishes with logging: the order in which the dishes become clean, every step of every
+dish with its simulated time, the final simulated time and the number of clean dishes
+must be identical. (Log lines of different dishes at the same simulated time may
+interleave differently, the lazy source changes the order of events within an instant.)
+
+USAGE:
+python benchmark_dish_source.py --n 250000 --lookahead 100 --rounds 3
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'SimLuxJS', 'Performance Tests', 'Dishwashing'))
+from DishExample import DishExampleSimulation
+from run_summary import best_of_rounds
+
+PRE_RINSERS = 2
+WASHERS = 4
+RINSERS = 2
+DRIERS = 3
+
+
+def variant_command(n, lookahead):
+    """Command line of one dishwashing_simple.py experiment, with --lookahead unless it is None"""
+    cmd = [sys.executable, 'dishwashing_simple.py', '--n', str(n), '--num-experiments', '1']
+    return cmd + ['--lookahead', str(lookahead)] if lookahead is not None else cmd
+
+
+def sha256(lines):
+    return hashlib.sha256("\n".join(lines).encode()).hexdigest()
+
+
+def check_variant(n, lookahead):
+    """(clean order hash, dish steps hash, final simulated time, clean dishes) of one simulation with logging"""
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        sim = DishExampleSimulation(n, PRE_RINSERS, WASHERS, RINSERS, DRIERS, True, lookahead)
+        sim.run()
+    lines = []
+    for line in log.getvalue().splitlines():
+        # The same simulated time is an int in one variant and a float in the other at times
+        time_text, _, message = line.partition(': ')
+        lines.append(f"{float(time_text)}: {message}")
+    clean_order = [line for line in lines if line.endswith("is completely clean.")]
+    return sha256(clean_order), sha256(sorted(lines)), sim.env.now, sim.cleanDishes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the lazy dish source of DishExample.py')
+    parser.add_argument('--n', type=int, default=250000)
+    parser.add_argument('--lookahead', type=int, default=100)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--check-n', type=int, default=20000)
+    args = parser.parse_args()
+    if args.lookahead < 1:
+        parser.error("--lookahead must be at least 1")
+
+    eager = check_variant(args.check_n, None)
+    lazy = check_variant(args.check_n, args.lookahead)
+    print(f"Check with {args.check_n} dishes (eager / lazy): clean order sha256 {eager[0][:16]} / {lazy[0][:16]}, "
+          f"dish steps sha256 {eager[1][:16]} / {lazy[1][:16]}, final time {eager[2]} / {lazy[2]}, "
+          f"{eager[3]} / {lazy[3]} clean dishes")
+    if eager != lazy:
+        print("WARNING: the eager and the lazy simulation differ")
+
+    commands = {'eager': variant_command(args.n, None), 'lazy': variant_command(args.n, args.lookahead)}
+    best, last = best_of_rounds(commands, args.rounds, ['average_setup_time', 'average_time', 'peak_rss_mb'])
+    for name, summary in last.items():
+        best[name]['final_time'] = summary['final_time']
+
+    print(f"\n{args.n} dishes, lookahead {args.lookahead}, best of {args.rounds} rounds")
+    print(f"{'Variant':<8} {'Setup (ms)':>11} {'Run (ms)':>10} {'Total (ms)':>11} {'Peak RSS (MB)':>14} {'Final time':>11}")
+    print("-" * 70)
+    for name, result in best.items():
+        run_time = result['average_time'] - result['average_setup_time']
+        print(f"{name:<8} {result['average_setup_time']:>11.1f} {run_time:>10.1f} {result['average_time']:>11.1f} "
+              f"{result['peak_rss_mb']:>14.1f} {result['final_time']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark Harness
+=================
+Times the replications of a model the same way for every script, so that run times
+can be compared across models, sizes and garbage collector settings:
+
+- Every replication builds a fresh model (setup, e.g. a new environment with all its
+  entities) and runs it; both are timed with time.perf_counter_ns(). Nothing carries
+  over from one replication to the next: the previous model is dropped and collected
+  before the next one is built, outside the timed section.
+- Warm-up replications run first and are not reported.
+- gc_mode 'on' leaves Python's cyclic garbage collector as it is, 'off' disables it
+  during each replication (gc.disable()), 'freeze' moves everything that exists before
+  the replication into the permanent generation (gc.freeze()), so that collections
+  during the run only scan the model's own objects.
+- time_stats() gives mean, min and stdev in milliseconds.
+
+cardemo_simple.py and dishwashing_simple.py time their experiments with it (--warmup,
+--gc), and so do cardemo_perftest.py and DishExample.testPerformance() in
+SimLuxJS/Performance Tests. Run as a script, it reports setup, run and total time per n
+for one of the first two.
+
+USAGE:
+    times = time_replications(lambda: DishExampleSimulation(n, 2, 4, 2, 3, False), lambda sim: sim.run(),
+                              replications=10, warmup=2, gc_mode='freeze')
+    print(time_stats([setup_time + run_time for setup_time, run_time in times]))
+
+python benchmark_harness.py --model car --n 10000 100000 --replications 10 --warmup 2 --gc on off freeze
+OPTIONS:
+--model: 'car' (cardemo_simple.py, n cars) or 'dish' (dishwashing_simple.py, n dishes)
+--n: Model sizes to time (default: 1000 10000 100000)
+--replications: Measured replications per n and GC mode (default: 10)
+--warmup: Replications run and discarded before them (default: 2)
+--gc: GC modes to compare (default: on)
+"""
+
+import argparse
+import gc
+import statistics
+import time
+
+GC_MODES = ['on', 'off', 'freeze']
+
+
+def time_replication(setup, run, gc_mode='on'):
+    """(setup time, run time) in nanoseconds and the model of one replication of run(setup())"""
+    gc.collect()  # The garbage of earlier replications is not this one's cost
+    if gc_mode == 'off':
+        gc.disable()
+    elif gc_mode == 'freeze':
+        gc.freeze()
+    try:
+        start_time = time.perf_counter_ns()
+        model = setup()
+        setup_end_time = time.perf_counter_ns()
+        run(model)
+        end_time = time.perf_counter_ns()
+    finally:
+        if gc_mode == 'off':
+            gc.enable()
+        elif gc_mode == 'freeze':
+            gc.unfreeze()
+    return setup_end_time - start_time, end_time - setup_end_time, model
+
+
+def time_replications(setup, run, replications, warmup=0, gc_mode='on', collect=None):
+    """
+    [(setup time, run time)] in nanoseconds of the replications after the warm-up ones.
+    collect(model) is called with each measured model, e.g. to keep its statistics.
+    """
+    if gc_mode not in GC_MODES:
+        raise ValueError(f"Unknown GC mode {gc_mode!r}, expected one of {GC_MODES}")
+    for _ in range(warmup):
+        time_replication(setup, run, gc_mode)
+    times = []
+    for _ in range(replications):
+        setup_time, run_time, model = time_replication(setup, run, gc_mode)
+        if collect is not None:
+            collect(model)
+        del model  # Collected before the next replication
+        times.append((setup_time, run_time))
+    return times
+
+
+def time_stats(times):
+    """mean, min and stdev in milliseconds of times in nanoseconds"""
+    return {
+        'mean': round(statistics.fmean(times) / 1e6, 3),
+        'min': round(min(times) / 1e6, 3),
+        'stdev': round(statistics.stdev(times) / 1e6, 3) if len(times) > 1 else 0.0,
+    }
+
+
+def model_functions(model, n):
+    """(setup, run) of n cars or dishes with the defaults of cardemo_simple.py/dishwashing_simple.py"""
+    if model == 'car':
+        import cardemo_simple
+        cardemo_simple.CARS = n
+        return cardemo_simple.setup_experiment, cardemo_simple.run_experiment
+    import dishwashing_simple
+    dishwashing_simple.N = n
+    return dishwashing_simple.setup_experiment, dishwashing_simple.run_experiment
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time fresh replications of the car or dish model per n')
+    parser.add_argument('--model', choices=['car', 'dish'], default='car')
+    parser.add_argument('--n', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--replications', type=int, default=10)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--gc', choices=GC_MODES, nargs='+', default=['on'])
+    args = parser.parse_args()
+    if args.replications < 1 or args.warmup < 0:
+        parser.error("--replications must be at least 1 and --warmup at least 0")
+
+    print(f"Model {args.model}, {args.replications} replications after {args.warmup} warm-up, times in ms")
+    print(f"{'n':>8} {'GC':<7} {'Setup mean':>11} {'Run mean':>10} {'Total mean':>11} {'Total min':>10} {'Total stdev':>12}")
+    print("-" * 75)
+    for n in args.n:
+        setup, run = model_functions(args.model, n)
+        for gc_mode in args.gc:
+            times = time_replications(setup, run, args.replications, args.warmup, gc_mode)
+            setup_stats = time_stats([setup_time for setup_time, _ in times])
+            run_stats = time_stats([run_time for _, run_time in times])
+            total_stats = time_stats([setup_time + run_time for setup_time, run_time in times])
+            print(f"{n:>8} {gc_mode:<7} {setup_stats['mean']:>11.1f} {run_stats['mean']:>10.1f} "
+                  f"{total_stats['mean']:>11.1f} {total_stats['min']:>10.1f} {total_stats['stdev']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
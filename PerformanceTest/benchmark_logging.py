@@ -0,0 +1,90 @@
+"""
+Logging Benchmark: per-message file writes vs buffered log sink
+===============================================================
+Runs swimmingpool.py in-process in each OUTPUT_MODE ('console', 'file', 'none')
+with two logging implementations and reports the run times:
+
+- 'current': the previous log_message, which formats every message even when
+             logging is off and opens/appends/closes LOG_FILE once per message
+- 'sink':    messages are only formatted when logging is on, and file mode writes
+             through the batched background LogSink of log_sink.py
+
+Console output is sent to os.devnull, the log files to a temporary directory.
+For file mode the two implementations must write identical files.
+
+USAGE:
+python benchmark_logging.py --num-experiments 5 --rounds 3
+"""
+
+import argparse
+import contextlib
+import filecmp
+import os
+import tempfile
+import time
+
+import swimmingpool as model
+
+OUTPUT_MODES = ['console', 'file', 'none']
+sink_log_message = model.log_message
+
+
+def current_log_message(message):
+    """log_message as it was before the LogSink"""
+    if model.OUTPUT_MODE == 'console':
+        print(message)
+    elif model.OUTPUT_MODE == 'file':
+        with open(model.LOG_FILE, 'a', encoding='utf-8') as f:
+            f.write(message + '\n')
+
+
+def run_variant(output_mode, implementation, num_experiments, log_file):
+    """Run time of all experiments in milliseconds"""
+    model.OUTPUT_MODE = output_mode
+    model.LOG_FILE = log_file
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        if implementation == 'current':
+            model.log_message = current_log_message
+            model.LOGGING = True  # Messages used to be formatted in every mode
+            model.log_sink = None
+            if output_mode == 'file':
+                open(log_file, 'w', encoding='utf-8').close()
+        else:
+            model.log_message = sink_log_message
+            model.initialize_logging()
+        start_time = time.perf_counter()
+        try:
+            for experiment in range(1, num_experiments + 1):
+                model.run_single_experiment(experiment)
+        finally:
+            model.finish_logging()
+        return (time.perf_counter() - start_time) * 1000  # Convert to milliseconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the logging modes of swimmingpool.py')
+    parser.add_argument('--num-experiments', type=int, default=5)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{args.num_experiments} experiments of {model.SIM_DURATION} min, best of {args.rounds} rounds")
+    print(f"{'Mode':<8} {'Current (ms)':>13} {'Sink (ms)':>10} {'Speedup':>8}")
+    print("-" * 42)
+    with tempfile.TemporaryDirectory() as directory:
+        log_files = {implementation: os.path.join(directory, f'{implementation}.log')
+                     for implementation in ['current', 'sink']}
+        for output_mode in OUTPUT_MODES:
+            best = {}
+            for _ in range(args.rounds):
+                for implementation, log_file in log_files.items():
+                    elapsed_time = run_variant(output_mode, implementation, args.num_experiments, log_file)
+                    best[implementation] = min(best.get(implementation, elapsed_time), elapsed_time)
+            print(f"{output_mode:<8} {best['current']:>13.1f} {best['sink']:>10.1f} "
+                  f"{best['current'] / best['sink']:>7.2f}x")
+            if output_mode == 'file' and not filecmp.cmp(log_files['current'], log_files['sink'], shallow=False):
+                print("WARNING: the log files of the two implementations differ")
+    model.log_message = sink_log_message
+
+
+if __name__ == "__main__":
+    main()
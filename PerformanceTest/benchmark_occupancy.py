@@ -0,0 +1,59 @@
+"""
+Occupancy Instrumentation Benchmark
+===================================
+Measures what the time-weighted occupancy and queue length metrics of
+swimmingpool_simple.py cost, on the largest 'stress' configuration of
+performance_test.py (pool capacity 200, 12000 minutes).
+
+Each experiment is run alternately with and without the metrics, and the fastest
+of several rounds is kept per experiment, so that background noise affects both
+sides alike.
+
+USAGE:
+python benchmark_occupancy.py --rounds 5 --num-experiments 5
+"""
+
+import argparse
+
+import swimmingpool_simple as model
+
+POOL_CAPACITY = 200
+SIM_DURATION = 12000  # in minutes
+
+
+def time_experiment(engine, track_occupancy, experiment):
+    """Run time of one experiment in milliseconds"""
+    model.ENGINE = engine
+    model.TRACK_OCCUPANCY = track_occupancy
+    return model.run_timed_experiment(experiment)[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the cost of the occupancy metrics')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--num-experiments', type=int, default=5)
+    args = parser.parse_args()
+
+    model.POOL_CAPACITY = POOL_CAPACITY
+    model.SIM_DURATION = SIM_DURATION
+    print(f"Pool capacity {POOL_CAPACITY}, duration {SIM_DURATION} min, "
+          f"{args.num_experiments} experiments, best of {args.rounds} rounds")
+    print(f"{'Engine':<8} {'Without (ms)':>13} {'With (ms)':>10} {'Overhead':>9}")
+    print("-" * 43)
+
+    for engine in ['simpy', 'fast']:
+        best = {False: {}, True: {}}
+        for round_number in range(args.rounds):
+            for experiment in range(1, args.num_experiments + 1):
+                # Alternate which variant runs first
+                for track_occupancy in (round_number % 2 == 0, round_number % 2 != 0):
+                    elapsed_time = time_experiment(engine, track_occupancy, experiment)
+                    best[track_occupancy][experiment] = min(best[track_occupancy].get(experiment, elapsed_time), elapsed_time)
+        without_time = sum(best[False].values())
+        with_time = sum(best[True].values())
+        overhead = (with_time - without_time) / without_time
+        print(f"{engine:<8} {without_time:>13.1f} {with_time:>10.1f} {overhead:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Variance Reduction Benchmark: common random numbers and antithetic variates
+===========================================================================
+Measures how much --crn and --antithetic of swimmingpool_simple.py reduce the
+variance of the average waiting time, i.e. how many fewer experiments (and
+simulated events) are needed for the same confidence interval.
+
+- Capacity comparison: the difference in average waiting time between
+  neighbouring pool capacities, per experiment, with
+  'independent'  a different seed per capacity (no synchronization at all),
+  'common seeds' the default: the same seeds per experiment at every capacity,
+  'crn'          the same seeds and swim times drawn on arrival (--crn).
+  The variance of the difference relative to 'independent' is the share of
+  experiments still needed for the same precision.
+- Antithetic pairs: per capacity, the variance of the average of an antithetic
+  pair relative to the average of two independent experiments.
+
+Experiments run in-process on the fast engine.
+
+USAGE:
+python benchmark_variance_reduction.py --capacities 40 50 60 --num-experiments 40
+"""
+
+import argparse
+import statistics
+
+import swimmingpool_simple as model
+
+INDEPENDENT_SEED_OFFSET = 100000  # Seed offset per capacity for the 'independent' mode
+COMPARISON_MODES = ['independent', 'common seeds', 'crn']
+
+
+def average_waits(capacity, num_experiments, crn=False, antithetic=False, seed=42):
+    """Average waiting time of experiments 1..num_experiments"""
+    model.POOL_CAPACITY = capacity
+    model.CRN = crn
+    model.ANTITHETIC = antithetic
+    model.RANDOM_SEED = seed
+    return [model.run_single_experiment_fast(experiment).waits.mean
+            for experiment in range(1, num_experiments + 1)]
+
+
+def compare_capacities(capacities, num_experiments):
+    """Variance of the per-experiment difference between neighbouring capacities, by mode"""
+    waits = {}
+    for mode in COMPARISON_MODES:
+        for index, capacity in enumerate(capacities):
+            seed = 42 + index * INDEPENDENT_SEED_OFFSET if mode == 'independent' else 42
+            waits[mode, capacity] = average_waits(capacity, num_experiments, crn=mode == 'crn', seed=seed)
+
+    print(f"{'Comparison':<12} {'Mode':<13} {'Mean diff':>10} {'Var(diff)':>10} {'Experiments':>12}")
+    print("-" * 61)
+    for low, high in zip(capacities, capacities[1:]):
+        baseline = None
+        for mode in COMPARISON_MODES:
+            differences = [a - b for a, b in zip(waits[mode, low], waits[mode, high])]
+            variance = statistics.variance(differences)
+            baseline = baseline or variance
+            # Experiments needed for the same CI of the difference, relative to 'independent'
+            print(f"{f'{low} vs {high}':<12} {mode:<13} {statistics.mean(differences):>10.2f} "
+                  f"{variance:>10.3f} {variance / baseline:>11.0%}")
+
+
+def compare_antithetic(capacities, num_experiments):
+    """Variance of antithetic pair averages against averages of independent pairs"""
+    print(f"{'Capacity':<12} {'Var(indep. pair)':>17} {'Var(antithetic pair)':>21} {'Experiments':>12}")
+    print("-" * 65)
+    for capacity in capacities:
+        independent = average_waits(capacity, num_experiments)
+        antithetic = average_waits(capacity, num_experiments, antithetic=True)
+        independent_variance = statistics.variance(independent) / 2
+        pair_variance = statistics.variance([(a + b) / 2 for a, b in zip(antithetic[0::2], antithetic[1::2])])
+        print(f"{capacity:<12} {independent_variance:>17.3f} {pair_variance:>21.3f} "
+              f"{pair_variance / independent_variance:>11.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the variance reduction modes of swimmingpool_simple.py')
+    parser.add_argument('--capacities', type=int, nargs='+', default=[40, 50, 60])
+    parser.add_argument('--num-experiments', type=int, default=40)
+    parser.add_argument('--sim-duration', type=int, default=2400)
+    args = parser.parse_args()
+    if args.num_experiments < 4 or args.num_experiments % 2:
+        parser.error("--num-experiments must be even and at least 4")
+
+    model.SIM_DURATION = args.sim_duration
+    model.TRACK_OCCUPANCY = False
+    print(f"{args.num_experiments} experiments of {args.sim_duration} min per capacity and mode")
+    print("'Experiments': share of experiments needed for the same precision as without variance reduction\n")
+    compare_capacities(args.capacities, args.num_experiments)
+    print()
+    compare_antithetic(args.capacities, args.num_experiments)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+/*
+ * Car Demo Simulation (JavaScript) - WITHOUT LOGGING
+ * ==================================================
+ * The car example of SimLuxJS/Performance Tests/cardemo (CarExample_Minimalictic_v3.js),
+ * printing the same Summary line as cardemo_simple.py (see run_summary.js), so that
+ * performance_test.py --scenario car can sweep it.
+ *
+ * Car i (1..cars) parks for 2 + 2*i minutes, drives 6 minutes to the toll station, waits
+ * for one of its booths, pays for 3 minutes and drives another 6 minutes to the exit. Every
+ * experiment gets a new SimLuxJS instance and toll station.
+ *
+ * USAGE:
+ * node cardemo_simple.js --cars 10000 --toll-booths 1 --num-experiments 20
+ * OPTIONS:
+ * --cars: Number of cars per experiment (default: 10000)
+ * --toll-booths: Capacity of the toll station (default: 1)
+ * --num-experiments: Number of simulation experiments to run (default: 20)
+ */
+
+const { SimLuxJS, SimEntity } = require('../SimLuxJS/SimLuxJS.js');
+const { timingSummary, countEvents, eventSummary, peakRssMb } = require('./run_summary.js');
+const args = require('minimist')(process.argv.slice(2));
+
+const CARS = args['cars'] || 10000;
+const TOLL_BOOTHS = args['toll-booths'] || 1;
+const NUMBER_SIM_EXPERIMENTS = args['num-experiments'] || 20;
+const PARK_INTERVAL = 2; // Car i parks for PARK_INTERVAL * (i + 1) minutes
+const DRIVE_TIME = 6; // minutes to the toll station, and from there to the exit
+const TOLL_TIME = 3; // minutes to charge the toll fee
+
+class Statistics {
+    constructor() {
+        this.finishedCars = 0;
+        this.totalWaitingTime = 0; // for a toll booth, in minutes
+        this.tollQueue = 0;
+        this.maxTollQueue = 0;
+    }
+}
+
+async function car(sim, toll, stats, parktime) {
+    await sim.advance(parktime);
+    await sim.advance(DRIVE_TIME);
+    stats.tollQueue++;
+    stats.maxTollQueue = Math.max(stats.maxTollQueue, stats.tollQueue);
+    const arrivalTime = sim.getTime();
+    const releaseToll = await sim.waitForResource(toll);
+    stats.tollQueue--;
+    stats.totalWaitingTime += sim.getTime() - arrivalTime;
+    await sim.advance(TOLL_TIME); // Charge the toll fee
+    releaseToll();
+    await sim.advance(DRIVE_TIME); // Continue to the exit
+    stats.finishedCars++;
+}
+
+async function runAllExperiments() {
+    const totalTimes = [];
+    const setupTimes = [];
+    const allStats = [];
+    const eventsByType = {};
+    let finalTime;
+    countEvents(SimLuxJS.prototype, eventsByType);
+
+    for (let experiment = 1; experiment <= NUMBER_SIM_EXPERIMENTS; experiment++) {
+        const startTime = performance.now();
+        const sim = new SimLuxJS();
+        const toll = sim.createResource(TOLL_BOOTHS);
+        const stats = new Statistics();
+        for (let carNumber = 1; carNumber <= CARS; carNumber++) {
+            const parktime = PARK_INTERVAL + PARK_INTERVAL * carNumber;
+            sim.addSimEntity(new SimEntity(simEntity => car(sim, toll, stats, parktime)));
+        }
+        const setupEndTime = performance.now();
+        await sim.run();
+        const endTime = performance.now();
+
+        totalTimes.push(endTime - startTime);
+        setupTimes.push(setupEndTime - startTime);
+        allStats.push(stats);
+        finalTime = sim.getTime(); // The same in every experiment
+    }
+
+    const totalTime = totalTimes.reduce((a, b) => a + b, 0);
+    const finishedCars = allStats.reduce((a, stats) => a + stats.finishedCars, 0);
+    const totalWaitingTime = allStats.reduce((a, stats) => a + stats.totalWaitingTime, 0);
+    return {
+        framework: 'SimLuxJS',
+        cars: CARS,
+        toll_booths: TOLL_BOOTHS,
+        num_experiments: NUMBER_SIM_EXPERIMENTS,
+        ...timingSummary(totalTimes), // in milliseconds
+        average_setup_time: parseFloat((setupTimes.reduce((a, b) => a + b, 0) / setupTimes.length).toFixed(2)),
+        avg_cars: finishedCars / NUMBER_SIM_EXPERIMENTS,
+        average_waiting_time: parseFloat((totalWaitingTime / finishedCars).toFixed(2)), // in minutes
+        max_toll_queue: Math.max(...allStats.map(stats => stats.maxTollQueue)),
+        final_time: parseFloat(finalTime.toFixed(2)), // simulated minutes until the last car leaves
+        ...eventSummary(eventsByType, NUMBER_SIM_EXPERIMENTS, totalTime),
+        peak_rss_mb: peakRssMb() // of this process, i.e. all experiments run in it
+    };
+}
+
+async function main() {
+    console.log("Starting SimLuxJS Car Demo Simulation...");
+    const summary = await runAllExperiments();
+    console.log(`Summary:${JSON.stringify(summary)}`);
+}
+
+main().catch(console.error);
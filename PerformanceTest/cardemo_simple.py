@@ -0,0 +1,194 @@
+"""
+Car Demo Simulation (Python) - WITHOUT LOGGING
+==============================================
+The car example of SimLuxJS/Performance Tests/cardemo (cardemo_perftest.py and
+CarExample_Minimalictic_v3.js), printing the Summary line of run_summary.py so that
+performance_test.py --scenario car can sweep it like the swimming pool.
+
+Car i (1..cars) parks for 2 + 2*i minutes, drives 6 minutes to the toll station,
+waits for one of its booths, pays for 3 minutes and drives another 6 minutes to the
+exit. Unlike cardemo_perftest.py, the cars really wait for a booth (yield
+toll.request()), as the JS cars do with waitForResource(). The setup (creating the car
+processes) is part of the experiment time and reported as average_setup_time. The
+experiments are timed by benchmark_harness.py.
+
+USAGE:
+python cardemo_simple.py --cars 10000 --toll-booths 1 --num-experiments 20
+OPTIONS:
+--cars: Number of cars per experiment (default: 10000, Maxenid of cardemo_perftest.py)
+--toll-booths: Capacity of the toll station (default: 1)
+--num-experiments: Number of simulation experiments to run (default: 20)
+--warmup: Experiments run before them and not reported (default: 0)
+--gc on|off|freeze: Garbage collector during each experiment, see benchmark_harness.py (default: on)
+--distribution none|uniform|normal: Add a random variation to each of the two drive times of
+        a car, as UseDistributionNr 0/1/2 of cardemo_perftest.py: none, uniform between 0 and 2,
+        or normal with mean 2 and sigma 1 minutes, rounded to 1/100 minute (distributions.py,
+        from the cars' own stream, seed RANDOM_SEED + the experiment number, warm-ups apart) (default: none)
+--bulk: Start each car only when it has finished parking, from one (start time, car)
+        iterable with a single cursor event on the event queue (process_bulk() of
+        bulk_processes.py), instead of starting all cars up front to park. Same
+        simulation, almost no setup; see benchmark_bulk_start.py
+"""
+
+import argparse
+from functools import partial
+
+import simpy
+
+from benchmark_harness import GC_MODES, time_replications
+from bulk_processes import process_bulk
+from distributions import Normal, Uniform
+from event_counters import event_totals, throughput
+from run_summary import timing_summary, peak_rss_mb, print_summary
+from variate_streams import EntityStreams, experiment_seed
+
+CARS = 10000
+TOLL_BOOTHS = 1
+NUMBER_SIM_EXPERIMENTS = 20
+WARMUP = 0  # Experiments run before the measured ones
+GC_MODE = 'on'  # 'on', 'off' or 'freeze', see benchmark_harness.py
+BULK = False  # Start the cars from a process_bulk() iterable when they finish parking
+PARK_INTERVAL = 2  # Car i parks for PARK_INTERVAL * (i + 1) minutes
+DRIVE_TIME = 6  # minutes to the toll station, and from there to the exit
+TOLL_TIME = 3  # minutes to charge the toll fee
+RANDOM_SEED = 42
+TIME_DIGITS = 100  # Random drive times are rounded to 1/TIME_DIGITS minutes (timeDigits1)
+# Added to DRIVE_TIME for each drive of a car, per --distribution
+DRIVE_TIME_VARIATIONS = {
+    'none': None,
+    'uniform': Uniform(0, 2, time_digits=TIME_DIGITS),
+    'normal': Normal(2, 1, time_digits=TIME_DIGITS),
+}
+DISTRIBUTION = 'none'
+experiment_number = 0  # Of the last experiment set up: 1, 2, ... measured, 0, -1, ... warm-up
+
+
+class Statistics:
+    def __init__(self):
+        self.finished_cars = 0
+        self.total_waiting_time = 0.0  # for a toll booth, in minutes
+        self.toll_queue = 0
+        self.max_toll_queue = 0
+
+
+def car(env, toll, stats, drive_time, parktime=None):
+    # Drawn first, i.e. in car order whether the cars are started up front or by process_bulk()
+    drive_time1 = drive_time()
+    drive_time2 = drive_time()
+    if parktime is not None:  # None: started when it has finished parking (BULK)
+        yield env.timeout(parktime)
+    yield env.timeout(drive_time1)
+    stats.toll_queue += 1
+    stats.max_toll_queue = max(stats.max_toll_queue, stats.toll_queue)
+    arrival_time = env.now
+    request = toll.request()
+    yield request
+    stats.toll_queue -= 1
+    stats.total_waiting_time += env.now - arrival_time
+    yield env.timeout(TOLL_TIME)  # Charge the toll fee
+    toll.release(request)
+    yield env.timeout(drive_time2)  # Continue to the exit
+    stats.finished_cars += 1
+
+
+def drive_time_sampler():
+    """Function of no arguments returning the drive times of the cars of a new experiment"""
+    global experiment_number
+    experiment_number += 1
+    variation = DRIVE_TIME_VARIATIONS[DISTRIBUTION]
+    if variation is None:
+        return lambda: DRIVE_TIME
+    stream = EntityStreams(experiment_seed(RANDOM_SEED, experiment_number))['Car']
+    return lambda: DRIVE_TIME + variation.sample(stream)
+
+
+def setup_experiment():
+    """A new environment with the toll station and all cars, and its Statistics"""
+    env = simpy.Environment()
+    toll = simpy.Resource(env, capacity=TOLL_BOOTHS)
+    stats = Statistics()
+    drive_time = drive_time_sampler()
+    if BULK:
+        process_bulk(env, ((PARK_INTERVAL + PARK_INTERVAL * car_number, partial(car, env, toll, stats, drive_time))
+                           for car_number in range(1, CARS + 1)))
+    else:
+        for car_number in range(1, CARS + 1):
+            env.process(car(env, toll, stats, drive_time, PARK_INTERVAL + PARK_INTERVAL * car_number))
+    return env, stats
+
+
+def run_experiment(experiment):
+    env, _ = experiment
+    env.run()
+
+
+def run_all_experiments():
+    global experiment_number
+    experiment_number = -WARMUP  # The warm-up experiments are -WARMUP + 1 .. 0, the measured ones 1, 2, ...
+    results = []  # (event totals, final time, Statistics) per experiment
+
+    def collect(experiment):
+        env, stats = experiment
+        results.append((event_totals(env), env.now, stats))
+
+    times = time_replications(setup_experiment, run_experiment, NUMBER_SIM_EXPERIMENTS, WARMUP, GC_MODE, collect)
+    total_times = [(setup_time + run_time) / 1e6 for setup_time, run_time in times]  # in milliseconds
+    setup_times = [setup_time / 1e6 for setup_time, _ in times]
+    events_scheduled = sum(scheduled for (scheduled, _), _, _ in results)
+    events_processed = sum(processed for (_, processed), _, _ in results)
+    final_time = results[-1][1]  # The same in every experiment without --distribution
+    all_stats = [stats for _, _, stats in results]
+
+    finished_cars = sum(stats.finished_cars for stats in all_stats)
+    summary = {
+        'framework': 'SimPy',
+        'cars': CARS,
+        'toll_booths': TOLL_BOOTHS,
+        'bulk': BULK,
+        'distribution': DISTRIBUTION,
+        'num_experiments': NUMBER_SIM_EXPERIMENTS,
+        'warmup': WARMUP,
+        'gc': GC_MODE,
+        **timing_summary(total_times),  # in milliseconds
+        'average_setup_time': round(sum(setup_times) / len(setup_times), 2),  # in milliseconds
+        'avg_cars': finished_cars / NUMBER_SIM_EXPERIMENTS,
+        'average_waiting_time': round(sum(stats.total_waiting_time for stats in all_stats) / finished_cars, 2),  # in minutes
+        'max_toll_queue': max(stats.max_toll_queue for stats in all_stats),
+        'final_time': round(final_time, 2),  # simulated minutes until the last car leaves (last experiment)
+        'events_scheduled': round(events_scheduled / NUMBER_SIM_EXPERIMENTS, 1),  # per experiment
+        'events_processed': round(events_processed / NUMBER_SIM_EXPERIMENTS, 1),  # per experiment
+        **throughput(events_processed, sum(total_times)),
+        'peak_rss_mb': peak_rss_mb(),  # of this process, i.e. all experiments run in it
+    }
+    print_summary(summary)
+    return summary
+
+
+def main():
+    global CARS, TOLL_BOOTHS, NUMBER_SIM_EXPERIMENTS, WARMUP, GC_MODE, DISTRIBUTION, BULK
+    parser = argparse.ArgumentParser(description='Starting SimPy Car Demo Simulation')
+    parser.add_argument('--cars', type=int, default=CARS)
+    parser.add_argument('--toll-booths', type=int, default=TOLL_BOOTHS)
+    parser.add_argument('--num-experiments', type=int, default=NUMBER_SIM_EXPERIMENTS)
+    parser.add_argument('--warmup', type=int, default=WARMUP)
+    parser.add_argument('--gc', choices=GC_MODES, default=GC_MODE)
+    parser.add_argument('--distribution', choices=list(DRIVE_TIME_VARIATIONS), default=DISTRIBUTION)
+    parser.add_argument('--bulk', action='store_true')
+    args = parser.parse_args()
+
+    CARS = args.cars
+    TOLL_BOOTHS = args.toll_booths
+    NUMBER_SIM_EXPERIMENTS = args.num_experiments
+    WARMUP = args.warmup
+    GC_MODE = args.gc
+    DISTRIBUTION = args.distribution
+    BULK = args.bulk
+    if min(CARS, TOLL_BOOTHS, NUMBER_SIM_EXPERIMENTS) < 1:
+        parser.error("--cars, --toll-booths and --num-experiments must be at least 1")
+    if WARMUP < 0:
+        parser.error("--warmup must be at least 0")
+
+    run_all_experiments()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+SLX-style Control Variables for SimPy
+=====================================
+SLX 'control' variables and SimLuxJS 'ControlVariable' let a process
+'wait until' a condition over some variables holds. This module provides the
+same for SimPy models without polling:
+
+- A ControlVariable remembers which pending conditions depend on it.
+- ControlVariable.set() re-evaluates only those conditions, in FIFO order.
+- A condition that holds is removed from all its variables and its SimPy
+  event is succeeded, so the waiting process resumes without any timeout.
+
+USAGE:
+    gate_open = ControlVariable(env, True)
+    num_inside = ControlVariable(env, 0)
+    yield wait_until(env, lambda: gate_open.value and num_inside.value < 100,
+                     (gate_open, num_inside))
+"""
+
+
+class ControlVariable:
+    """A value whose changes wake the conditions that depend on it"""
+    def __init__(self, env, value=None):
+        self.env = env
+        self.value = value
+        self._conditions = {}  # pending _Condition -> None, kept in insertion (FIFO) order
+        self._notifying = False
+        self._dirty = False
+
+    def set(self, value):
+        self.value = value
+        self._notify()
+
+    def add(self, delta):
+        self.set(self.value + delta)
+
+    def wait_until(self, condition, on_wake=None):
+        """Event that fires once condition(value) holds"""
+        return wait_until(self.env, lambda: condition(self.value), (self,), on_wake)
+
+    def _notify(self):
+        # A set() issued from an on_wake callback only marks the variable dirty;
+        # the outer loop then re-evaluates the remaining conditions once more.
+        if self._notifying:
+            self._dirty = True
+            return
+        self._notifying = True
+        try:
+            self._dirty = True
+            while self._dirty and self._conditions:
+                self._dirty = False
+                for condition in list(self._conditions):
+                    if condition.pending:
+                        condition.evaluate()
+        finally:
+            self._notifying = False
+
+
+class _Condition:
+    """A pending wait_until: predicate, the variables it reads and the event to succeed"""
+    __slots__ = ('predicate', 'variables', 'event', 'on_wake', 'pending')
+
+    def __init__(self, predicate, variables, event, on_wake):
+        self.predicate = predicate
+        self.variables = variables
+        self.event = event
+        self.on_wake = on_wake
+        self.pending = True
+
+    def evaluate(self):
+        if not self.predicate():
+            return
+        self.pending = False
+        for variable in self.variables:
+            del variable._conditions[self]
+        # Schedule the resumption before on_wake, whose set() may wake later waiters
+        self.event.succeed()
+        if self.on_wake is not None:
+            self.on_wake()
+
+
+def wait_until(env, predicate, variables, on_wake=None):
+    """
+    Return a SimPy event that fires once predicate() holds.
+
+    predicate is re-evaluated only when one of the given control variables is set.
+    on_wake, if given, runs at the moment the condition is found to hold, before
+    any other waiter is evaluated; use it to claim a resource atomically
+    (e.g. take a slot in the pool) so that waiters woken at the same instant
+    cannot all see the same free slot.
+    """
+    event = env.event()
+    condition = _Condition(predicate, tuple(variables), event, on_wake)
+    if predicate():
+        condition.pending = False
+        event.succeed()
+        if on_wake is not None:
+            on_wake()
+        return event
+    for variable in condition.variables:
+        variable._conditions[condition] = None
+    return event
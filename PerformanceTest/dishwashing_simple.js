@@ -0,0 +1,76 @@
+/*
+ * Dishwashing Simulation (JavaScript) - WITHOUT LOGGING
+ * =====================================================
+ * Runs the dishwashing model of SimLuxJS/Performance Tests/Dishwashing/DishExample.js and
+ * prints the same Summary line as dishwashing_simple.py (see run_summary.js), so that
+ * performance_test.py --scenario dish can sweep it.
+ *
+ * Each experiment creates a new DishExampleSimulation (reported as average_setup_time) and
+ * runs it until every dish is clean. The experiment time is setup plus run.
+ *
+ * USAGE:
+ * node dishwashing_simple.js --n 10000 --washers 4 --num-experiments 10
+ * OPTIONS:
+ * --n: Number of dishes (default: 10000)
+ * --pre-rinsers, --washers, --rinsers, --driers: Capacities of the resources (default: 2, 4, 2 and 3)
+ * --num-experiments: Number of simulation experiments to run (default: 10)
+ */
+
+const { SimLuxJS } = require('../SimLuxJS/SimLuxJS.js');
+const { DishExampleSimulation } = require('../SimLuxJS/Performance Tests/Dishwashing/DishExample.js');
+const { timingSummary, countEvents, eventSummary, peakRssMb } = require('./run_summary.js');
+const args = require('minimist')(process.argv.slice(2));
+
+const N = args['n'] || 10000;
+const PRE_RINSERS = args['pre-rinsers'] || 2;
+const WASHERS = args['washers'] || 4;
+const RINSERS = args['rinsers'] || 2;
+const DRIERS = args['driers'] || 3;
+const NUMBER_SIM_EXPERIMENTS = args['num-experiments'] || 10;
+
+async function runAllExperiments() {
+    const totalTimes = [];
+    const setupTimes = [];
+    const cleanDishes = [];
+    const eventsByType = {};
+    let finalTime;
+    countEvents(SimLuxJS.prototype, eventsByType); // Also the dishes added by the constructor
+
+    for (let experiment = 1; experiment <= NUMBER_SIM_EXPERIMENTS; experiment++) {
+        const startTime = performance.now();
+        const sim = new DishExampleSimulation(N, PRE_RINSERS, WASHERS, RINSERS, DRIERS, false);
+        const setupEndTime = performance.now();
+        await sim.run();
+        const endTime = performance.now();
+
+        totalTimes.push(endTime - startTime);
+        setupTimes.push(setupEndTime - startTime);
+        cleanDishes.push(sim.cleanDishes);
+        finalTime = sim.simLuxJS.getTime(); // The same in every experiment
+    }
+
+    const totalTime = totalTimes.reduce((a, b) => a + b, 0);
+    return {
+        framework: 'SimLuxJS',
+        n: N,
+        pre_rinsers: PRE_RINSERS,
+        washers: WASHERS,
+        rinsers: RINSERS,
+        driers: DRIERS,
+        num_experiments: NUMBER_SIM_EXPERIMENTS,
+        ...timingSummary(totalTimes), // in milliseconds
+        average_setup_time: parseFloat((setupTimes.reduce((a, b) => a + b, 0) / setupTimes.length).toFixed(2)),
+        avg_dishes: cleanDishes.reduce((a, b) => a + b, 0) / cleanDishes.length, // incl. the glasses found in the washer
+        final_time: parseFloat(finalTime.toFixed(2)), // simulated minutes until the last dish is clean
+        ...eventSummary(eventsByType, NUMBER_SIM_EXPERIMENTS, totalTime),
+        peak_rss_mb: peakRssMb() // of this process, i.e. all experiments run in it
+    };
+}
+
+async function main() {
+    console.log("Starting SimLuxJS Dishwashing Simulation...");
+    const summary = await runAllExperiments();
+    console.log(`Summary:${JSON.stringify(summary)}`);
+}
+
+main().catch(console.error);
@@ -0,0 +1,168 @@
+"""
+Dishwashing Simulation (Python) - WITHOUT LOGGING
+=================================================
+Runs the dishwashing model of SimLuxJS/Performance Tests/Dishwashing/DishExample.py
+(n dishes, half plates and half glasses, pass SimPy resources for pre-rinsing, washing,
+rinsing and drying; some come back with hidden dirt, some glasses bring another glass
+into the washer) and prints the Summary line of run_summary.py, so that
+performance_test.py --scenario dish can sweep it like the swimming pool.
+
+Each experiment creates a new DishExampleSimulation (the setup, DishExample.py's
+preparationDuration, reported as average_setup_time) and runs it until every dish is
+clean. The experiment time is setup plus run, the simulation is deterministic. The
+experiments are timed by benchmark_harness.py.
+
+USAGE:
+python dishwashing_simple.py --n 10000 --washers 4 --num-experiments 10
+OPTIONS:
+--n: Number of dishes (default: 10000)
+--pre-rinsers, --washers, --rinsers, --driers: Capacities of the resources
+          (default: 2, 4, 2 and 3, as in DishExample.py)
+--num-experiments: Number of simulation experiments to run (default: 10)
+--warmup: Experiments run before them and not reported (default: 0)
+--gc on|off|freeze: Garbage collector during each experiment, see benchmark_harness.py (default: on)
+--variability V: Draw every step duration of a dish from a triangular distribution between
+          (1 - V) and (1 + V) times the fixed one of DishExample.py, most likely the fixed one,
+          rounded to 1/100 minute (distributions.py). Plates, glasses and the glasses found in
+          the washer draw from their own streams, seed RANDOM_SEED + the experiment number (warm-ups apart).
+          (default: 0, the fixed durations)
+--lookahead L: Start the dishes lazily (DishSource in DishExample.py): only L of them wait for
+          a pre-rinser at a time and the next one is created when a pre-rinser is granted.
+          Same simulation, much less setup time and memory for large n; see
+          benchmark_dish_source.py. By default all n dishes are started up front
+"""
+
+import argparse
+import os
+import sys
+
+from benchmark_harness import GC_MODES, time_replications
+from distributions import Triangular
+from event_counters import event_totals, throughput
+from run_summary import timing_summary, peak_rss_mb, print_summary
+from variate_streams import EntityStreams, experiment_seed
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'SimLuxJS', 'Performance Tests', 'Dishwashing'))
+from DishExample import DishExampleSimulation, Dish, StepDurations, fixedStepDurations, PLATE_STEPS, GLASS_STEPS
+
+N = 10000
+PRE_RINSERS = 2
+WASHERS = 4
+RINSERS = 2
+DRIERS = 3
+NUMBER_SIM_EXPERIMENTS = 10
+WARMUP = 0  # Experiments run before the measured ones
+GC_MODE = 'on'  # 'on', 'off' or 'freeze', see benchmark_harness.py
+RANDOM_SEED = 42
+TIME_DIGITS = 100  # Random step durations are rounded to 1/TIME_DIGITS minutes
+VARIABILITY = 0.0  # Relative spread of the random step durations, 0: the fixed ones
+experiment_number = 0  # Of the last experiment set up: 1, 2, ... measured, 0, -1, ... warm-up
+LOOKAHEAD = None  # Dishes waiting for a pre-rinser with the lazy source, None: all started up front
+
+
+def step_durations_function():
+    """stepDurations function of DishExampleSimulation for a new experiment"""
+    global experiment_number
+    experiment_number += 1
+    if VARIABILITY == 0:
+        return fixedStepDurations
+    streams = EntityStreams(experiment_seed(RANDOM_SEED, experiment_number))
+    distributions = {
+        dish_type: [Triangular((1 - VARIABILITY) * duration, duration, (1 + VARIABILITY) * duration, time_digits=TIME_DIGITS)
+                    for duration in steps]
+        for dish_type, steps in ((Dish.Type.Plate, PLATE_STEPS), (Dish.Type.Glass, GLASS_STEPS))
+    }
+
+    def step_durations(dish):
+        stream = streams['Found glass' if dish.isNew else dish.dishType.value]
+        return StepDurations(*(distribution.sample(stream) for distribution in distributions[dish.dishType]))
+    return step_durations
+
+
+def setup_experiment():
+    return DishExampleSimulation(N, PRE_RINSERS, WASHERS, RINSERS, DRIERS, False, LOOKAHEAD, step_durations_function())
+
+
+def run_experiment(sim):
+    sim.run()
+
+
+def run_all_experiments():
+    global experiment_number
+    experiment_number = -WARMUP  # The warm-up experiments are -WARMUP + 1 .. 0, the measured ones 1, 2, ...
+    results = []  # (event totals, final time, clean dishes) per experiment
+
+    def collect(sim):
+        results.append((event_totals(sim.env), sim.env.now, sim.cleanDishes))
+
+    times = time_replications(setup_experiment, run_experiment, NUMBER_SIM_EXPERIMENTS, WARMUP, GC_MODE, collect)
+    total_times = [(setup_time + run_time) / 1e6 for setup_time, run_time in times]  # in milliseconds
+    setup_times = [setup_time / 1e6 for setup_time, _ in times]
+    events_scheduled = sum(scheduled for (scheduled, _), _, _ in results)
+    events_processed = sum(processed for (_, processed), _, _ in results)
+    final_time = results[-1][1]  # The same in every experiment without --variability
+    clean_dishes = [dishes for _, _, dishes in results]
+
+    summary = {
+        'framework': 'SimPy',
+        'n': N,
+        'pre_rinsers': PRE_RINSERS,
+        'washers': WASHERS,
+        'rinsers': RINSERS,
+        'driers': DRIERS,
+        'variability': VARIABILITY,
+        'lookahead': LOOKAHEAD,
+        'num_experiments': NUMBER_SIM_EXPERIMENTS,
+        'warmup': WARMUP,
+        'gc': GC_MODE,
+        **timing_summary(total_times),  # in milliseconds
+        'average_setup_time': round(sum(setup_times) / len(setup_times), 2),  # in milliseconds
+        'avg_dishes': sum(clean_dishes) / len(clean_dishes),  # incl. the glasses found in the washer
+        'final_time': round(final_time, 2),  # simulated minutes until the last dish is clean (last experiment)
+        'events_scheduled': round(events_scheduled / NUMBER_SIM_EXPERIMENTS, 1),  # per experiment
+        'events_processed': round(events_processed / NUMBER_SIM_EXPERIMENTS, 1),  # per experiment
+        **throughput(events_processed, sum(total_times)),
+        'peak_rss_mb': peak_rss_mb(),  # of this process, i.e. all experiments run in it
+    }
+    print_summary(summary)
+    return summary
+
+
+def main():
+    global N, PRE_RINSERS, WASHERS, RINSERS, DRIERS, NUMBER_SIM_EXPERIMENTS, WARMUP, GC_MODE, VARIABILITY, LOOKAHEAD
+    parser = argparse.ArgumentParser(description='Starting SimPy Dishwashing Simulation')
+    parser.add_argument('--n', type=int, default=N)
+    parser.add_argument('--pre-rinsers', type=int, default=PRE_RINSERS)
+    parser.add_argument('--washers', type=int, default=WASHERS)
+    parser.add_argument('--rinsers', type=int, default=RINSERS)
+    parser.add_argument('--driers', type=int, default=DRIERS)
+    parser.add_argument('--num-experiments', type=int, default=NUMBER_SIM_EXPERIMENTS)
+    parser.add_argument('--warmup', type=int, default=WARMUP)
+    parser.add_argument('--gc', choices=GC_MODES, default=GC_MODE)
+    parser.add_argument('--variability', type=float, default=VARIABILITY)
+    parser.add_argument('--lookahead', type=int)
+    args = parser.parse_args()
+
+    N = args.n
+    PRE_RINSERS = args.pre_rinsers
+    WASHERS = args.washers
+    RINSERS = args.rinsers
+    DRIERS = args.driers
+    NUMBER_SIM_EXPERIMENTS = args.num_experiments
+    WARMUP = args.warmup
+    GC_MODE = args.gc
+    VARIABILITY = args.variability
+    LOOKAHEAD = args.lookahead
+    if LOOKAHEAD is not None and LOOKAHEAD < 1:
+        parser.error("--lookahead must be at least 1")
+    if min(N, PRE_RINSERS, WASHERS, RINSERS, DRIERS, NUMBER_SIM_EXPERIMENTS) < 1:
+        parser.error("--n, the resource capacities and --num-experiments must be at least 1")
+    if WARMUP < 0:
+        parser.error("--warmup must be at least 0")
+    if not 0 <= VARIABILITY < 1:
+        parser.error("--variability must be at least 0 and less than 1")
+
+    run_all_experiments()
+
+if __name__ == "__main__":
+    main()
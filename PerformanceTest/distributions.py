@@ -0,0 +1,132 @@
+"""
+Distributions
+=============
+Random durations for the car, dish and pool models, drawn from the block-sampled
+streams of variate_streams.py:
+
+- Uniform(a, b), Normal(mean, sigma), Exponential(mean), Triangular(low, mode, high)
+  and Empirical(values, weights) describe a distribution; sample(stream) draws one
+  variate from a VariateStream. The stream samples its uniforms, normals and
+  exponentials in vectorized NumPy blocks, so a draw costs a buffer read and a
+  little arithmetic rather than a call into NumPy.
+- time_digits=100 rounds every variate to 1/100, like the car demo's timeDigits1
+  (Math.round(x * timeDigits1) / timeDigits1, see round_time()).
+- sampler(stream) binds a distribution to a stream, for loops drawing many variates.
+- Draw each entity class from its own stream (EntityStreams['Car'] of
+  variate_streams.py), so that e.g. the cars' drive times do not change when the
+  dishes draw more or fewer variates.
+
+USAGE:
+    from variate_streams import EntityStreams
+    streams = EntityStreams(RANDOM_SEED + experiment_number)
+    drive_time = Normal(2, 1, time_digits=100)
+    yield env.timeout(DRIVE_TIME + drive_time.sample(streams['Car']))
+"""
+
+import math
+from bisect import bisect_right
+from functools import partial
+from itertools import accumulate
+
+
+def round_time(value, time_digits):
+    """value rounded to a multiple of 1 / time_digits, halves up like JavaScript's Math.round"""
+    return math.floor(value * time_digits + 0.5) / time_digits
+
+
+class Distribution:
+    """Base class: sample(stream) draws _draw(stream), rounded to time_digits if given"""
+    def __init__(self, time_digits=None):
+        self.time_digits = time_digits
+
+    def _draw(self, stream):
+        raise NotImplementedError
+
+    def sample(self, stream):
+        value = self._draw(stream)
+        if self.time_digits is None:
+            return value
+        return round_time(value, self.time_digits)
+
+    def sampler(self, stream):
+        """Function of no arguments drawing from stream"""
+        return partial(self.sample, stream)
+
+
+class Uniform(Distribution):
+    """Uniform between a and b"""
+    def __init__(self, a, b, time_digits=None):
+        super().__init__(time_digits)
+        self.a = a
+        self.b = b
+
+    def _draw(self, stream):
+        return stream.uniform(self.a, self.b)
+
+    def __repr__(self):
+        return f"Uniform({self.a}, {self.b})"
+
+
+class Normal(Distribution):
+    """Normal with mean and standard deviation sigma"""
+    def __init__(self, mean, sigma, time_digits=None):
+        super().__init__(time_digits)
+        self.mean = mean
+        self.sigma = sigma
+
+    def _draw(self, stream):
+        return stream.normalvariate(self.mean, self.sigma)
+
+    def __repr__(self):
+        return f"Normal({self.mean}, {self.sigma})"
+
+
+class Exponential(Distribution):
+    """Exponential with the given mean (rate 1 / mean)"""
+    def __init__(self, mean, time_digits=None):
+        super().__init__(time_digits)
+        self.mean = mean
+        self.rate = 1 / mean
+
+    def _draw(self, stream):
+        return stream.expovariate(self.rate)
+
+    def __repr__(self):
+        return f"Exponential({self.mean})"
+
+
+class Triangular(Distribution):
+    """Triangular between low and high, most likely at mode"""
+    def __init__(self, low, mode, high, time_digits=None):
+        if not low <= mode <= high:
+            raise ValueError(f"Triangular needs low <= mode <= high, got {low}, {mode}, {high}")
+        super().__init__(time_digits)
+        self.low = low
+        self.mode = mode
+        self.high = high
+
+    def _draw(self, stream):
+        return stream.triangular(self.low, self.high, self.mode)
+
+    def __repr__(self):
+        return f"Triangular({self.low}, {self.mode}, {self.high})"
+
+
+class Empirical(Distribution):
+    """One of values, with probabilities proportional to weights (all alike by default)"""
+    def __init__(self, values, weights=None, time_digits=None):
+        values = list(values)
+        weights = [1] * len(values) if weights is None else list(weights)
+        if not values or len(weights) != len(values) or min(weights) < 0 or sum(weights) <= 0:
+            raise ValueError("Empirical needs values and as many non-negative weights with a positive sum")
+        super().__init__(time_digits)
+        self.values = values
+        self.cumulative_weights = list(accumulate(weights))
+
+    def _draw(self, stream):
+        # The antithetic half of a pair draws from (0, 1], whose 1 is past the last bound
+        index = bisect_right(self.cumulative_weights, stream.random() * self.cumulative_weights[-1])
+        return self.values[min(index, len(self.values) - 1)]
+
+    def __repr__(self):
+        return f"Empirical({self.values})"
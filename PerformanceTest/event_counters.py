@@ -0,0 +1,88 @@
+"""
+Event Counters
+==============
+Counts the events a simulation run schedules and processes, so that engines can
+be compared by their cost per event and not only by wall time: a model change
+that halves the number of events looks just like an engine twice as fast.
+
+- event_totals(env): scheduled and processed events of a finished SimPy run, at no
+  cost during the run: SimPy numbers every scheduled event (env._eid), and the
+  events not processed are still in the event queue.
+- CountingEnvironment: simpy.Environment that also counts the scheduled events by
+  type. It costs one more Python call per event, so swimmingpool_simple.py only
+  uses it with --count-events. processed_by_type() subtracts the events left in
+  the queue.
+- throughput(): events/sec and ns/event of a run time.
+
+Event types use engine-neutral names where SimPy has an equivalent in the other
+engines: 'timeout' (SimLuxJS advance), 'process_start' (addSimEntity),
+'process_end', 'wait_until' (ControlVariable waits, i.e. resource requests)
+and 'stop' (the until event of env.run()).
+
+USAGE:
+    env = CountingEnvironment()
+    env.run(until=SIM_DURATION)
+    scheduled, processed = event_totals(env)
+    print(processed_by_type(env), throughput(processed, elapsed_ms))
+"""
+
+from collections import Counter
+
+import simpy
+
+EVENT_TYPES = {
+    'Timeout': 'timeout',
+    'Initialize': 'process_start',
+    'Process': 'process_end',
+    'Event': 'wait_until',
+}
+
+
+def event_type(event):
+    return EVENT_TYPES.get(type(event).__name__, type(event).__name__)
+
+
+def event_totals(env):
+    """(scheduled, processed) events of a simpy.Environment that has stopped running"""
+    scheduled = next(env._eid)  # Events are numbered 0, 1, ... when scheduled
+    return scheduled, scheduled - len(env._queue)
+
+
+class CountingEnvironment(simpy.Environment):
+    """simpy.Environment counting the scheduled events by event_type()"""
+    def __init__(self, initial_time=0):
+        super().__init__(initial_time)
+        self.scheduled = Counter()
+
+    def schedule(self, event, priority=simpy.core.NORMAL, delay=0):
+        self.scheduled[event_type(event)] += 1
+        super().schedule(event, priority, delay)
+
+    def run(self, until=None):
+        try:
+            return super().run(until)
+        finally:
+            if until is not None and not isinstance(until, simpy.Event):
+                # The plain Event that run() schedules to stop at time until
+                self.scheduled['wait_until'] -= 1
+                self.scheduled['stop'] += 1
+
+    def scheduled_by_type(self):
+        return dict(self.scheduled)
+
+    def processed_by_type(self):
+        """Scheduled events by type minus those still in the queue"""
+        processed = Counter(self.scheduled)
+        for _, _, _, event in self._queue:
+            processed[event_type(event)] -= 1
+        return dict(processed)
+
+
+def throughput(events, elapsed_time):
+    """{'events_per_second', 'ns_per_event'} of events processed in elapsed_time milliseconds"""
+    if events <= 0 or elapsed_time <= 0:
+        return {'events_per_second': None, 'ns_per_event': None}
+    return {
+        'events_per_second': round(events / (elapsed_time / 1000)),
+        'ns_per_event': round(elapsed_time * 1e6 / events, 1),
+    }
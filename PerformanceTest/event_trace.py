@@ -0,0 +1,132 @@
+"""
+Binary Event Trace
+==================
+Records what happens inside a simulation run as fixed-width binary records
+instead of text log lines, and reads them back as a NumPy structured array:
+
+- Each record holds sim time, event kind, customer id, queue length and
+  occupancy (TRACE_DTYPE, 17 bytes, little endian).
+- TraceRecorder preallocates the file, collects records in blocks and copies
+  each block into a memory map of the file. The file grows by doubling if
+  the preallocated space runs out and is cut to its final size on close().
+- read_trace() memory-maps the records, so multi-million-event traces can be
+  analyzed with NumPy without loading them into Python objects.
+
+FILE FORMAT:
+    16-byte header: b'SPTRACE1' + uint64 record count, followed by the records
+
+USAGE:
+    trace = TraceRecorder('trace.bin')
+    trace.record(env.now, ENTER, customer_id, num_waiting, num_inside)
+    trace.close()
+    records = read_trace('trace.bin')
+    print(records['occupancy'][records['kind'] == ENTER].mean())
+
+    python event_trace.py trace.bin   # Event counts per kind
+"""
+
+import argparse
+
+import numpy as np
+
+MAGIC = b'SPTRACE1'
+HEADER_DTYPE = np.dtype([('magic', 'S8'), ('count', '<u8')])
+TRACE_DTYPE = np.dtype([
+    ('time', '<f8'),  # Sim time in minutes
+    ('kind', 'u1'),  # One of the event kinds below
+    ('customer', '<u4'),  # Customer id, 0 for gate events and balking arrivals
+    ('queue_length', '<u2'),  # Customers waiting after the event
+    ('occupancy', '<u2'),  # Swimmers inside after the event
+])
+
+# Event kinds
+ARRIVAL, ENTER, DEPARTURE, GATE_OPEN, GATE_CLOSE, BALK = range(6)
+KIND_NAMES = ['arrival', 'enter', 'departure', 'gate_open', 'gate_close', 'balk']
+
+INITIAL_CAPACITY = 1 << 16  # Records preallocated in a new trace file
+BLOCK_SIZE = 4096  # Records collected before they are copied into the file
+
+
+class TraceRecorder:
+    """Writes trace records to a preallocated, memory-mapped file"""
+    def __init__(self, filename, capacity=INITIAL_CAPACITY, block_size=BLOCK_SIZE):
+        self.file = open(filename, 'w+b')
+        self.block_size = block_size
+        self.count = 0
+        self.pending = []
+        self.records = None
+        self._allocate(capacity)
+        self._write_header()
+
+    def record(self, time, kind, customer, queue_length, occupancy):
+        self.pending.append((time, kind, customer, queue_length, occupancy))
+        if len(self.pending) >= self.block_size:
+            self._write_pending()
+
+    def close(self):
+        self._write_pending()
+        self.records.flush()
+        self.records = None  # Unmap before the file is cut to size
+        self.file.truncate(HEADER_DTYPE.itemsize + self.count * TRACE_DTYPE.itemsize)
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _allocate(self, capacity):
+        if self.records is not None:
+            self.records.flush()
+            self.records = None
+        self.capacity = capacity
+        self.file.truncate(HEADER_DTYPE.itemsize + capacity * TRACE_DTYPE.itemsize)
+        self.records = np.memmap(self.file, dtype=TRACE_DTYPE, mode='r+',
+                                 offset=HEADER_DTYPE.itemsize, shape=(capacity,))
+
+    def _write_pending(self):
+        if not self.pending:
+            return
+        end = self.count + len(self.pending)
+        if end > self.capacity:
+            self._allocate(max(2 * self.capacity, end))
+        self.records[self.count:end] = np.array(self.pending, dtype=TRACE_DTYPE)
+        self.count = end
+        self.pending = []
+        self._write_header()  # A trace cut short by a crash is still readable up to here
+
+    def _write_header(self):
+        self.file.seek(0)
+        self.file.write(np.array([(MAGIC, self.count)], dtype=HEADER_DTYPE).tobytes())
+        self.file.flush()
+
+
+def read_trace(filename):
+    """Memory-map the records of a trace file as a read-only structured array"""
+    header = np.fromfile(filename, dtype=HEADER_DTYPE, count=1)
+    if len(header) == 0 or header['magic'][0] != MAGIC:
+        raise ValueError(f"{filename} is not an event trace file")
+    count = int(header['count'][0])
+    if count == 0:
+        return np.zeros(0, dtype=TRACE_DTYPE)
+    return np.memmap(filename, dtype=TRACE_DTYPE, mode='r', offset=HEADER_DTYPE.itemsize, shape=(count,))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize an event trace file')
+    parser.add_argument('filename')
+    args = parser.parse_args()
+
+    records = read_trace(args.filename)
+    print(f"{len(records)} events", end='')
+    if len(records):
+        print(f" from {records['time'][0]:.2f} to {records['time'][-1]:.2f} min", end='')
+    print()
+    counts = np.bincount(records['kind'], minlength=len(KIND_NAMES))
+    for kind, name in enumerate(KIND_NAMES):
+        print(f"- {name}: {counts[kind]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Buffered Log Sink
+=================
+Writes log lines to a file from a background writer thread, so that a fully
+logged simulation run is not slowed down by one open/write/close per message:
+
+- The file is opened once and stays open until close().
+- Lines are collected in memory and handed to the writer thread in batches.
+- At most MAX_PENDING_BATCHES batches wait for the writer; when the disk cannot
+  keep up, write() blocks instead of letting memory grow.
+- flush() returns once every line written so far is in the file.
+
+USAGE:
+    sink = LogSink('simulation_py_output.log')
+    sink.write('[    0] GATE OPEN')
+    sink.flush()  # e.g. at the end of an experiment
+    sink.close()
+"""
+
+import queue
+import threading
+
+BATCH_SIZE = 1000  # Lines per batch handed to the writer thread
+MAX_PENDING_BATCHES = 16  # Batches waiting for the writer before write() blocks
+
+
+class LogSink:
+    """Line-oriented file writer with batching and a bounded background queue"""
+    def __init__(self, filename, mode='w', batch_size=BATCH_SIZE, max_pending=MAX_PENDING_BATCHES):
+        self.file = open(filename, mode, encoding='utf-8')
+        self.batch_size = batch_size
+        self.lines = []
+        self.batches = queue.Queue(maxsize=max_pending)
+        self.error = None  # First exception raised by the writer thread
+        self.writer = threading.Thread(target=self._write_batches, name='LogSink', daemon=True)
+        self.writer.start()
+
+    def write(self, line):
+        self.lines.append(line)
+        if len(self.lines) >= self.batch_size:
+            self._hand_off()
+
+    def flush(self):
+        """Wait until all lines written so far are in the file"""
+        self._hand_off()
+        self.batches.join()
+        if self.error is not None:
+            raise self.error
+        self.file.flush()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.batches.put(None)
+            self.writer.join()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _hand_off(self):
+        if self.lines:
+            self.batches.put(self.lines)  # Blocks while max_pending batches are waiting
+            self.lines = []
+
+    def _write_batches(self):
+        while True:
+            batch = self.batches.get()
+            try:
+                if batch is None:
+                    return
+                if self.error is None:
+                    self.file.write('\n'.join(batch) + '\n')
+            except OSError as error:
+                self.error = error
+            finally:
+                self.batches.task_done()
@@ -0,0 +1,63 @@
+"""
+Steady-State Output Analysis
+============================
+Estimates a steady-state mean with a confidence interval from ONE long run
+instead of many independent replications that each start from an empty system:
+
+- mser_truncation(): warm-up length by MSER-5 (White, 1997). The observations are
+  averaged in batches of 5, and the truncation point d is the one in the first half
+  of the run that minimizes the MSER statistic: sum of squared deviations of the
+  remaining batch averages / (remaining count)^2, i.e. roughly the variance of their
+  mean. The initial transient inflates it, too much truncation leaves too few values.
+- batch_means(): means of non-overlapping batches of the truncated observations. With
+  batches long enough to be nearly independent, a t confidence interval over the
+  batch means estimates the precision of the steady-state mean.
+- lag1_autocorrelation(): check on that assumption; values well above ~0.2 mean
+  the batches are too short.
+
+USAGE:
+    warmup = mser_truncation(waiting_times)
+    means = batch_means(waiting_times[warmup:], 20)
+"""
+
+import numpy as np
+
+MSER_BATCH_SIZE = 5  # Observations averaged before the MSER statistic (MSER-5)
+
+
+def mser_truncation(observations, batch_size=MSER_BATCH_SIZE):
+    """Number of initial observations to discard as warm-up"""
+    x = np.asarray(observations, dtype=float)
+    n = len(x) // batch_size
+    if n < 4:
+        return 0
+    z = x[:n * batch_size].reshape(n, batch_size).mean(axis=1)
+    # Sums over z[d:] for every d, from suffix sums
+    remaining = np.arange(n, 0, -1)
+    suffix_sum = np.cumsum(z[::-1])[::-1]
+    suffix_squares = np.cumsum((z * z)[::-1])[::-1]
+    squared_deviations = suffix_squares - suffix_sum * suffix_sum / remaining
+    statistic = squared_deviations / remaining ** 2
+    # Truncating more than half of the run is not trusted
+    return int(np.argmin(statistic[:n // 2 + 1])) * batch_size
+
+
+def batch_means(observations, num_batches):
+    """Means of num_batches equal, consecutive batches; the remainder is dropped from the start"""
+    x = np.asarray(observations, dtype=float)
+    batch_size = len(x) // num_batches
+    if batch_size == 0:
+        raise ValueError(f"{len(x)} observations are too few for {num_batches} batches")
+    return x[len(x) - batch_size * num_batches:].reshape(num_batches, batch_size).mean(axis=1)
+
+
+def lag1_autocorrelation(values):
+    """Lag-1 autocorrelation of a series, nan for fewer than 3 values or a constant series"""
+    x = np.asarray(values, dtype=float)
+    if len(x) < 3:
+        return float('nan')
+    deviations = x - x.mean()
+    denominator = float((deviations * deviations).sum())
+    if denominator == 0:
+        return float('nan')
+    return float((deviations[:-1] * deviations[1:]).sum()) / denominator
@@ -1,9 +1,16 @@
 """
 Comprehensive Performance Testing Framework
-Tests both SimPy and SimLuxJS across multiple dimensions:
+Tests SimPy, SimLuxJS and the SimPy-free heapq engine of swimmingpool_simple.py
+(--engine fast, which shows how much of the Python time is SimPy overhead)
+across multiple dimensions:
 - Pool capacity
 - Simulation duration 
 
+--scenario selects the model (see scenarios.py): 'pool' (the default, dimensions above),
+'dish' (DishExample: dish count x washers) or 'car' (the car demo: cars x toll booths).
+Every scenario's models print the same Summary line (run_summary.py), so the sweep,
+cache, resume, analysis and plots work alike for all of them.
+
 This script runs performance tests, analyzes performance, and generates reports.
 Usage Examples:
 1. Quick test with default parameters:
@@ -14,31 +21,79 @@ Usage Examples:
    python performance_test.py --type stress
 4. Custom output directory and filenames:
    python performance_test.py --output-dir my_results --csv-filename custom_results.csv --log-filename custom_log.log
+5. Run up to 4 simulations at a time, each pinned to its own CPU core:
+   python performance_test.py --type comprehensive --jobs 4 --pin-cores
+6. Run the Python models in one long-lived worker process instead of one process per test:
+   python performance_test.py --type comprehensive --python-mode worker
+7. Also run the JS model in one long-lived, JIT-warmed Node process (steady-state throughput):
+   python performance_test.py --type comprehensive --python-mode worker --js-mode worker --js-warmup 10
+
+8. Re-run only what changed: results are cached in output/result_cache.sqlite3, keyed by
+   framework, model source files, configuration and runtime versions; --force re-runs everything:
+   python performance_test.py --type comprehensive --force
+9. Every result is appended to output/performance_results_<timestamp>.jsonl as soon as it is
+   done; continue an interrupted sweep (same type, scenario and frameworks) with only the missing tests:
+   python performance_test.py --resume output
+10. Benchmark the dishwashing or car demo models instead of the swimming pool:
+   python performance_test.py --scenario dish --type quick
+   python performance_test.py --scenario car --type stress
+
+Startup (interpreter start, imports, JIT warm-up) is reported separately as startup_time
+and is not part of the simulation times the frameworks are compared by.
+Every result also holds the events processed per experiment and the cost per event
+(events_per_second, ns_per_event), so that engines can be compared per event even when
+their models schedule different numbers of events (e.g. polling vs event admission).
+
+Memory: in subprocess mode (the default) every result holds the peak resident set size
+of its process (peak_rss_mb, VmHWM reported by the model on Linux) and customers_per_mb,
+the customers simulated per experiment per MB of peak RSS. A persistent worker or this
+process runs many tests, so their peak RSS is not attributed to single tests. Add
+--tracemalloc to also trace the Python models' allocations (peak and top allocation
+sites; this slows them down). The results are written to performance_summary_<ts>.md
+and plotted in *_memory_heatmap_<ts>.png:
+   python performance_test.py --type stress --tracemalloc
 """
 
+import asyncio
 import subprocess
 import sys
 import os
 import csv
 import statistics
 import json
-from itertools import product
 import numpy as np
 import argparse
+import glob
+import platform
+import time
+from importlib import metadata
 import matplotlib.pyplot as plt
 import pandas as pd
 import seaborn as sns
+from result_cache import ResultCache, CACHE_FILENAME, cache_key, file_digests
+from run_summary import parse_summary_line
+from scenarios import SCENARIOS, FRAMEWORKS, TEST_TYPES, SIMPY, SIMLUXJS, HEAPQ, POOL_CAPACITY_DIM, SIM_DURATION_DIM
 
 
 OUTPUT_DIR = 'output'
-POOL_CAPACITY_DIM = 'pool_capacity'
-SIM_DURATION_DIM = 'sim_duration'
-SIMPY = "SimPy"
-SIMLUXJS = "SimLuxJS"
+TEST_TIMEOUT = 120  # seconds per simulation run
+# How the Python frameworks are run: a new process per test, imported into this
+# process, or in one long-lived simulation_worker.py process
+PYTHON_MODES = ['subprocess', 'inprocess', 'worker']
+PYTHON_ENGINES = {SIMPY: 'simpy', HEAPQ: 'fast'}  # --engine of swimmingpool_simple.py
+# How the JS framework is run: a new Node process per test or one long-lived simulation_worker.js
+JS_MODES = ['subprocess', 'worker']
+JS_WARMUP = 10  # Replications simulation_worker.js runs and discards before the first test
 
 class TestResult:
-    def __init__(self, framework, pool_capacity, sim_duration, avg_time, min_time, max_time, total_time, avg_customers, avg_served_customers, avg_waiting_time, config_id=None):
+    def __init__(self, framework, pool_capacity, sim_duration, avg_time, min_time, max_time, total_time, avg_customers, avg_served_customers, avg_waiting_time, config_id=None, startup_time=0,
+                 events_processed=None, events_per_second=None, ns_per_event=None,
+                 peak_rss_mb=None, tracemalloc_peak_mb=None, top_allocations=None,
+                 scenario='pool', params=None, model_metrics=None):
         self.framework = framework
+        self.scenario = scenario  # Name in SCENARIOS
+        # Values of the scenario's dimensions; results stored before there were scenarios are pool results
+        self.params = params if params is not None else {POOL_CAPACITY_DIM: pool_capacity, SIM_DURATION_DIM: sim_duration}
         self.pool_capacity = pool_capacity
         self.sim_duration = sim_duration
         self.avg_time = avg_time # in milliseconds
@@ -46,37 +101,146 @@ class TestResult:
         self.max_time = max_time # in milliseconds
         self.total_time = total_time # in milliseconds
         self.total_time_s = total_time / 1000  
-        self.avg_customers = avg_customers  # average number of customers
+        self.avg_customers = avg_customers  # average number of customers (dishes, cars: the scenario's entities)
         self.avg_served_customers = avg_served_customers  # average number of served customers
         self.avg_waiting_time = avg_waiting_time  # in minutes
-        self.capacity_customer_per_hour = avg_customers / (sim_duration / 60)   # customers per hour
+        self.capacity_customer_per_hour = avg_customers / (sim_duration / 60) if sim_duration else None  # customers per hour
         self.config_id = config_id  # Unique identifier for the configuration
+        self.startup_time = startup_time  # in milliseconds, process start and imports outside total_time
+        self.events_processed = events_processed  # per experiment, None if not reported
+        self.events_per_second = events_per_second
+        self.ns_per_event = ns_per_event  # in nanoseconds of simulation time per processed event
+        self.peak_rss_mb = peak_rss_mb  # Peak resident set size of the test's own process, None if not measured
+        self.tracemalloc_peak_mb = tracemalloc_peak_mb  # Python models with --tracemalloc only
+        self.top_allocations = top_allocations  # [{'site', 'size_kb', 'blocks'}] at tracemalloc_peak_mb
+        self.model_metrics = model_metrics or {}  # The scenario's model_metrics, e.g. final_time
+
+    @property
+    def customers_per_mb(self):
+        """Customers (the scenario's entities) per experiment per MB of peak RSS"""
+        return round(self.avg_customers / self.peak_rss_mb, 2) if self.peak_rss_mb else None
     
     def to_dict(self):
         return {
             'framework': self.framework,
-            'pool_capacity': self.pool_capacity,
-            'sim_duration': self.sim_duration,
+            'scenario': self.scenario,
+            **self.params,
             'total_time': self.total_time,
             'total_time_s': self.total_time_s,
             'avg_customers': self.avg_customers,
             'avg_served_customers': self.avg_served_customers,
             'avg_waiting_time': self.avg_waiting_time,
             'config_id': self.config_id,
-            'capacity_customer_per_hour': self.capacity_customer_per_hour
+            'capacity_customer_per_hour': self.capacity_customer_per_hour,
+            'startup_time': self.startup_time,
+            'events_processed': self.events_processed,
+            'events_per_second': self.events_per_second,
+            'ns_per_event': self.ns_per_event,
+            'peak_rss_mb': self.peak_rss_mb,
+            'customers_per_mb': self.customers_per_mb,
+            'tracemalloc_peak_mb': self.tracemalloc_peak_mb,
+            **self.model_metrics,
         }
 
+    def to_record(self):
+        """Constructor arguments, to store the result in the ResultCache"""
+        return {
+            'framework': self.framework,
+            'pool_capacity': self.pool_capacity,
+            'sim_duration': self.sim_duration,
+            'avg_time': self.avg_time,
+            'min_time': self.min_time,
+            'max_time': self.max_time,
+            'total_time': self.total_time,
+            'avg_customers': self.avg_customers,
+            'avg_served_customers': self.avg_served_customers,
+            'avg_waiting_time': self.avg_waiting_time,
+            'startup_time': self.startup_time,
+            'events_processed': self.events_processed,
+            'events_per_second': self.events_per_second,
+            'ns_per_event': self.ns_per_event,
+            'peak_rss_mb': self.peak_rss_mb,
+            'tracemalloc_peak_mb': self.tracemalloc_peak_mb,
+            'top_allocations': self.top_allocations,
+            'scenario': self.scenario,
+            'params': self.params,
+            'model_metrics': self.model_metrics,
+        }
+
+def find_progress_file(path):
+    """The progress file to resume: path itself, or the newest one in the directory path"""
+    if os.path.isdir(path):
+        candidates = sorted(glob.glob(os.path.join(path, 'performance_results_*.jsonl')))
+        if not candidates:
+            raise FileNotFoundError(f"No performance_results_*.jsonl in {path}")
+        return candidates[-1]  # Timestamped names sort chronologically
+    return path
+
+def read_progress(path):
+    """(run header, result records) of a progress file; a line cut short by a crash is skipped"""
+    header, records = {}, []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get('type') == 'run':
+                header = entry
+            elif entry.get('type') == 'result':
+                records.append(entry['result'])
+    return header, records
+
+class SimulationWorker:
+    """A long-lived simulation_worker.py/.js process that runs configurations sent as JSON lines"""
+    def __init__(self, cmd):
+        start_time = time.perf_counter()
+        self.process = subprocess.Popen(cmd, text=True, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self._read_reply()  # {"ready": true, ...} once the model is loaded (and warmed up)
+        self.startup_time = (time.perf_counter() - start_time) * 1000  # in milliseconds
+
+    def run(self, request):
+        self.process.stdin.write(json.dumps(request) + '\n')
+        self.process.stdin.flush()
+        return self._read_reply()
+
+    def close(self):
+        self.process.stdin.close()
+        try:
+            self.process.wait(timeout=TEST_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+    def _read_reply(self):
+        line = self.process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"Simulation worker exited with code {self.process.wait()}")
+        reply = json.loads(line)
+        if 'error' in reply:
+            raise RuntimeError(f"Simulation worker: {reply['error']}")
+        return reply
+
 class PerformanceTestRunner:
-    def __init__(self, output_dir=OUTPUT_DIR):
+    def __init__(self, output_dir=OUTPUT_DIR, frameworks=None, python_mode='subprocess',
+                 js_mode='subprocess', js_warmup=JS_WARMUP, use_cache=True, force=False, tracemalloc=False,
+                 scenario='pool'):
         self.results: list[TestResult] = []
-        self.pool_capacities = [25, 50, 100, 200]  
-        self.sim_durations = [2400, 4800, 7200, 9600, 12000]  # in minutes
-        self.test_dimensions = {
-            POOL_CAPACITY_DIM: self.pool_capacities,
-            SIM_DURATION_DIM: self.sim_durations,
-        }
+        self.scenario = SCENARIOS[scenario]  # The models and dimensions to test, see scenarios.py
+        self.frameworks = frameworks or self.scenario.frameworks
+        self.python_mode = python_mode
+        self.js_mode = js_mode
+        self.js_warmup = js_warmup
+        self.tracemalloc = tracemalloc  # Trace the Python models' allocations
+        self.workers = {}  # 'python'/'js' -> SimulationWorker, started on first use
+        self.startup_pending = {'python', 'js'}  # The first test run without a new process carries the startup time
+        self.force = force  # Run every test even if the cache has its result
+        self.cache_hits = 0
+        self._runtime_versions = {}
+        self._file_digests = {}
         self.output_dir = output_dir
         self.setup_output_directory()
+        self.cache = ResultCache(os.path.join(self.output_dir, CACHE_FILENAME)) if use_cache else None
+        self.completed = {}  # (framework, scenario.key(config)) -> TestResult of a resumed run
 
     def setup_output_directory(self):
         """Create output directory structure"""
@@ -89,119 +253,368 @@ class PerformanceTestRunner:
         self.csv_file = os.path.join(self.output_dir, f"performance_results_{self.timestamp}.csv")
         self.log_file = os.path.join(self.output_dir, f"performance_analysis_{self.timestamp}.log")
         self.summary_file = os.path.join(self.output_dir, f"performance_summary_{self.timestamp}.md")
+        # Append-only record of every finished test, see record_progress()
+        self.progress_file = os.path.join(self.output_dir, f"performance_results_{self.timestamp}.jsonl")
+        self.resumed = False
         
         print(f"Output directory: {os.path.abspath(self.output_dir)}")
         
     def create_test_configurations(self, test_type='quick'):
         """Create different test configuration sets"""
-        configs = []
-        if test_type == 'quick':
-            # Quick test - fewer combinations 
-            # Test pool capacity scaling
-            for capacity in self.pool_capacities[:3]:
-                configs.append({
-                    POOL_CAPACITY_DIM: capacity,
-                    SIM_DURATION_DIM: self.sim_durations[0],
-                })
-            
-            # Test simulation duration scaling
-            for duration in self.sim_durations[:3]:
-                configs.append({
-                    POOL_CAPACITY_DIM: self.pool_capacities[0],
-                    SIM_DURATION_DIM: duration,
-                })
-
-        elif test_type == 'comprehensive':
-            # Full factorial test - all combinations
-            for combo in product(*self.test_dimensions.values()):
-                configs.append(dict(zip(self.test_dimensions.keys(), combo)))
-
-        elif test_type == 'stress':
-            # Stress test - high load scenarios
-            configs = [
-                {
-                    POOL_CAPACITY_DIM: self.pool_capacities[-1],
-                    SIM_DURATION_DIM: self.sim_durations[-1],
-                },
-                {
-                    POOL_CAPACITY_DIM: self.pool_capacities[-2],
-                    SIM_DURATION_DIM: self.sim_durations[-2],
-                }
-            ]
-        return configs
+        return self.scenario.configurations(test_type)
+
+    def build_command(self, config, framework):
+        """Command line running one framework with the given configuration"""
+        return self.scenario.command(config, framework, tracemalloc=self.tracemalloc)
+
+    def parse_summary(self, line, config, framework):
+        """Create a TestResult from a 'Summary:{...}' output line, None for any other line"""
+        summary = parse_summary_line(line)
+        if summary is None:
+            return None
+        return self.result_from_summary(summary, config, framework)
+
+    def result_from_summary(self, json_result, config, framework):
+        """Create a TestResult from a Summary dictionary"""
+        if not json_result:
+            return None
+        return TestResult(
+            framework=framework,
+            pool_capacity=config.get(POOL_CAPACITY_DIM),
+            sim_duration=config.get(SIM_DURATION_DIM),
+            total_time=json_result.get('total_time', 0),
+            avg_time=json_result.get('average_time', 0),
+            min_time=json_result.get('min_time', 0),
+            max_time=json_result.get('max_time', 0),
+            avg_customers=json_result.get(self.scenario.entity_key, 0),
+            avg_served_customers=json_result.get('avg_served_customers', 0),
+            avg_waiting_time=json_result.get('average_waiting_time', 0),
+            events_processed=json_result.get('events_processed'),
+            events_per_second=json_result.get('events_per_second'),
+            ns_per_event=json_result.get('ns_per_event'),
+            peak_rss_mb=json_result.get('peak_rss_mb'),
+            tracemalloc_peak_mb=json_result.get('tracemalloc_peak_mb'),
+            top_allocations=json_result.get('top_allocations'),
+            scenario=self.scenario.name,
+            params=dict(config),
+            model_metrics={key: json_result.get(key) for key in self.scenario.model_metrics},
+        )
+
+    def runtime_version(self, framework):
+        """Interpreter/runtime and library versions the framework runs with"""
+        language = 'js' if framework == SIMLUXJS else 'python'
+        if language not in self._runtime_versions:
+            if language == 'js':
+                try:
+                    node = subprocess.run(['node', '--version'], capture_output=True, text=True, timeout=30)
+                    version = f"node {node.stdout.strip()}"
+                except OSError:
+                    version = 'node unavailable'
+            else:
+                version = f"{platform.python_implementation()} {sys.version}"
+                for package in ['simpy', 'numpy']:
+                    try:
+                        version += f", {package} {metadata.version(package)}"
+                    except metadata.PackageNotFoundError:
+                        version += f", {package} missing"
+            self._runtime_versions[language] = version
+        return self._runtime_versions[language]
+
+    def cache_description(self, config, framework):
+        """Everything a cached result depends on; its hash is the cache key"""
+        if framework == SIMLUXJS:
+            mode = {'js_mode': self.js_mode, 'js_warmup': self.js_warmup if self.js_mode == 'worker' else None}
+            worker_file = 'simulation_worker.js' if self.js_mode != 'subprocess' else None
+        else:
+            mode = {'python_mode': self.python_mode}
+            # inprocess runs the configurations through simulation_worker.run_config() as well
+            worker_file = 'simulation_worker.py' if self.python_mode != 'subprocess' else None
+        if framework not in self._file_digests:
+            files = self.scenario.model_files[framework] + ([worker_file] if worker_file else [])
+            self._file_digests[framework] = file_digests(files)
+        return {
+            'framework': framework,
+            'command': self.build_command(config, framework),
+            'mode': mode,
+            'files': self._file_digests[framework],
+            'config': config,
+            'runtime': self.runtime_version(framework),
+        }
+
+    def cached_result(self, config, framework):
+        """(cache key, cached TestResult or None); the key is None without a cache"""
+        if self.cache is None:
+            return None, None
+        try:
+            key = cache_key(self.cache_description(config, framework))
+        except OSError as e:
+            print(f"Not caching {framework}: {e}")
+            return None, None
+        record = None if self.force else self.cache.get(key)
+        if record is None:
+            return key, None
+        self.cache_hits += 1
+        print(f"Using cached {framework} result for config: {config}")
+        return key, TestResult(**record)
+
+    def store_result(self, key, config, framework, test_result):
+        if key is not None and test_result is not None:
+            self.cache.put(key, test_result.to_record(), description={'framework': framework, 'config': config})
+
+    def resume(self, progress_file, records):
+        """Continue the run of progress_file: its results count as done and new ones are appended to it"""
+        self.progress_file = progress_file
+        self.resumed = True
+        for record in records:
+            test_result = TestResult(**record)
+            if test_result.scenario == self.scenario.name:
+                self.completed[(test_result.framework, self.scenario.key(test_result.params))] = test_result
+
+    def start_progress(self, test_type):
+        """Begin the progress file of a new run with a header describing the sweep"""
+        if self.resumed:
+            return
+        self._append_progress({'type': 'run', 'test_type': test_type, 'scenario': self.scenario.name,
+                               'frameworks': self.frameworks, 'started': self.timestamp})
+
+    def record_progress(self, test_result):
+        """Append a finished test to the progress file, synced to disk so it survives a crash"""
+        if test_result is not None:
+            self._append_progress({'type': 'result', 'result': test_result.to_record()})
+
+    def _append_progress(self, entry):
+        with open(self.progress_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def completed_result(self, config, framework):
+        """Result of this test from the resumed run, None if it still has to run"""
+        test_result = self.completed.get((framework, self.scenario.key(config)))
+        if test_result is not None:
+            print(f"Already completed: {framework} test with config: {config}")
+        return test_result
 
     def run_single_test(self, config, framework):
+        """Run a test, or take its result from the resumed run or the cache"""
+        test_result = self.completed_result(config, framework)
+        if test_result is not None:
+            return test_result
+        key, test_result = self.cached_result(config, framework)
+        if test_result is None:
+            test_result = self.execute_single_test(config, framework)
+            self.store_result(key, config, framework, test_result)
+        self.record_progress(test_result)
+        return test_result
+
+    def execute_single_test(self, config, framework):
         """Run test by passing parameters via command line"""
+        if framework in PYTHON_ENGINES and self.python_mode != 'subprocess':
+            return self.run_single_test_persistent(config, framework)
+        if framework == SIMLUXJS and self.js_mode == 'worker':
+            return self.run_single_test_persistent(config, framework)
         print(f"Running {framework} test with config: {config}")
-        
-        if framework == SIMPY:
-            cmd = [
-                sys.executable, 'swimmingpool_simple.py',
-                '--pool-capacity', str(config[POOL_CAPACITY_DIM]),
-                '--sim-duration', str(config[SIM_DURATION_DIM]),
-            ]
-        else:
-            cmd = [
-                'node', 'swimmingpool_simple.js',
-                '--pool-capacity', str(config[POOL_CAPACITY_DIM]),
-                '--sim-duration', str(config[SIM_DURATION_DIM]),
-            ]
+        cmd = self.build_command(config, framework)
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=120) # 2 minute timeout
+            start_time = time.perf_counter()
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=TEST_TIMEOUT)
+            elapsed_time = (time.perf_counter() - start_time) * 1000  # in milliseconds
             # Parse Summary: line from output
             for line in result.stdout.split('\n'):
-                if line.startswith('Summary:'):
-                    json_result = json.loads(line[8:])  # Remove "Summary:" prefix
-                    if json_result:
-                        return TestResult(
-                            framework=framework,
-                            pool_capacity=config[POOL_CAPACITY_DIM],
-                            sim_duration=config[SIM_DURATION_DIM],
-                            total_time=json_result.get('total_time', 0),
-                            avg_time=json_result.get('average_time', 0),
-                            min_time=json_result.get('min_time', 0),
-                            max_time=json_result.get('max_time', 0),
-                            avg_customers=json_result.get('avg_customers', 0),
-                            avg_served_customers=json_result.get('avg_served_customers', 0),
-                            avg_waiting_time=json_result.get('average_waiting_time', 0)
-                        )
+                test_result = self.parse_summary(line, config, framework)
+                if test_result:
+                    # Everything outside the simulations: interpreter start, imports, teardown
+                    test_result.startup_time = round(elapsed_time - test_result.total_time, 2)
+                    return test_result
             return None
         except Exception as e:
             print(f"Error: {e}")
             return None
 
-    def run_all_tests(self, test_type='quick'):
+    def run_single_test_persistent(self, config, framework):
+        """Run a test in this process or in a long-lived worker, without starting a new process"""
+        language = 'js' if framework == SIMLUXJS else 'python'
+        mode = self.js_mode if language == 'js' else self.python_mode
+        print(f"Running {framework} test ({mode}) with config: {config}")
+        # Same settings as build_command(); only the pool scenario runs in the workers
+        request = dict(config)
+        if language == 'python':
+            request.update(engine=PYTHON_ENGINES[framework], track_occupancy=False, tracemalloc=self.tracemalloc)
+        try:
+            if mode == 'inprocess':
+                start_time = time.perf_counter()
+                import simulation_worker
+                startup_time = (time.perf_counter() - start_time) * 1000  # in milliseconds, 0 once imported
+                summary = simulation_worker.run_config(request)
+            else:
+                worker = self.get_worker(language)
+                startup_time = worker.startup_time
+                summary = worker.run(request)
+        except Exception as e:
+            print(f"Error: {e}")
+            return None
+        test_result = self.result_from_summary(summary, config, framework)
+        if test_result:
+            test_result.peak_rss_mb = None  # The peak of a process that runs many tests
+        if test_result and language in self.startup_pending:
+            test_result.startup_time = round(startup_time, 2)
+            self.startup_pending.discard(language)
+        return test_result
+
+    def get_worker(self, language):
+        """The long-lived worker of 'python' or 'js', started on first use"""
+        if language not in self.workers:
+            if language == 'js':
+                cmd = ['node', 'simulation_worker.js', '--warmup', str(self.js_warmup)]
+            else:
+                cmd = [sys.executable, 'simulation_worker.py']
+            self.workers[language] = SimulationWorker(cmd)
+        return self.workers[language]
+
+    def close(self):
+        """Stop the long-lived simulation workers"""
+        for worker in self.workers.values():
+            worker.close()
+        self.workers.clear()
+        if self.cache_hits:
+            print(f"\n{self.cache_hits} results taken from the cache (use --force to re-run them)")
+            self.cache_hits = 0
+
+    async def run_single_test_async(self, config, framework, config_id, semaphore, free_cores):
+        """Run one test as an asyncio subprocess, at most 'jobs' of them at a time"""
+        test_result = self.completed_result(config, framework)
+        if test_result is None:
+            key, test_result = self.cached_result(config, framework)
+            if test_result is None:
+                test_result = await self.execute_single_test_async(config, framework, config_id, semaphore, free_cores)
+                self.store_result(key, config, framework, test_result)
+            self.record_progress(test_result)
+        if test_result is not None:
+            test_result.config_id = config_id
+        return test_result
+
+    async def execute_single_test_async(self, config, framework, config_id, semaphore, free_cores):
+        async with semaphore:
+            core = free_cores.get_nowait() if free_cores is not None else None
+            preexec_fn = (lambda: os.sched_setaffinity(0, {core})) if core is not None else None
+            pinned = f" on core {core}" if core is not None else ""
+            print(f"Running {framework} test with config {config_id}: {config}{pinned}")
+            cmd = self.build_command(config, framework)
+            process = None
+            try:
+                start_time = time.perf_counter()
+                process = await asyncio.create_subprocess_exec(
+                    *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+                    preexec_fn=preexec_fn)
+                test_result = await asyncio.wait_for(
+                    self._read_summary(process, config, framework), timeout=TEST_TIMEOUT)
+                if test_result:
+                    elapsed_time = (time.perf_counter() - start_time) * 1000  # in milliseconds
+                    test_result.startup_time = round(elapsed_time - test_result.total_time, 2)
+                    test_result.config_id = config_id
+                    print(f"  Finished {framework} config {config_id}: {test_result.total_time_s:.2f} s")
+                return test_result
+            except asyncio.TimeoutError:
+                print(f"Error: {framework} config {config_id} timed out after {TEST_TIMEOUT} s")
+                process.kill()
+                await process.wait()
+                return None
+            except Exception as e:
+                print(f"Error: {e}")
+                return None
+            finally:
+                if core is not None:
+                    free_cores.put_nowait(core)
+
+    async def _read_summary(self, process, config, framework):
+        """Parse the output line by line as it arrives and return the Summary result"""
+        test_result = None
+        async for raw_line in process.stdout:
+            line = raw_line.decode(errors='replace').rstrip('\n')
+            test_result = self.parse_summary(line, config, framework) or test_result
+        await process.wait()
+        return test_result
+
+    async def _run_tests_concurrently(self, configurations, jobs, pin_cores):
+        free_cores = None
+        if pin_cores:
+            if not hasattr(os, 'sched_setaffinity'):
+                print("Core pinning is not supported on this platform, running unpinned")
+            else:
+                cores = sorted(os.sched_getaffinity(0))
+                if jobs > len(cores):
+                    print(f"Only {len(cores)} cores available, limiting to {len(cores)} jobs")
+                    jobs = len(cores)
+                free_cores = asyncio.Queue()
+                for core in cores[:jobs]:
+                    free_cores.put_nowait(core)
+
+        semaphore = asyncio.Semaphore(jobs)
+        tasks = [
+            self.run_single_test_async(config, framework, config_id, semaphore, free_cores)
+            for config_id, config in enumerate(configurations)
+            for framework in self.frameworks
+        ]
+        return await asyncio.gather(*tasks)
+
+    def _print_speed_ratio(self, config_results):
+        """Quick comparison for one configuration"""
+        python_result = config_results.get(SIMPY)
+        js_result = config_results.get(SIMLUXJS)
+        heapq_result = config_results.get(HEAPQ)
+        if python_result and js_result:
+            ratio = python_result.total_time / js_result.total_time
+            print(f"  Speed ratio (Python/JS): {ratio:.3f}")
+            if ratio > 1:
+                print(f"  -> JavaScript is {ratio:.2f}x faster")
+            else:
+                print(f"  -> Python is {1/ratio:.2f}x faster")
+        if python_result and heapq_result and python_result.total_time > 0:
+            overhead = 1 - heapq_result.total_time / python_result.total_time
+            print(f"  SimPy overhead: {overhead:.1%} of SimPy time (heapq engine is "
+                  f"{python_result.total_time / heapq_result.total_time:.2f}x faster)")
+
+    def run_all_tests(self, test_type='quick', jobs=1, pin_cores=False):
         """Run the complete performance test suite"""
         configurations = self.create_test_configurations(test_type)
+        self.start_progress(test_type)
         
-        print(f"Starting {test_type} performance tests")
-        print(f"Testing {len(configurations)} configurations for both frameworks")
+        if self.resumed:
+            print(f"Resuming {self.progress_file} ({len(self.completed)} tests already completed)")
+        print(f"Starting {test_type} performance tests of the {self.scenario.title} scenario")
+        print(f"Testing {len(configurations)} configurations for {', '.join(self.frameworks)}")
         print("=" * 60)
-        
-        for i, config in enumerate(configurations):
-            print(f"\nConfiguration {i+1}/{len(configurations)}: {config}")
-            
-            # Test Python
-            python_result = self.run_single_test(config, SIMPY)
-            if python_result:
-                python_result.config_id = i
-                self.results.append(python_result)
-
-            # Test JavaScript
-            js_result = self.run_single_test(config, SIMLUXJS)
-            if js_result:
-                js_result.config_id = i
-                self.results.append(js_result)
-
-            # Quick comparison for this configuration
-            if python_result and js_result:
-                ratio = python_result.total_time / js_result.total_time
-                print(f"  Speed ratio (Python/JS): {ratio:.3f}")
-                if ratio > 1:
-                    print(f"  -> JavaScript is {ratio:.2f}x faster")
-                else:
-                    print(f"  -> Python is {1/ratio:.2f}x faster")
+
+        try:
+            if jobs > 1 or pin_cores:
+                print(f"Running up to {jobs} simulations concurrently")
+                results = asyncio.run(self._run_tests_concurrently(configurations, jobs, pin_cores))
+                # gather() keeps submission order, so results are ordered by config_id and framework
+                n = len(self.frameworks)
+                for i, config in enumerate(configurations):
+                    print(f"\nConfiguration {i+1}/{len(configurations)}: {config}")
+                    config_results = dict(zip(self.frameworks, results[n * i:n * (i + 1)]))
+                    for result in config_results.values():
+                        if result:
+                            self.results.append(result)
+                    self._print_speed_ratio(config_results)
+                return
+
+            for i, config in enumerate(configurations):
+                print(f"\nConfiguration {i+1}/{len(configurations)}: {config}")
+
+                config_results = {}
+                for framework in self.frameworks:
+                    result = self.run_single_test(config, framework)
+                    if result:
+                        result.config_id = i
+                        self.results.append(result)
+                    config_results[framework] = result
+
+                self._print_speed_ratio(config_results)
+        finally:
+            self.close()
 
     def save_results(self, filename=None):
         """Save results to CSV file"""
@@ -235,13 +648,15 @@ class PerformanceTestRunner:
 
         py_results = [r for r in self.results if r.framework == SIMPY]
         js_results = [r for r in self.results if r.framework == SIMLUXJS]
+        heapq_results = [r for r in self.results if r.framework == HEAPQ]
 
         print(f"\nTested {len(py_results)} Python configurations")
         print(f"Tested {len(js_results)} JavaScript configurations")
+        print(f"Tested {len(heapq_results)} heapq engine configurations")
 
         # Performance comparison by dimension
-        self._analyze_performance_by_dimension(py_results=py_results, js_results=js_results, dimension=POOL_CAPACITY_DIM, title='Pool Capacity')
-        self._analyze_performance_by_dimension(py_results=py_results, js_results=js_results, dimension=SIM_DURATION_DIM, title='Simulation Duration') 
+        for dimension in self.scenario.dimensions:
+            self._analyze_performance_by_dimension(py_results=py_results, js_results=js_results, dimension=dimension.name, title=dimension.title)
 
         # Overall performance summary
         if py_results and js_results:
@@ -257,14 +672,57 @@ class PerformanceTestRunner:
             else:
                 print(f"  -> Python is {1/ratio:.2f}x faster")
 
+        # SimPy overhead: same model and statistics, without the SimPy engine
+        if py_results and heapq_results:
+            py_avg = statistics.mean([r.total_time_s for r in py_results])
+            heapq_avg = statistics.mean([r.total_time_s for r in heapq_results])
+            print("\nSimPy Overhead Summary:")
+            print(f"  SimPy average: {py_avg:.2f} s")
+            print(f"  Heapq engine average: {heapq_avg:.2f} s")
+            print(f"  SimPy overhead: {1 - heapq_avg / py_avg:.1%} of SimPy time")
+
+        # Cost per event: independent of how many events each model schedules
+        print("\nPer-Event Cost Summary:")
+        for framework in self.frameworks:
+            event_results = [r for r in self.results if r.framework == framework and r.ns_per_event]
+            if event_results:
+                events = statistics.mean([r.events_processed for r in event_results])
+                ns_per_event = statistics.mean([r.ns_per_event for r in event_results])
+                print(f"  {framework}: {ns_per_event:.0f} ns/event ({1e9 / ns_per_event:,.0f} events/s), "
+                      f"{events:,.0f} events per experiment on average")
+
+        # Peak RSS per test process and, with --tracemalloc, the Python models' allocations
+        print("\nMemory Summary (peak RSS per test process):")
+        for framework in self.frameworks:
+            memory_results = [r for r in self.results if r.framework == framework and r.peak_rss_mb]
+            if memory_results:
+                largest = max(memory_results, key=lambda r: r.peak_rss_mb)
+                print(f"  {framework}: {statistics.mean([r.peak_rss_mb for r in memory_results]):.1f} MB on average, "
+                      f"{largest.peak_rss_mb:.1f} MB at most ({self.scenario.describe(largest.params)}), "
+                      f"{statistics.mean([r.customers_per_mb for r in memory_results]):.1f} {self.scenario.entities}/MB")
+            traced_results = [r for r in self.results if r.framework == framework and r.tracemalloc_peak_mb]
+            if traced_results:
+                largest = max(traced_results, key=lambda r: r.tracemalloc_peak_mb)
+                print(f"    tracemalloc peak {largest.tracemalloc_peak_mb:.2f} MB ({self.scenario.describe(largest.params)}), "
+                      f"top allocation sites:")
+                for site in largest.top_allocations or []:
+                    print(f"      {site['site']}: {site['size_kb']:.1f} KB in {site['blocks']} blocks")
+
+        # Process start and imports, not included in the times above
+        print("\nStartup Overhead Summary (not included in the simulation times):")
+        for framework in self.frameworks:
+            startup_times = [r.startup_time for r in self.results if r.framework == framework]
+            if startup_times:
+                print(f"  {framework}: {sum(startup_times) / 1000:.2f} s in total over {len(startup_times)} tests")
+
 
     def _analyze_performance_by_dimension(self, py_results, js_results, dimension, title):
-        """Analyze results by specific dimension: pool_capacity, sim_duration, or num_experiments"""
+        """Analyze results by specific dimension of the scenario, e.g. pool_capacity or sim_duration"""
         print(f"\n{title} Scaling Analysis:")
         print("-" * 30)
 
-        py_dim_results = [r for r in py_results if getattr(r, dimension, None) is not None]
-        js_dim_results = [r for r in js_results if getattr(r, dimension, None) is not None]
+        py_dim_results = [r for r in py_results if r.params.get(dimension) is not None]
+        js_dim_results = [r for r in js_results if r.params.get(dimension) is not None]
         if not py_dim_results or not js_dim_results:
             print(f"  No results available for {title} analysis")
             return
@@ -294,82 +752,62 @@ class PerformanceTestRunner:
         df = pd.DataFrame(json_results)
         
         # Metrics to plot separately
-        metrics = [
-            ('avg_waiting_time', 'Average Waiting Time (minutes)'),
-            ('avg_customers', 'Average Total Customers'),
-            ('total_time_s', 'Execution Time (seconds)'),
-            ('capacity_customer_per_hour', 'Capacity (customers/hour)')
-        ]
+        metrics = self.scenario.plot_metrics
         
         # Color scheme for frameworks
-        colors = {SIMPY: '#2E86AB', SIMLUXJS: "#F2DE04"}
+        colors = {SIMPY: '#2E86AB', SIMLUXJS: "#F2DE04", HEAPQ: '#6C9A3B'}
+        frameworks = [f for f in FRAMEWORKS if f in set(df['framework'])]
         
         # Get unique configurations
-        configs = df[[POOL_CAPACITY_DIM, SIM_DURATION_DIM]].drop_duplicates().reset_index(drop=True)
+        dimensions = self.scenario.dimensions
+        configs = df[self.scenario.dimension_names].drop_duplicates().reset_index(drop=True)
 
         # Create separate plot for each metric
         for metric_key, metric_title in metrics:
             plt.figure(figsize=(14, 8))  # Increased width to accommodate legend
             
             # Prepare data for plotting
-            simpy_values = []
-            simlux_values = []
+            framework_values = {framework: [] for framework in frameworks}
             x_labels = []
             
             for _, config in configs.iterrows():
-                pool_cap = config[POOL_CAPACITY_DIM]
-                sim_dur = config[SIM_DURATION_DIM]
-
                 # Create label showing actual config values
-                config_label = f"P{pool_cap}\nD{sim_dur//60}h"
+                config_label = "\n".join(dimension.tick(config[dimension.name]) for dimension in dimensions)
                 x_labels.append(config_label)
                 
                 # Get values for each framework
-                simpy_data = df[(df['framework'] == SIMPY) & 
-                            (df[POOL_CAPACITY_DIM] == pool_cap) & 
-                            (df[SIM_DURATION_DIM] == sim_dur)]
-                simlux_data = df[(df['framework'] == SIMLUXJS) & 
-                                (df[POOL_CAPACITY_DIM] == pool_cap) & 
-                                (df[SIM_DURATION_DIM] == sim_dur)]
-
-                simpy_val = simpy_data[metric_key].mean() if not simpy_data.empty else 0
-                simlux_val = simlux_data[metric_key].mean() if not simlux_data.empty else 0
-                
-                simpy_values.append(simpy_val)
-                simlux_values.append(simlux_val)
+                in_config = np.logical_and.reduce([df[dimension.name] == config[dimension.name] for dimension in dimensions])
+                for framework in frameworks:
+                    framework_data = df[(df['framework'] == framework) & in_config]
+                    framework_values[framework].append(framework_data[metric_key].mean() if not framework_data.empty else 0)
             
             # Create grouped bar chart
             x = np.arange(len(x_labels))
-            width = 0.35
+            width = 0.7 / len(frameworks)
             
-            bars1 = plt.bar(x - width/2, simpy_values, width, label='SimPy', 
-                        color=colors[SIMPY], alpha=0.8, edgecolor='black', linewidth=0.5)
-            bars2 = plt.bar(x + width/2, simlux_values, width, label='SimLuxJS', 
-                        color=colors[SIMLUXJS], alpha=0.8, edgecolor='black', linewidth=0.5)
+            all_bars = []
+            for j, framework in enumerate(frameworks):
+                offset = (j - (len(frameworks) - 1) / 2) * width
+                all_bars.append(plt.bar(x + offset, framework_values[framework], width, label=framework, 
+                            color=colors[framework], alpha=0.8, edgecolor='black', linewidth=0.5))
             
             # Customize plot
-            plt.title(f'{metric_title}\nSimPy vs SimLuxJS Comparison', 
+            plt.title(f'{metric_title}\n{" vs ".join(frameworks)} Comparison', 
                     fontsize=16, fontweight='bold', pad=20)
-            plt.xlabel('Configuration (Pool Capacity / Simulation Duration)', fontsize=12, fontweight='bold')
+            plt.xlabel(f'Configuration ({" / ".join(dimension.title for dimension in dimensions)})', fontsize=12, fontweight='bold')
             plt.ylabel(metric_title.split('(')[0].strip(), fontsize=12, fontweight='bold')
             plt.xticks(x, x_labels, rotation=0)
             plt.legend(fontsize=11, loc='upper left')
             plt.grid(True, alpha=0.3, axis='y')
 
             # Add value labels on bars
-            for bar in bars1:
-                height = bar.get_height()
-                if height > 0:
-                    plt.text(bar.get_x() + bar.get_width()/2., height,
-                            f'{height:.1f}', ha='center', va='bottom', 
-                            fontsize=7, fontweight='bold', rotation=45)
-
-            for bar in bars2:
-                height = bar.get_height()
-                if height > 0:
-                    plt.text(bar.get_x() + bar.get_width()/2., height,
-                            f'{height:.1f}', ha='center', va='bottom', 
-                            fontsize=7, fontweight='bold', rotation=45)
+            for bars in all_bars:
+                for bar in bars:
+                    height = bar.get_height()
+                    if height > 0:
+                        plt.text(bar.get_x() + bar.get_width()/2., height,
+                                f'{height:.1f}', ha='center', va='bottom', 
+                                fontsize=7, fontweight='bold', rotation=45)
 
             # Use tight_layout with padding to accommodate the legend
             plt.tight_layout()
@@ -392,28 +830,24 @@ class PerformanceTestRunner:
             print("No results available")
             return
         
-        # Group results by framework
-        simpy_results = [r for r in self.results if r.framework == SIMPY and r.pool_capacity == 100 and r.sim_duration == 2400]
-        simlux_results = [r for r in self.results if r.framework == SIMLUXJS and r.pool_capacity == 100 and r.sim_duration == 2400]
+        # Group results by framework, in the scenario's reference configuration
+        reference = self.scenario.key(self.scenario.reference)
+        simpy_results = [r for r in self.results if r.framework == SIMPY and self.scenario.key(r.params) == reference]
+        simlux_results = [r for r in self.results if r.framework == SIMLUXJS and self.scenario.key(r.params) == reference]
 
         if not simpy_results or not simlux_results:
             print("Insufficient data for comparison")
             return
         
         # Calculate metrics
-        metrics = [
-            ('avg_waiting_time', 'Average Waiting Time (min)'),
-            ('avg_customers', 'Average Total Customers'),
-            ('avg_served_customers', 'Average Served Customers'),
-            ('capacity_customer_per_hour', 'Capacity (customers/hour)'),
-        ]
+        metrics = self.scenario.table_metrics
         
         print(f"{'Metric':<30} {'SimPy':<15} {'SimLuxJS':<15} {'Difference':<15}")
         print("-" * 80)
         
         for metric_key, metric_name in metrics:
-            simpy_avg = statistics.mean([getattr(r, metric_key) for r in simpy_results])
-            simlux_avg = statistics.mean([getattr(r, metric_key) for r in simlux_results])
+            simpy_avg = statistics.mean([r.to_dict()[metric_key] for r in simpy_results])
+            simlux_avg = statistics.mean([r.to_dict()[metric_key] for r in simlux_results])
             
             if simpy_avg != 0:
                 diff_pct = ((simlux_avg - simpy_avg) / simpy_avg) * 100
@@ -427,46 +861,84 @@ class PerformanceTestRunner:
     def create_performance_heatmap(self):
         """Create heat maps showing performance patterns"""
         print("\nCreating performance heat maps...")
+        self._create_heatmaps('total_time_s', 'Execution Time (seconds)', 'Performance Heat Map', 'heatmap_', 'YlOrRd')
 
-        if not self.results:
+    def create_memory_heatmap(self):
+        """Create heat maps of the customers (the scenario's entities) simulated per MB of peak RSS"""
+        print("\nCreating memory heat maps...")
+        self._create_heatmaps('customers_per_mb', f'{self.scenario.entities.capitalize()} per MB of peak RSS',
+                              'Memory Efficiency Heat Map', 'memory_heatmap', 'YlGn')
+
+    def _create_heatmaps(self, value, label, title, file_prefix, cmap):
+        """One heat map of value per framework over the first two dimensions, e.g. pool_capacity x sim_duration"""
+        if not self.results or len(self.scenario.dimensions) < 2:
             return
+        rows, columns = self.scenario.dimensions[:2]
         # Convert results to DataFrame
         json_results = [r.to_dict() for r in self.results]
         df = pd.DataFrame(json_results)
 
         # Create pivot tables for heat maps
-        for framework in [SIMPY, SIMLUXJS]:
-            framework_df = df[df['framework'] == framework]
+        for framework in FRAMEWORKS:
+            framework_df = df[(df['framework'] == framework) & df[value].notna()]
             
             if len(framework_df) < 4:
                 continue
                 
-            # Create heat map for pool_capacity vs sim_duration
+            # Create heat map for e.g. pool_capacity vs sim_duration
+            heatmap_file = os.path.join(self.output_dir, f'{framework.lower()}_{file_prefix}_{self.timestamp}.png')
             try:
                 pivot_table = framework_df.pivot_table(
-                    values='total_time_s', 
-                    index='pool_capacity', 
-                    columns='sim_duration', 
+                    values=value, 
+                    index=rows.name, 
+                    columns=columns.name, 
                     aggfunc='mean'
                 )
                 
                 plt.figure(figsize=(12, 8))
-                sns.heatmap(pivot_table, annot=True, fmt='.2f', cmap='YlOrRd', 
-                        cbar_kws={'label': 'Execution Time (seconds)'})
-                plt.title(f'{framework} Performance Heat Map', fontsize=16, fontweight='bold')
-                plt.xlabel('Simulation Duration (minutes)', fontsize=12)
-                plt.ylabel('Pool Capacity', fontsize=12)
+                sns.heatmap(pivot_table, annot=True, fmt='.2f', cmap=cmap, 
+                        cbar_kws={'label': label})
+                plt.title(f'{framework} {title}', fontsize=16, fontweight='bold')
+                plt.xlabel(columns.label, fontsize=12)
+                plt.ylabel(rows.label, fontsize=12)
                 plt.tight_layout()
                 
                 # Save in output directory
-                heatmap_file = os.path.join(self.output_dir, f'{framework.lower()}_heatmap__{self.timestamp}.png')
                 plt.savefig(heatmap_file, dpi=300, bbox_inches='tight')
+                print(f"{framework} {title.lower()} saved: {os.path.basename(heatmap_file)}")
     
             except Exception as e:
-                print(f"Error creating {framework} heatmap: {e}")
+                print(f"Error creating {framework} {title.lower()}: {e}")
             finally:
                 plt.close()
-                print(f"{framework} heatmap saved: {os.path.basename(heatmap_file)}")
+
+    def write_markdown_summary(self):
+        """Write the results as a Markdown table to summary_file"""
+        if not self.results:
+            return
+        columns = [('Framework', lambda r: r.framework)]
+        columns += [(dimension.label, lambda r, name=dimension.name: r.params[name]) for dimension in self.scenario.dimensions]
+        columns += [
+            ('Total time (s)', lambda r: f"{r.total_time_s:.2f}"),
+            ('ns/event', lambda r: f"{r.ns_per_event:.0f}" if r.ns_per_event else '-'),
+            ('Peak RSS (MB)', lambda r: f"{r.peak_rss_mb:.1f}" if r.peak_rss_mb else '-'),
+            (f'{self.scenario.entities.capitalize()}/MB', lambda r: f"{r.customers_per_mb:.1f}" if r.customers_per_mb else '-'),
+            ('tracemalloc peak (MB)', lambda r: f"{r.tracemalloc_peak_mb:.2f}" if r.tracemalloc_peak_mb else '-'),
+        ]
+        results = sorted(self.results, key=lambda r: (r.framework, self.scenario.key(r.params)))
+        with open(self.summary_file, 'w', encoding='utf-8') as f:
+            f.write(f"# Performance Summary {self.timestamp} ({self.scenario.title})\n\n")
+            f.write("| " + " | ".join(name for name, _ in columns) + " |\n")
+            f.write("|" + "|".join("---" for _ in columns) + "|\n")
+            for r in results:
+                f.write("| " + " | ".join(str(cell(r)) for _, cell in columns) + " |\n")
+            traced = [r for r in results if r.top_allocations]
+            if traced:
+                largest = max(traced, key=lambda r: r.tracemalloc_peak_mb)
+                f.write(f"\n## Top allocation sites ({largest.framework}, {self.scenario.describe(largest.params)})\n\n")
+                for site in largest.top_allocations:
+                    f.write(f"- `{site['site']}`: {site['size_kb']:.1f} KB in {site['blocks']} blocks\n")
+        print(f"Summary saved to {self.summary_file}")
 
     def analyze_results(self):
         """Comprehensive analysis with all metrics including file outputs"""
@@ -476,6 +948,8 @@ class PerformanceTestRunner:
         self.create_simulation_results_plot()
         self.create_detailed_metrics_table()
         self.create_performance_heatmap()        
+        self.create_memory_heatmap()
+        self.write_markdown_summary()
         
         print("\n" + "="*80)
         print("ANALYSIS COMPLETE")
@@ -484,19 +958,66 @@ class PerformanceTestRunner:
 
 def main():
     parser = argparse.ArgumentParser(description='Run comprehensive performance tests')
-    parser.add_argument('--type', choices=['quick', 'comprehensive', 'stress'], 
-                       default='quick', help='Type of test to run')
+    parser.add_argument('--type', choices=TEST_TYPES, 
+                       help='Type of test to run (default: quick, or that of the resumed run)')
+    parser.add_argument('--scenario', choices=list(SCENARIOS),
+                       help='Model to test, see scenarios.py (default: pool, or that of the resumed run)')
     parser.add_argument('--output-dir', default=OUTPUT_DIR,
                        help='Output directory for all results')
     parser.add_argument('--csv-filename', 
                        help='Custom CSV filename (optional)')
     parser.add_argument('--log-filename',
                        help='Custom log filename (optional)')
+    parser.add_argument('--frameworks', nargs='+', choices=FRAMEWORKS,
+                       help="Frameworks to test (default: all of the scenario's, or those of the resumed run)")
+    parser.add_argument('--jobs', type=int, default=1,
+                       help='Number of simulations to run concurrently (default: 1)')
+    parser.add_argument('--pin-cores', action='store_true',
+                       help='Pin each concurrent simulation to its own CPU core (Linux only)')
+    parser.add_argument('--python-mode', choices=PYTHON_MODES, default='subprocess',
+                       help='Run the Python models in a new process per test (default), '
+                            'in this process, or in one long-lived worker process')
+    parser.add_argument('--js-mode', choices=JS_MODES, default='subprocess',
+                       help='Run the JS model in a new Node process per test (default) '
+                            'or in one long-lived, JIT-warmed worker process')
+    parser.add_argument('--js-warmup', type=int, default=JS_WARMUP,
+                       help=f'Warm-up replications the JS worker discards (default: {JS_WARMUP})')
+    parser.add_argument('--force', action='store_true',
+                       help=f'Run every test, even those with a result in {CACHE_FILENAME}')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Neither read nor write the result cache')
+    parser.add_argument('--tracemalloc', action='store_true',
+                       help='Also trace the allocations of the Python models (peak, top sites); slows them down')
+    parser.add_argument('--resume', metavar='RUN',
+                       help='Continue an interrupted run: its performance_results_*.jsonl file, or the '
+                            'output directory holding it (the newest one is used); only missing tests run')
     
     args = parser.parse_args()
+    progress_file, header, records = None, {}, []
+    if args.resume:
+        try:
+            progress_file = find_progress_file(args.resume)
+            header, records = read_progress(progress_file)
+        except OSError as e:
+            parser.error(f"--resume: {e}")
+    test_type = args.type or header.get('test_type', 'quick')
+    scenario = SCENARIOS[args.scenario or header.get('scenario', 'pool')]
+    frameworks = args.frameworks or header.get('frameworks', scenario.frameworks)
+    if not set(frameworks) <= set(scenario.frameworks):
+        parser.error(f"The {scenario.name} scenario has the frameworks {', '.join(scenario.frameworks)}")
+    if (args.python_mode != 'subprocess' or args.js_mode != 'subprocess') and not scenario.persistent:
+        parser.error("--python-mode/--js-mode other than subprocess only run the pool scenario")
+    if (args.python_mode != 'subprocess' or args.js_mode != 'subprocess') and (args.jobs > 1 or args.pin_cores):
+        parser.error("--python-mode/--js-mode other than subprocess run one test at a time, "
+                     "use them without --jobs/--pin-cores")
     
     # Create runner with output directory
-    runner = PerformanceTestRunner(output_dir=args.output_dir)
+    runner = PerformanceTestRunner(output_dir=args.output_dir, frameworks=frameworks,
+                                   python_mode=args.python_mode, js_mode=args.js_mode,
+                                   js_warmup=args.js_warmup, use_cache=not args.no_cache, force=args.force,
+                                   tracemalloc=args.tracemalloc, scenario=scenario.name)
+    if progress_file:
+        runner.resume(progress_file, records)
     
     # Setup custom log file if specified
     if args.log_filename:
@@ -511,11 +1032,11 @@ def main():
         # Redirect stdout to both console and file
         sys.stdout = tee_output
         
-        print("SimPy vs SimLuxJS Comprehensive Performance Testing Framework")
+        print(f"SimPy vs SimLuxJS Comprehensive Performance Testing Framework: {scenario.title}")
         print("=" * 70)
 
         # Run tests
-        runner.run_all_tests(args.type)
+        runner.run_all_tests(test_type, jobs=args.jobs, pin_cores=args.pin_cores)
 
         # Save CSV results
         if args.csv_filename:
@@ -0,0 +1,75 @@
+"""
+Result Cache
+============
+Stores performance test results in a local SQLite database, keyed by a hash of
+everything that determines them, so that performance_test.py only runs the
+configurations it has not run before:
+
+- framework and how it is run (e.g. subprocess or worker)
+- contents of the model source files, which also hold the random seeds
+- the configuration (pool capacity, simulation duration, ...)
+- interpreter/runtime and library versions
+
+A changed model file or a new Python/Node version gives new keys, so stale
+results are never returned; they simply stay unused in the database.
+
+USAGE:
+    cache = ResultCache('output/result_cache.sqlite3')
+    key = cache_key({'framework': 'SimPy', 'files': file_digests([...]), 'config': config})
+    record = cache.get(key)
+    if record is None:
+        record = run_test(config)
+        cache.put(key, record)
+"""
+
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+
+CACHE_FILENAME = 'result_cache.sqlite3'
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def file_digests(paths):
+    return {path: file_digest(path) for path in paths}
+
+
+def cache_key(parts):
+    """SHA-256 of a JSON-serializable description of a test"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+class ResultCache:
+    """SQLite table of result records (JSON) by cache key"""
+    def __init__(self, filename):
+        self.connection = sqlite3.connect(filename)
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    description TEXT,
+                    record TEXT NOT NULL,
+                    created TEXT NOT NULL
+                )""")
+
+    def get(self, key):
+        """The stored record, None on a cache miss"""
+        row = self.connection.execute("SELECT record FROM results WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key, record, description=None):
+        """Store a record, replacing any earlier one with the same key"""
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results (key, description, record, created) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(description, sort_keys=True), json.dumps(record),
+                 datetime.now().isoformat(timespec='seconds')))
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,70 @@
+/*
+ * Run Summary (JavaScript)
+ * ========================
+ * Helpers for the 'Summary:{json}' line a model prints once all its experiments are done,
+ * with the same keys as run_summary.py (see there and scenarios.py): timingSummary() for
+ * the per-experiment times, eventSummary() for the event counts and cost per event, and
+ * peakRssMb() for the peak resident set size of the process.
+ *
+ * countEvents() counts the scheduling calls of a SimLuxJS instance by engine-neutral event
+ * type (see event_counters.py): advance() is a 'timeout', addSimEntity() a 'process_start'
+ * and waitForResource() a 'wait_until'. It is meant for runs without a stop time, in which
+ * every scheduled event is also processed.
+ */
+
+const fs = require('fs');
+
+const EVENT_METHODS = { advance: 'timeout', addSimEntity: 'process_start', waitForResource: 'wait_until' };
+
+const sum = (values) => values.reduce((a, b) => a + b, 0);
+
+// average_time, min_time, max_time and total_time of per-experiment times in milliseconds
+function timingSummary(times) {
+    return {
+        average_time: parseFloat((sum(times) / times.length).toFixed(2)),
+        min_time: parseFloat(Math.min(...times).toFixed(2)),
+        max_time: parseFloat(Math.max(...times).toFixed(2)),
+        total_time: parseFloat(sum(times).toFixed(2))
+    };
+}
+
+// Count the calls of the scheduling methods in eventsByType ({type: {scheduled, processed}}).
+// target is a SimLuxJS instance, or SimLuxJS.prototype to count in every instance, also the
+// entities a model adds in its constructor.
+function countEvents(target, eventsByType) {
+    for (const [method, eventType] of Object.entries(EVENT_METHODS)) {
+        const counts = eventsByType[eventType] || (eventsByType[eventType] = { scheduled: 0, processed: 0 });
+        const call = target[method];
+        target[method] = function (...args) {
+            counts.scheduled++;
+            counts.processed++;
+            return call.apply(this, args);
+        };
+    }
+}
+
+// Event counts per experiment and cost per event of experiments taking totalTime ms together
+function eventSummary(eventsByType, numExperiments, totalTime) {
+    const eventsScheduled = sum(Object.values(eventsByType).map(counts => counts.scheduled));
+    const eventsProcessed = sum(Object.values(eventsByType).map(counts => counts.processed));
+    return {
+        events_scheduled: parseFloat((eventsScheduled / numExperiments).toFixed(1)), // per experiment
+        events_processed: parseFloat((eventsProcessed / numExperiments).toFixed(1)), // per experiment
+        events_per_second: eventsProcessed > 0 ? Math.round(eventsProcessed / (totalTime / 1000)) : null,
+        ns_per_event: eventsProcessed > 0 ? parseFloat((totalTime * 1e6 / eventsProcessed).toFixed(1)) : null,
+        events_by_type: eventsByType // totals over all experiments
+    };
+}
+
+// Peak resident set size of this process in MB, null where unknown. VmHWM rather than
+// process.resourceUsage().maxRSS, which Linux carries over from the parent process.
+function peakRssMb() {
+    try {
+        const match = /VmHWM:\s+(\d+) kB/.exec(fs.readFileSync('/proc/self/status', 'utf8'));
+        return match ? parseFloat((parseInt(match[1], 10) / 1024).toFixed(1)) : null;
+    } catch (e) {
+        return null;
+    }
+}
+
+module.exports = { timingSummary, countEvents, eventSummary, peakRssMb };
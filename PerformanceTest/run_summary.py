@@ -0,0 +1,93 @@
+"""
+Run Summary
+===========
+Helpers for the 'Summary:{json}' line a model prints once all its experiments are done.
+performance_test.py runs the model of a scenario (see scenarios.py) and reads that line;
+any model printing it plugs into the same sweep, cache, analysis and plots.
+
+The keys common to all scenarios (times in milliseconds, simulation runs only, i.e.
+without interpreter start and imports):
+- framework, num_experiments and the scenario's parameters (e.g. pool_capacity, n, cars)
+- average_time, min_time, max_time, total_time: over the experiments (timing_summary())
+- the entities per experiment under the scenario's entity key (avg_customers, avg_dishes, avg_cars)
+- events_scheduled, events_processed (per experiment), events_per_second, ns_per_event
+- peak_rss_mb: peak resident set size of the process (peak_rss_mb())
+Anything else is model specific, e.g. average_waiting_time or final_time.
+
+run_summary_command() runs a model in a new process and returns its Summary, and
+best_of_rounds() does so for several variants of a model in alternating order, as the
+benchmark_*.py scripts comparing two variants do.
+
+USAGE:
+    summary = {'framework': 'SimPy', 'n': n, **timing_summary(times)}
+    print_summary(summary)
+
+    best, last = best_of_rounds({'loop': loop_cmd, 'bulk': bulk_cmd}, 3, ['average_time', 'peak_rss_mb'])
+"""
+
+import json
+import subprocess
+
+SUMMARY_PREFIX = 'Summary:'
+
+
+def timing_summary(times):
+    """average_time, min_time, max_time and total_time of per-experiment times in milliseconds"""
+    return {
+        'average_time': round(sum(times) / len(times), 2),
+        'min_time': round(min(times), 2),
+        'max_time': round(max(times), 2),
+        'total_time': round(sum(times), 2),
+    }
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process in MB, None where unknown. VmHWM rather than
+    getrusage()'s ru_maxrss, which Linux carries over from the parent through fork and exec.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)  # in kB
+    except OSError:
+        pass
+    return None
+
+
+def print_summary(summary):
+    print(f"{SUMMARY_PREFIX}{json.dumps(summary)}")
+
+
+def parse_summary_line(line):
+    """The Summary dictionary of a 'Summary:{json}' output line, None for any other line"""
+    if not line.startswith(SUMMARY_PREFIX):
+        return None
+    return json.loads(line[len(SUMMARY_PREFIX):])
+
+
+def run_summary_command(cmd):
+    """Summary dictionary of a model run as the command line cmd in a new process"""
+    output = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    for line in output.splitlines():
+        summary = parse_summary_line(line)
+        if summary is not None:
+            return summary
+    raise RuntimeError(f"No Summary line in the output of {' '.join(cmd)}")
+
+
+def best_of_rounds(commands, rounds, keys):
+    """
+    Run the commands of {variant: cmd} rounds times each, alternating which variant runs
+    first, and return ({variant: {key: smallest value}}, {variant: Summary of its last run})
+    """
+    best = {name: {} for name in commands}
+    last = {}
+    for round_number in range(rounds):
+        for name in (list(commands) if round_number % 2 == 0 else list(reversed(commands))):
+            summary = run_summary_command(commands[name])
+            for key in keys:
+                best[name][key] = min(best[name].get(key, summary[key]), summary[key])
+            last[name] = summary
+    return best, last
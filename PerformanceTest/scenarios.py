@@ -0,0 +1,223 @@
+"""
+Scenarios of performance_test.py
+================================
+A scenario is a model implemented for several frameworks, with the parameter dimensions
+performance_test.py sweeps. Every framework's model is a command line that takes the
+dimensions as options (--pool-capacity 50, --n 10000, ...) and prints the Summary line
+described in run_summary.py; that is all a new model pair needs to plug into the same
+sweep, result cache, resume, analysis and plots:
+
+- pool: the swimming pool (swimmingpool_simple.py/.js), pool capacity x simulated duration
+- dish: the dishwashing example (dishwashing_simple.py/.js), dish count x washers
+- car:  the car demo (cardemo_simple.py/.js), car count x toll booths
+
+Test types create the configurations from the dimension values (Scenario.configurations):
+'quick' varies one dimension at a time over its first three values, the others at their
+first value; 'comprehensive' runs all combinations; 'stress' the last and second-to-last
+values of all dimensions.
+
+USAGE:
+    scenario = SCENARIOS['dish']
+    for config in scenario.configurations('quick'):
+        cmd = scenario.command(config, SIMPY)
+"""
+
+import sys
+from itertools import product
+
+SIMPY = "SimPy"
+SIMLUXJS = "SimLuxJS"
+HEAPQ = "Heapq"
+FRAMEWORKS = [SIMPY, SIMLUXJS, HEAPQ]
+TEST_TYPES = ['quick', 'comprehensive', 'stress']
+POOL_CAPACITY_DIM = 'pool_capacity'
+SIM_DURATION_DIM = 'sim_duration'
+SIMLUXJS_FILE = '../SimLuxJS/SimLuxJS.js'
+# Source files that determine the results of the pool's Python frameworks (RANDOM_SEED is set in the models)
+PYTHON_MODEL_FILES = ['swimmingpool_simple.py', 'control_variables.py', 'variate_streams.py', 'distributions.py',
+                      'accumulators.py', 'event_trace.py', 'output_analysis.py', 'event_counters.py',
+                      'run_summary.py']
+
+
+class Dimension:
+    """A parameter of a scenario, passed to the models as --<name with dashes>"""
+    def __init__(self, name, values, title, unit=None, tick=None, describe=None):
+        self.name = name
+        self.values = values
+        self.title = title  # e.g. 'Pool Capacity'
+        self.unit = unit  # e.g. 'minutes', None for counts
+        self.tick = tick or (lambda value: str(value))  # Short label on plot axes, e.g. 'P50'
+        self.describe = describe or (lambda value: f"{name} {value}")  # In text, e.g. 'capacity 50'
+
+    @property
+    def option(self):
+        return '--' + self.name.replace('_', '-')
+
+    @property
+    def label(self):
+        """Axis and column label, e.g. 'Simulation Duration (minutes)'"""
+        return f"{self.title} ({self.unit})" if self.unit else self.title
+
+
+class Scenario:
+    """A model pair (or triple) and the dimensions performance_test.py sweeps"""
+    def __init__(self, name, title, commands, model_files, dimensions, entities, entity_key,
+                 reference, plot_metrics, table_metrics, model_metrics=(), persistent=False, tracemalloc=False):
+        self.name = name
+        self.title = title
+        self.commands = commands  # framework -> command line without the dimension options
+        self.model_files = model_files  # framework -> source files its results depend on (cache key)
+        self.dimensions = dimensions  # [Dimension], the first two are the axes of the heat maps
+        self.entities = entities  # What the model counts per experiment, e.g. 'customers'
+        self.entity_key = entity_key  # Summary key of the entities per experiment
+        self.reference = reference  # Configuration of the detailed metrics table
+        self.plot_metrics = plot_metrics  # [(TestResult.to_dict() key, title)], one plot each
+        self.table_metrics = table_metrics  # [(TestResult.to_dict() key, name)] of the detailed table
+        self.model_metrics = list(model_metrics)  # Summary keys kept in TestResult.model_metrics
+        self.persistent = persistent  # Also runs in simulation_worker.py/.js (--python-mode/--js-mode)
+        self.tracemalloc = tracemalloc  # The Python models take --tracemalloc
+
+    @property
+    def frameworks(self):
+        return list(self.commands)
+
+    @property
+    def dimension_names(self):
+        return [dimension.name for dimension in self.dimensions]
+
+    def configurations(self, test_type='quick'):
+        """The configurations ({dimension name: value}) of a test type"""
+        names = self.dimension_names
+        if test_type == 'quick':
+            # One dimension at a time over its first three values
+            base = {dimension.name: dimension.values[0] for dimension in self.dimensions}
+            return [{**base, dimension.name: value} for dimension in self.dimensions for value in dimension.values[:3]]
+        if test_type == 'comprehensive':
+            # Full factorial test - all combinations
+            return [dict(zip(names, combo)) for combo in product(*(dimension.values for dimension in self.dimensions))]
+        if test_type == 'stress':
+            # Stress test - high load scenarios
+            return [{dimension.name: dimension.values[index] for dimension in self.dimensions} for index in (-1, -2)]
+        raise ValueError(f"Unknown test type {test_type!r}, expected one of {TEST_TYPES}")
+
+    def command(self, config, framework, tracemalloc=False):
+        """Command line running one framework with the given configuration"""
+        cmd = list(self.commands[framework])
+        if tracemalloc and self.tracemalloc and framework != SIMLUXJS:
+            cmd.append('--tracemalloc')
+        for dimension in self.dimensions:
+            cmd += [dimension.option, str(config[dimension.name])]
+        return cmd
+
+    def key(self, params):
+        """Hashable identity of a configuration, e.g. to find the results of a resumed run"""
+        return tuple(params[name] for name in self.dimension_names)
+
+    def describe(self, params):
+        """A configuration in text, e.g. 'capacity 100, 2400 min'"""
+        return ", ".join(dimension.describe(params[dimension.name]) for dimension in self.dimensions)
+
+
+SCENARIOS = {
+    'pool': Scenario(
+        'pool', 'Swimming Pool',
+        # The JS model only collects waiting times, so the Python models skip the occupancy metrics
+        commands={
+            SIMPY: [sys.executable, 'swimmingpool_simple.py', '--no-occupancy'],
+            SIMLUXJS: ['node', 'swimmingpool_simple.js'],
+            HEAPQ: [sys.executable, 'swimmingpool_simple.py', '--engine', 'fast', '--no-occupancy'],
+        },
+        model_files={
+            SIMPY: PYTHON_MODEL_FILES,
+            SIMLUXJS: ['swimmingpool_simple.js', 'run_summary.js', SIMLUXJS_FILE],
+            HEAPQ: PYTHON_MODEL_FILES,
+        },
+        dimensions=[
+            Dimension(POOL_CAPACITY_DIM, [25, 50, 100, 200], 'Pool Capacity',
+                      tick=lambda value: f"P{value}", describe=lambda value: f"capacity {value}"),
+            Dimension(SIM_DURATION_DIM, [2400, 4800, 7200, 9600, 12000], 'Simulation Duration', unit='minutes',
+                      tick=lambda value: f"D{value // 60}h", describe=lambda value: f"{value} min"),
+        ],
+        entities='customers', entity_key='avg_customers',
+        reference={POOL_CAPACITY_DIM: 100, SIM_DURATION_DIM: 2400},
+        plot_metrics=[
+            ('avg_waiting_time', 'Average Waiting Time (minutes)'),
+            ('avg_customers', 'Average Total Customers'),
+            ('total_time_s', 'Execution Time (seconds)'),
+            ('capacity_customer_per_hour', 'Capacity (customers/hour)'),
+        ],
+        table_metrics=[
+            ('avg_waiting_time', 'Average Waiting Time (min)'),
+            ('avg_customers', 'Average Total Customers'),
+            ('avg_served_customers', 'Average Served Customers'),
+            ('capacity_customer_per_hour', 'Capacity (customers/hour)'),
+        ],
+        persistent=True, tracemalloc=True,
+    ),
+    'dish': Scenario(
+        'dish', 'Dishwashing',
+        # Three experiments: n = 100000 takes about 8 s per experiment in SimPy and 23 s in SimLuxJS
+        commands={
+            SIMPY: [sys.executable, 'dishwashing_simple.py', '--num-experiments', '3'],
+            SIMLUXJS: ['node', 'dishwashing_simple.js', '--num-experiments', '3'],
+        },
+        model_files={
+            SIMPY: ['dishwashing_simple.py', '../SimLuxJS/Performance Tests/Dishwashing/DishExample.py',
+                    'event_counters.py', 'run_summary.py', 'benchmark_harness.py', 'distributions.py',
+                    'variate_streams.py'],
+            SIMLUXJS: ['dishwashing_simple.js', '../SimLuxJS/Performance Tests/Dishwashing/DishExample.js',
+                       'run_summary.js', SIMLUXJS_FILE],
+        },
+        dimensions=[
+            Dimension('n', [1000, 10000, 25000, 50000, 100000], 'Dishes',
+                      tick=lambda value: f"N{value // 1000}k", describe=lambda value: f"{value} dishes"),
+            Dimension('washers', [2, 4, 8], 'Washers',
+                      tick=lambda value: f"W{value}", describe=lambda value: f"{value} washer{'s' * (value != 1)}"),
+        ],
+        entities='dishes', entity_key='avg_dishes',
+        reference={'n': 10000, 'washers': 2},
+        plot_metrics=[
+            ('final_time', 'Time Until All Dishes Are Clean (minutes)'),
+            ('total_time_s', 'Execution Time (seconds)'),
+            ('average_setup_time', 'Setup Time per Experiment (milliseconds)'),
+        ],
+        table_metrics=[
+            ('avg_customers', 'Dishes per Experiment'),
+            ('final_time', 'Final Time (min)'),
+            ('events_processed', 'Events per Experiment'),
+        ],
+        model_metrics=['final_time', 'average_setup_time'],
+    ),
+    'car': Scenario(
+        'car', 'Car Demo',
+        # SimLuxJS searches its waiting list per advance(), 25000 cars take about 7 s per experiment
+        commands={
+            SIMPY: [sys.executable, 'cardemo_simple.py', '--num-experiments', '5'],
+            SIMLUXJS: ['node', 'cardemo_simple.js', '--num-experiments', '5'],
+        },
+        model_files={
+            SIMPY: ['cardemo_simple.py', 'event_counters.py', 'run_summary.py', 'benchmark_harness.py',
+                    'bulk_processes.py', 'distributions.py', 'variate_streams.py'],
+            SIMLUXJS: ['cardemo_simple.js', 'run_summary.js', SIMLUXJS_FILE],
+        },
+        dimensions=[
+            Dimension('cars', [1000, 5000, 10000, 25000], 'Cars',
+                      tick=lambda value: f"C{value // 1000}k", describe=lambda value: f"{value} cars"),
+            Dimension('toll_booths', [1, 2, 3], 'Toll Booths',
+                      tick=lambda value: f"T{value}", describe=lambda value: f"{value} toll booth{'s' * (value != 1)}"),
+        ],
+        entities='cars', entity_key='avg_cars',
+        reference={'cars': 10000, 'toll_booths': 1},
+        plot_metrics=[
+            ('avg_waiting_time', 'Average Toll Waiting Time (minutes)'),
+            ('total_time_s', 'Execution Time (seconds)'),
+            ('average_setup_time', 'Setup Time per Experiment (milliseconds)'),
+        ],
+        table_metrics=[
+            ('avg_waiting_time', 'Average Toll Waiting Time (min)'),
+            ('max_toll_queue', 'Maximum Toll Queue'),
+            ('final_time', 'Final Time (min)'),
+        ],
+        model_metrics=['final_time', 'average_setup_time', 'max_toll_queue'],
+    ),
+}
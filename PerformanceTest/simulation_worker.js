@@ -0,0 +1,81 @@
+/*
+ * Persistent Simulation Worker (JavaScript)
+ * =========================================
+ * Runs swimmingpool_simple.js configurations in one long-lived Node process, so that
+ * module loading and JIT warm-up are paid once and not once per configuration.
+ * performance_test.py uses it with --js-mode worker. The protocol is the same as
+ * that of simulation_worker.py.
+ *
+ * PROTOCOL (one JSON object per line):
+ * - At startup the worker runs --warmup replications whose results are thrown away,
+ *   then writes {"ready": true, "startup_time": ms, "warmup_time": ms}
+ * - Each request line, e.g. {"pool_capacity": 50, "sim_duration": 2400}, is answered
+ *   with the Summary object of swimmingpool_simple.js, or with {"error": message}
+ * - Settings missing from a request keep the swimmingpool_simple.js defaults
+ * - The worker exits at the end of its input
+ *
+ * USAGE:
+ * echo '{"pool_capacity": 50, "sim_duration": 2400}' | node simulation_worker.js --warmup 10
+ * OPTIONS:
+ * --warmup: Number of JIT warm-up replications of the default configuration (default: 10)
+ */
+
+const startTime = performance.now();
+const readline = require('readline');
+const args = require('minimist')(process.argv.slice(2));
+const model = require('./swimmingpool_simple.js');
+
+const WARMUP_REPLICATIONS = args['warmup'] ?? 10;
+const DEFAULTS = { simDuration: 5 * 8 * 60, poolCapacity: 100, numExperiments: 20, admission: 'event' };
+const SETTINGS = { pool_capacity: 'poolCapacity', sim_duration: 'simDuration', num_experiments: 'numExperiments',
+                   admission: 'admission' };
+
+// Run one configuration and return the Summary object
+async function runConfig(request) {
+    const settings = { ...DEFAULTS };
+    for (const [key, value] of Object.entries(request)) {
+        if (!(key in SETTINGS)) {
+            throw new Error(`Unknown setting: ${key}`);
+        }
+        settings[SETTINGS[key]] = value;
+    }
+    model.configure(settings);
+    return model.runAllExperiments();
+}
+
+async function main() {
+    const startupTime = performance.now() - startTime;
+
+    // Replications whose only purpose is to get the engine's hot paths compiled
+    const warmupStart = performance.now();
+    model.configure(DEFAULTS);
+    for (let replication = 1; replication <= WARMUP_REPLICATIONS; replication++) {
+        await model.runSingleExperiment(-replication);
+    }
+    const warmupTime = performance.now() - warmupStart;
+    console.log(JSON.stringify({
+        ready: true,
+        startup_time: parseFloat(startupTime.toFixed(2)), // in milliseconds
+        warmup_time: parseFloat(warmupTime.toFixed(2)), // in milliseconds
+    }));
+
+    // Requests are handled one at a time, in order
+    const lines = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+    for await (const line of lines) {
+        if (!line.trim()) {
+            continue;
+        }
+        let reply;
+        try {
+            reply = await runConfig(JSON.parse(line));
+        } catch (error) {
+            reply = { error: String(error) };
+        }
+        console.log(JSON.stringify(reply));
+    }
+}
+
+main().catch(error => {
+    console.error(error);
+    process.exit(1);
+});
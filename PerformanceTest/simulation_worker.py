@@ -0,0 +1,79 @@
+"""
+Persistent Simulation Worker
+============================
+Runs swimmingpool_simple.py configurations in one long-lived Python process, so
+that interpreter startup and 'import simpy' are paid once and not once per
+configuration. performance_test.py uses it with --python-mode worker, and calls
+run_config() directly with --python-mode inprocess.
+
+PROTOCOL (one JSON object per line):
+- At startup the worker writes {"ready": true, "startup_time": ms} once the model
+  is imported (startup_time: import time measured inside the worker)
+- Each request line, e.g. {"pool_capacity": 50, "sim_duration": 2400, "engine": "fast"},
+  is answered with the Summary dictionary of swimmingpool_simple.py, or with
+  {"error": message} if the configuration could not be run
+- Settings missing from a request keep the swimmingpool_simple.py defaults
+- The worker exits at the end of its input
+
+USAGE:
+echo '{"pool_capacity": 50, "sim_duration": 2400}' | python simulation_worker.py
+"""
+
+import time
+
+start_time = time.perf_counter()
+
+import contextlib
+import io
+import json
+import sys
+
+import swimmingpool_simple as model
+
+STARTUP_TIME = (time.perf_counter() - start_time) * 1000  # Model import time in milliseconds
+
+# Request keys and the swimmingpool_simple.py settings they set
+SETTINGS = {
+    'pool_capacity': 'POOL_CAPACITY',
+    'sim_duration': 'SIM_DURATION',
+    'num_experiments': 'NUMBER_SIM_EXPERIMENTS',
+    'admission': 'ADMISSION_MODE',
+    'engine': 'ENGINE',
+    'track_occupancy': 'TRACK_OCCUPANCY',
+    'target_ci_halfwidth': 'TARGET_CI_HALFWIDTH',
+    'min_experiments': 'MIN_EXPERIMENTS',
+    'max_experiments': 'MAX_EXPERIMENTS',
+    'batch_means': 'BATCH_MEANS',
+    'num_batches': 'NUM_BATCHES',
+    'count_events': 'COUNT_EVENTS',
+    'tracemalloc': 'TRACEMALLOC',
+}
+DEFAULTS = {name: getattr(model, name) for name in SETTINGS.values()}
+
+
+def run_config(config):
+    """Run all experiments of one configuration in this process, return the Summary dictionary"""
+    unknown = set(config) - set(SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown settings: {', '.join(sorted(unknown))}")
+    # Every configuration starts from the defaults, so earlier requests do not leak into it
+    for key, name in SETTINGS.items():
+        setattr(model, name, config.get(key, DEFAULTS[name]))
+    with contextlib.redirect_stdout(io.StringIO()):
+        return model.run_all_experiments()
+
+
+def main():
+    print(json.dumps({'ready': True, 'startup_time': round(STARTUP_TIME, 2)}), flush=True)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            reply = run_config(json.loads(line))
+        except Exception as e:
+            reply = {'error': f"{type(e).__name__}: {e}"}
+        print(json.dumps(reply), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ With configurable logging modes, it allows for testing and debugging.
 
 LOGGING MODES:
 - 'console': Real-time output to terminal
-- 'file': Write all messages to LOG_FILE
+- 'file': Write all messages to LOG_FILE through a buffered background writer (log_sink.py)
 - 'none': No output (for performance testing)
 
 USAGE:
@@ -17,12 +17,17 @@ USAGE:
 """
 
 import simpy
-import random
-import statistics
 import time
+from control_variables import ControlVariable, wait_until
+from variate_streams import create_streams
+from distributions import Exponential, Uniform
+from accumulators import SampleAccumulator
+from log_sink import LogSink
 
 OUTPUT_MODE = 'none'  # 'console', 'file', or 'none'
 LOG_FILE = 'simulation_py_output.log'
+LOGGING = OUTPUT_MODE != 'none'  # Call sites check this, so messages are only formatted when output
+log_sink = None  # LogSink of 'file' mode, open from initialize_logging() to finish_logging()
 
 RANDOM_SEED = 42
 SIM_DURATION = 5 * 8 * 60 
@@ -30,77 +35,115 @@ POOL_CAPACITY = 100
 MAX_QUEUE_LENGTH = 30
 NUMBER_SIM_EXPERIMENTS = 20
 
+# Independent random number streams, as SLX 'rn_stream Ankunft, Service'
+arrival_stream = None
+service_stream = None
+# Distributions drawn from them (distributions.py)
+INTERARRIVAL_TIME = Exponential(1)  # Mean interarrival: 1 min
+LONG_SWIM_TIME = Uniform(115, 125)  # ~2h +/- 5min
+SHORT_SWIM_TIME = Uniform(75, 120)  # up to 45 min earlier
+LONG_SWIM_PROBABILITY = 0.6
+
 # Logging function that respects OUTPUT_MODE
 def log_message(message):
     if OUTPUT_MODE == 'console':
         print(message)
     elif OUTPUT_MODE == 'file':
-        with open(LOG_FILE, 'a', encoding='utf-8') as f:
-            f.write(message + '\n')
+        log_sink.write(message)
     # 'none' mode does nothing - for performance testing
 
-# Initialize log file (clear previous content if using file output)
+# Initialize logging (the log file is cleared if using file output)
 def initialize_logging():
+    global LOGGING, log_sink
+    LOGGING = OUTPUT_MODE != 'none'
     if OUTPUT_MODE == 'file':
-        # Clear the log file at the start
-        with open(LOG_FILE, 'w', encoding='utf-8') as f:
-            f.write('')
+        log_sink = LogSink(LOG_FILE)
         print(f"Logging to file: {LOG_FILE}")
     elif OUTPUT_MODE == 'console':
         print('Logging to console')
     else:
         print('Logging disabled for performance testing')
 
+# Write out all buffered messages, e.g. at the end of an experiment
+def flush_logging():
+    if log_sink is not None:
+        log_sink.flush()
+
+def finish_logging():
+    global log_sink
+    if log_sink is not None:
+        log_sink.close()
+        log_sink = None
+
 class Statistics:
     def __init__(self):
-        self.waiting_times = []
+        self.waits = SampleAccumulator()
         self.total_customers = 0
         self.served_customers = 0
 
     def record_wait(self, wait_time):
-        self.waiting_times.append(wait_time)
+        self.waits.add(wait_time)
 
     def report(self):
-        if not self.waiting_times:
+        if not LOGGING:
+            return
+        if not self.waits.count:
             log_message("No waiting time data.")
             return
         log_message("\nWaiting Time Report:")
-        log_message(f"- Average: {statistics.mean(self.waiting_times):.2f} min")
-        log_message(f"- Max: {max(self.waiting_times):.2f} min")
-        log_message(f"- Min: {min(self.waiting_times):.2f} min")
-        log_message(f"- Total waiting times recorded: {len(self.waiting_times)}")
-        log_message(f"- Total waiting time: {sum(self.waiting_times):.2f} min")
+        log_message(f"- Average: {self.waits.mean:.2f} min")
+        log_message(f"- Std. deviation: {self.waits.std:.2f} min")
+        log_message(f"- Max: {self.waits.max:.2f} min")
+        log_message(f"- Min: {self.waits.min:.2f} min")
+        log_message(f"- Median / p95 / p99: {self.waits.quantile(0.5):.2f} / {self.waits.quantile(0.95):.2f} / {self.waits.quantile(0.99):.2f} min")
+        log_message(f"- Total waiting times recorded: {self.waits.count}")
+        log_message(f"- Total waiting time: {self.waits.sum:.2f} min")
         log_message("\nCustomer Report:")
         log_message(f"- Total customers: {self.total_customers}")
         log_message(f"- Total served customers: {self.served_customers}")
-        log_message(f"- Capacity (customers/hour): {len(self.waiting_times) / (SIM_DURATION / 60):.2f} customers/hour")
+        log_message(f"- Capacity (customers/hour): {self.waits.count / (SIM_DURATION / 60):.2f} customers/hour")
 
 
 class SwimmingPool:
     def __init__(self, env):
         self.env = env
-        self.gate_open = True
-        self.num_inside = 0
+        self.gate_open = ControlVariable(env, True)
+        self.num_inside = ControlVariable(env, 0)
         self.num_waiting = 0
         self.capacity = POOL_CAPACITY
         self.stats = Statistics()
 
     def can_enter(self):
-        return self.gate_open and self.num_inside < self.capacity
+        return self.gate_open.value and self.num_inside.value < self.capacity
+
+    def try_enter(self):
+        # Waiters are woken as soon as can_enter() holds, so while anyone is
+        # waiting this is False and newcomers cannot overtake them
+        if not self.can_enter():
+            return False
+        self.add_swimmer()
+        return True
+
+    def wait_for_entry(self):
+        # SLX: wait until((Eingangstor_offen) && (Anzahl_Schwimmer < Hallenkapazitaet))
+        # The slot is taken on wake-up, so customers woken at the same instant cannot overfill the pool
+        return wait_until(self.env, self.can_enter, (self.gate_open, self.num_inside), on_wake=self.add_swimmer)
 
     def add_swimmer(self):
-        self.num_inside += 1
+        self.num_inside.add(1)
 
     def remove_swimmer(self):
-        self.num_inside -= 1
+        self.num_inside.add(-1)
 
     def open_gate_cycle(self):
         while self.env.now < SIM_DURATION:
-            self.gate_open = True
-            log_message(f"\n[{self.env.now:>5}] GATE OPEN")
+            self.gate_open.set(True)
+            if LOGGING:
+                log_message(f"\n[{self.env.now:>5}] GATE OPEN")
             yield self.env.timeout(1)
-            self.gate_open = False
-            log_message(f"[{self.env.now:>5}] GATE CLOSED")
+            self.gate_open.set(False)
+            if LOGGING:
+                log_message(f"[{self.env.now:>5}] GATE CLOSED")
             yield self.env.timeout(59)
 
     def report(self):
@@ -117,41 +160,44 @@ class Customer:
     def run(self, env, pool):
         pool.num_waiting += 1
         wait_start = env.now
-        log_message(f"[{env.now:>5}] {self.name} arrives (waiting: {pool.num_waiting}, inside: {pool.num_inside})")
+        if LOGGING:
+            log_message(f"[{env.now:>5}] {self.name} arrives (waiting: {pool.num_waiting}, inside: {pool.num_inside.value})")
 
-        while not pool.can_enter():
-            yield env.timeout(1)
+        if not pool.try_enter():
+            yield pool.wait_for_entry()  # wait_for_entry() has already added us to the pool
 
         pool.num_waiting -= 1
         wait_end = env.now
         pool.stats.record_wait(wait_end - wait_start)
-        pool.add_swimmer()
 
-        log_message(f"[{env.now:>5}] {self.name} enters the pool (inside: {pool.num_inside})")
+        if LOGGING:
+            log_message(f"[{env.now:>5}] {self.name} enters the pool (inside: {pool.num_inside.value})")
 
         # Determine stay duration
-        w = random.random()
-        if w <= 0.6:
-            swim_time = random.uniform(115, 125)  # ~2h +/- 5min
+        w = service_stream.random()
+        if w <= LONG_SWIM_PROBABILITY:
+            swim_time = LONG_SWIM_TIME.sample(service_stream)
         else:
-            swim_time = random.uniform(75, 120)   # up to 45 min earlier
+            swim_time = SHORT_SWIM_TIME.sample(service_stream)
 
         yield env.timeout(swim_time)
 
         pool.remove_swimmer()
         pool.stats.served_customers += 1
-        log_message(f"[{env.now:>5}] {self.name} leaves the pool (inside: {pool.num_inside})")
+        if LOGGING:
+            log_message(f"[{env.now:>5}] {self.name} leaves the pool (inside: {pool.num_inside.value})")
 
 def arrival_process(env, pool):
     while env.now < SIM_DURATION:
-        yield env.timeout(random.expovariate(1))  # Mean interarrival: 1 min
+        yield env.timeout(INTERARRIVAL_TIME.sample(arrival_stream))
         if pool.num_waiting < MAX_QUEUE_LENGTH:
             Customer(env, pool)
             pool.stats.total_customers += 1
 
 
 def run_single_experiment(experiment_number=0):
-    random.seed(RANDOM_SEED + experiment_number)
+    global arrival_stream, service_stream
+    arrival_stream, service_stream = create_streams(RANDOM_SEED + experiment_number, 2)
     Customer.id_counter = 0  
     env = simpy.Environment()
     pool = SwimmingPool(env)
@@ -161,11 +207,15 @@ def run_single_experiment(experiment_number=0):
     # Start gate cycle process
     env.process(pool.open_gate_cycle())
     
-    log_message(f"Running simulation experiment {experiment_number}...")
-    env.run(until=SIM_DURATION)
-    log_message(f"\nSimulation {experiment_number} finished at {env.now} minutes")
-    
-    pool.report()
+    if LOGGING:
+        log_message(f"Running simulation experiment {experiment_number}...")
+    try:
+        env.run(until=SIM_DURATION)
+        if LOGGING:
+            log_message(f"\nSimulation {experiment_number} finished at {env.now} minutes")
+        pool.report()
+    finally:
+        flush_logging()  # The experiment's log is complete even if it failed
     if hasattr(env, 'reset'):
         env.reset()
 
@@ -173,12 +223,15 @@ def run_all_experiments():
     initialize_logging()
 
     total_times = []
-    for experiment in range(1, NUMBER_SIM_EXPERIMENTS + 1):
-        start_time = time.perf_counter()
-        run_single_experiment(experiment)
-        end_time = time.perf_counter()
-        elapsed_time = (end_time - start_time) * 1000  # Convert to milliseconds
-        total_times.append(elapsed_time)
+    try:
+        for experiment in range(1, NUMBER_SIM_EXPERIMENTS + 1):
+            start_time = time.perf_counter()
+            run_single_experiment(experiment)
+            end_time = time.perf_counter()
+            elapsed_time = (end_time - start_time) * 1000  # Convert to milliseconds
+            total_times.append(elapsed_time)
+    finally:
+        finish_logging()
 
     avg_time = sum(total_times) / len(total_times)
     min_time = min(total_times)
@@ -192,4 +245,5 @@ def run_all_experiments():
     print(f"- Total time: {(sum(total_times) / 1000):.2f} seconds")
 
 # Start the performance test
-run_all_experiments()
+if __name__ == "__main__":
+    run_all_experiments()
@@ -0,0 +1,237 @@
+"""
+Swimming Pool Simulation (Python) - NUMPY BATCH ENGINE
+======================================================
+This script simulates many independent replications of the swimming pool model of
+swimmingpool_simple.py at once. All replications are advanced together, one gate
+cycle (60 minutes) per step, with their state held in NumPy arrays:
+
+- arrival times of the current cycle:  (replications x arrivals)
+- waiting customers (FIFO ring buffer): (replications x MAX_QUEUE_LENGTH)
+- release times of the pool slots:      (replications x pool capacity), inf = free
+
+While the gate is closed nobody enters, so the 59 closed minutes are handled with
+a few whole-array operations. Only the open minute, where arrivals and departures
+interleave with admissions, is stepped event by event, still across all
+replications at once.
+
+The model is the same as with event admission in swimmingpool_simple.py, but the
+random numbers come from numpy.random, so single replications are statistically
+equivalent rather than identical to the SimPy runs.
+
+USAGE:
+python swimmingpool_batch.py --sim-duration 2400 --pool-capacity 50 --num-experiments 1000
+OPTIONS:
+--sim-duration: Total simulation duration in minutes (default: 2400)
+--pool-capacity: Maximum number of swimmers allowed in the pool at a time (default: 100)
+--num-experiments: Number of replications simulated in lockstep (default: 1000)
+"""
+
+import argparse
+import json
+import math
+import time
+
+import numpy as np
+
+from swimmingpool_simple import RANDOM_SEED, MAX_QUEUE_LENGTH
+from variate_streams import create_streams
+from accumulators import SampleAccumulator
+
+GATE_CYCLE = 60  # The gate opens every 60 minutes ...
+GATE_OPEN_TIME = 1  # ... for 1 minute
+ARRIVAL_BLOCK = 64  # Interarrival times sampled per replication at a time
+
+
+class BatchStatistics:
+    """Per-replication statistics as arrays, indexed by replication"""
+    def __init__(self, replications):
+        self.total_customers = np.zeros(replications, dtype=np.int64)
+        self.served_customers = np.zeros(replications, dtype=np.int64)
+        self.wait_count = np.zeros(replications, dtype=np.int64)
+        self.wait_sum = np.zeros(replications)
+        self.wait_min = np.full(replications, np.inf)
+        self.wait_max = np.zeros(replications)
+        self.waits = SampleAccumulator()  # Waiting times of all replications together
+
+    def record_waits(self, rows, wait_times):
+        self.waits.add_many(wait_times)
+        np.add.at(self.wait_count, rows, 1)
+        np.add.at(self.wait_sum, rows, wait_times)
+        np.minimum.at(self.wait_min, rows, wait_times)
+        np.maximum.at(self.wait_max, rows, wait_times)
+
+    def average_waiting_times(self):
+        return np.divide(self.wait_sum, self.wait_count, out=np.zeros_like(self.wait_sum),
+                         where=self.wait_count > 0)
+
+
+class BatchSimulation:
+    def __init__(self, replications, pool_capacity, sim_duration, seed=RANDOM_SEED):
+        # Independent generators for arrivals and service, as in swimmingpool_simple.py
+        self.arrival_rng, self.service_rng = (stream.generator for stream in create_streams(seed, 2))
+        self.replications = replications
+        self.capacity = pool_capacity
+        self.sim_duration = sim_duration
+        self.rows = np.arange(replications)
+        self.stats = BatchStatistics(replications)
+
+        self.release = np.full((replications, pool_capacity), np.inf)
+        self.num_inside = np.zeros(replications, dtype=np.int64)
+        self.queue = np.zeros((replications, MAX_QUEUE_LENGTH))
+        self.queue_head = np.zeros(replications, dtype=np.int64)
+        self.num_waiting = np.zeros(replications, dtype=np.int64)
+        self.next_arrival = self.arrival_rng.exponential(1.0, replications)  # Mean interarrival: 1 min
+
+    def sample_swim_times(self, n):
+        w = self.service_rng.random(n)
+        u = self.service_rng.random(n)
+        # ~2h +/- 5min with probability 0.6, otherwise up to 45 min earlier
+        return np.where(w <= 0.6, 115 + 10 * u, 75 + 45 * u)
+
+    def admit(self, rows, slots, now, wait_starts):
+        self.stats.record_waits(rows, now - wait_starts)
+        self.release[rows, slots] = now + self.sample_swim_times(len(rows))
+        np.add.at(self.num_inside, rows, 1)
+
+    def arrivals_until(self, until):
+        """Sorted arrival times per replication, the last column is >= until for every row"""
+        blocks = [self.next_arrival[:, None]]
+        last = self.next_arrival
+        while (last < until).any():
+            block = last[:, None] + np.cumsum(self.arrival_rng.exponential(1.0, (self.replications, ARRIVAL_BLOCK)), axis=1)
+            blocks.append(block)
+            last = block[:, -1]
+        return np.concatenate(blocks, axis=1)
+
+    def open_gate(self, now):
+        """Admit as many waiting customers as there are free slots, in FIFO order"""
+        admitted = np.minimum(self.num_waiting, self.capacity - self.num_inside)
+        if not admitted.any():
+            return
+        width = min(MAX_QUEUE_LENGTH, self.capacity)
+        free_slots = np.argsort(np.isfinite(self.release), axis=1, kind='stable')[:, :width]
+        rows, positions = np.nonzero(np.arange(width) < admitted[:, None])
+        wait_starts = self.queue[rows, (self.queue_head[rows] + positions) % MAX_QUEUE_LENGTH]
+        self.admit(rows, free_slots[rows, positions], now, wait_starts)
+        self.queue_head = (self.queue_head + admitted) % MAX_QUEUE_LENGTH
+        self.num_waiting -= admitted
+
+    def run_open_minute(self, arrivals, pointer, until):
+        """Arrivals and departures while the gate is open, one event per replication per step"""
+        while True:
+            next_arrival = arrivals[self.rows, pointer]
+            departure_slot = self.release.argmin(axis=1)
+            next_departure = self.release[self.rows, departure_slot]
+            now = np.minimum(next_arrival, next_departure)
+            active = now < until
+            if not active.any():
+                return
+            is_departure = next_departure <= next_arrival
+
+            # Departure: the freed slot goes to the head of the queue
+            rows = np.nonzero(active & is_departure)[0]
+            self.stats.served_customers[rows] += 1
+            self.release[rows, departure_slot[rows]] = np.inf
+            self.num_inside[rows] -= 1
+            rows = rows[self.num_waiting[rows] > 0]
+            wait_starts = self.queue[rows, self.queue_head[rows]]
+            self.queue_head[rows] = (self.queue_head[rows] + 1) % MAX_QUEUE_LENGTH
+            self.num_waiting[rows] -= 1
+            self.admit(rows, departure_slot[rows], now[rows], wait_starts)
+
+            # Arrival: enter directly if there is room, otherwise join the queue if it is not full
+            rows = np.nonzero(active & ~is_departure)[0]
+            pointer[rows] += 1
+            rows = rows[self.num_waiting[rows] < MAX_QUEUE_LENGTH]
+            self.stats.total_customers[rows] += 1
+            has_room = self.num_inside[rows] < self.capacity
+            joining = rows[~has_room]
+            self.queue[joining, (self.queue_head[joining] + self.num_waiting[joining]) % MAX_QUEUE_LENGTH] = now[joining]
+            self.num_waiting[joining] += 1
+            entering = rows[has_room]
+            free_slot = np.isinf(self.release[entering]).argmax(axis=1)
+            self.admit(entering, free_slot, now[entering], now[entering])
+
+    def run_closed_gate(self, arrivals, pointer, until):
+        """Departures and queue joins while the gate is closed; nobody enters"""
+        departed = self.release < until
+        num_departed = departed.sum(axis=1)
+        self.stats.served_customers += num_departed
+        self.num_inside -= num_departed
+        self.release[departed] = np.inf
+
+        num_arrivals = (arrivals < until).sum(axis=1) - pointer
+        joined = np.minimum(num_arrivals, MAX_QUEUE_LENGTH - self.num_waiting)
+        self.stats.total_customers += joined
+        rows, positions = np.nonzero(np.arange(MAX_QUEUE_LENGTH) < joined[:, None])
+        tail = (self.queue_head[rows] + self.num_waiting[rows] + positions) % MAX_QUEUE_LENGTH
+        self.queue[rows, tail] = arrivals[rows, pointer[rows] + positions]
+        self.num_waiting += joined
+        pointer += num_arrivals
+
+    def run(self):
+        gate_opens = 0
+        while gate_opens < self.sim_duration:
+            gate_closes = min(gate_opens + GATE_OPEN_TIME, self.sim_duration)
+            cycle_end = min(gate_opens + GATE_CYCLE, self.sim_duration)
+            arrivals = self.arrivals_until(cycle_end)
+            pointer = np.zeros(self.replications, dtype=np.int64)
+
+            self.open_gate(gate_opens)
+            self.run_open_minute(arrivals, pointer, gate_closes)
+            self.run_closed_gate(arrivals, pointer, cycle_end)
+
+            self.next_arrival = arrivals[self.rows, pointer]
+            gate_opens += GATE_CYCLE
+        return self.stats
+
+
+def run_batch_experiments(num_experiments, pool_capacity, sim_duration):
+    start_time = time.perf_counter()
+    stats = BatchSimulation(num_experiments, pool_capacity, sim_duration).run()
+    elapsed_time = (time.perf_counter() - start_time) * 1000  # Convert to milliseconds
+
+    avg_wait_times = stats.average_waiting_times()
+    # Student t interval over the replications' averages, as in swimmingpool_simple.py
+    replication_means = SampleAccumulator()
+    replication_means.add_many(avg_wait_times)
+    ci_halfwidth = replication_means.ci_halfwidth()
+    per_experiment_time = elapsed_time / num_experiments
+    all_waits = stats.waits.summary()
+    summary = {
+        'framework': 'NumPyBatch',
+        'pool_capacity': pool_capacity,
+        'sim_duration': sim_duration,
+        'num_experiments': num_experiments,
+        'average_time': round(per_experiment_time, 4), # in milliseconds, amortized over the batch
+        'min_time': round(per_experiment_time, 4), # in milliseconds
+        'max_time': round(per_experiment_time, 4),  # in milliseconds
+        'total_time': round(elapsed_time, 2),  # in milliseconds
+        'avg_customers': float(stats.total_customers.mean()), # customers
+        'avg_served_customers': float(stats.served_customers.mean()), # customers
+        'average_waiting_time': round(float(avg_wait_times.mean()), 2), # in minutes
+        'waiting_time_ci_halfwidth': round(ci_halfwidth, 3) if math.isfinite(ci_halfwidth) else None, # in minutes
+        # Over the waiting times of all replications, in minutes
+        'waiting_time_std': all_waits['std'],
+        'waiting_time_min': all_waits['min'],
+        'waiting_time_max': all_waits['max'],
+        'waiting_time_p50': all_waits['p50'],
+        'waiting_time_p95': all_waits['p95'],
+        'waiting_time_p99': all_waits['p99'],
+    }
+    print(f"Summary:{json.dumps(summary)}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Starting NumPy batch Swimming Pool Simulation')
+    parser.add_argument('--pool-capacity', type=int, default=100)
+    parser.add_argument('--sim-duration', type=int, default=2400)
+    parser.add_argument('--num-experiments', type=int, default=1000)
+    args = parser.parse_args()
+
+    run_batch_experiments(args.num_experiments, args.pool_capacity, args.sim_duration)
+
+
+if __name__ == "__main__":
+    main()
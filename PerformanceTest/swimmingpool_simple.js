@@ -13,19 +13,40 @@
  * --sim-duration: Total simulation duration in minutes (default: 2400, which is 5 shifts of 8 hours)
  * --pool-capacity: Maximum number of swimmers allowed in the pool at a time (default: 50)
  * --num-experiments: Number of simulation experiments to run (default: 20)
+ * --admission: 'event' (default) wakes waiting customers only when the gate opens or a
+ *              swimmer leaves, with SimLuxJS waitUntil, as swimmingpool_simple.py does;
+ *              'polling' re-checks every minute (the original behaviour)
+ *
+ * Like swimmingpool_simple.py, the Summary reports the events per experiment and the cost per
+ * event (events_per_second, ns_per_event): every sim.advance() is a scheduled 'timeout', every
+ * addSimEntity() a 'process_start' and every wake-up from waitUntil a 'wait_until' (see
+ * countEvents). peak_rss_mb is the peak resident set size of the process (Linux only).
+ *
+ * simulation_worker.js runs this model for many configurations in one long-lived process.
  */
 
 const SimLuxJS = require('../SimLuxJS/SimLuxJS.js').SimLuxJS; 
 const SimEntity = require('../SimLuxJS/SimLuxJS.js').SimEntity;  
 const seedrandom = require('seedrandom');
+const { timingSummary, eventSummary, peakRssMb } = require('./run_summary.js');
 const args = require('minimist')(process.argv.slice(2));
 
 const RANDOM_SEED = 42;
-const SIM_DURATION = args['sim-duration'] || 5 * 8 * 60; 
-const POOL_CAPACITY = args['pool-capacity'] || 100;
-const NUMBER_SIM_EXPERIMENTS = args['num-experiments'] || 20;
+let SIM_DURATION = args['sim-duration'] || 5 * 8 * 60; 
+let POOL_CAPACITY = args['pool-capacity'] || 100;
+let NUMBER_SIM_EXPERIMENTS = args['num-experiments'] || 20;
+let ADMISSION_MODE = args['admission'] || 'event'; // 'event' or 'polling'
 const MAX_QUEUE_LENGTH = 30;
 
+// Change the configuration, e.g. for the next request of simulation_worker.js
+function configure({ simDuration = SIM_DURATION, poolCapacity = POOL_CAPACITY, numExperiments = NUMBER_SIM_EXPERIMENTS,
+                     admission = ADMISSION_MODE } = {}) {
+    SIM_DURATION = simDuration;
+    POOL_CAPACITY = poolCapacity;
+    NUMBER_SIM_EXPERIMENTS = numExperiments;
+    ADMISSION_MODE = admission;
+}
+
 let random;
 const uniform = (min, max) => random() * (max - min) + min;
 const exponential = (lambda) => -Math.log(1 - random()) / lambda;
@@ -50,30 +71,54 @@ class SwimmingPool {
         this.numWaiting = 0;
         this.capacity = POOL_CAPACITY;
         this.stats = new Statistics();
+        // A SimLuxJS condition reads a single control variable, so the gate and the occupancy
+        // count are combined in one: the number of customers that may enter now
+        this.admission = sim.createControlVariable(this.freePlaces());
     }
 
     canEnter() {
         return this.gateOpen && this.numInside < this.capacity;
     }
 
+    freePlaces() {
+        return this.gateOpen ? this.capacity - this.numInside : 0;
+    }
+
+    async waitForEntry() {
+        // SLX: wait until((Eingangstor_offen) && (Anzahl_Schwimmer < Hallenkapazitaet))
+        // All waiters share the condition function, so they are woken first come, first served
+        while (!this.canEnter()) {
+            await this.admission.waitUntil(hasFreePlace);
+        }
+    }
+
     addSwimmer() {
         this.numInside++;
+        this.admission.setValue(this.freePlaces());
     }
 
     removeSwimmer() {
         this.numInside--;
+        this.admission.setValue(this.freePlaces());
+    }
+
+    setGate(open) {
+        this.gateOpen = open;
+        this.admission.setValue(this.freePlaces());
     }
 
     async openGateCycle() {
         while (this.sim.getTime() < SIM_DURATION) {
-            this.gateOpen = true;
+            this.setGate(true);
             await this.sim.advance(1);
-            this.gateOpen = false;
+            this.setGate(false);
             await this.sim.advance(59);
         }
     }
 }
 
+const hasFreePlace = (freePlaces) => freePlaces > 0;
+
 class Customer {
     static idCounter = 0;
 
@@ -87,8 +132,14 @@ class Customer {
         pool.numWaiting++;
         const waitStart = sim.getTime();
 
-        while (!pool.canEnter()) {
-            await sim.advance(1);
+        if (ADMISSION_MODE === 'polling') {
+            while (!pool.canEnter()) {
+                await sim.advance(1);
+            }
+        } else {
+            // A woken customer takes its place before the next waiter is checked, so
+            // customers woken at the same instant cannot overfill the pool
+            await pool.waitForEntry();
         }
 
         pool.numWaiting--;
@@ -121,7 +172,36 @@ async function arrivalProcess(sim, pool) {
     }   
 }
 
-async function runSingleExperiment(experimentNumber = 0) {
+// Count the events of a run in eventsByType, like countEvents() of run_summary.js, but aware of
+// the stop time: SimLuxJS resumes no entity at or after it, so a timeout is processed if it ends
+// before SIM_DURATION. A wait_until is counted when the waiting customer is woken, as
+// swimmingpool_simple.py counts it.
+function countEvents(sim, pool, eventsByType) {
+    const counts = (eventType) => eventsByType[eventType] || (eventsByType[eventType] = { scheduled: 0, processed: 0 });
+    const [timeout, process_start, wait_until] = ['timeout', 'process_start', 'wait_until'].map(counts);
+    const advance = sim.advance.bind(sim);
+    sim.advance = (waitingTime) => {
+        timeout.scheduled++;
+        if (sim.getTime() + waitingTime < SIM_DURATION) {
+            timeout.processed++;
+        }
+        return advance(waitingTime);
+    };
+    const addSimEntity = sim.addSimEntity.bind(sim);
+    sim.addSimEntity = (simEntity) => {
+        process_start.scheduled++;
+        process_start.processed++;
+        return addSimEntity(simEntity);
+    };
+    const waitUntil = pool.admission.waitUntil.bind(pool.admission);
+    pool.admission.waitUntil = async (condition) => {
+        await waitUntil(condition);
+        wait_until.scheduled++;
+        wait_until.processed++;
+    };
+}
+
+async function runSingleExperiment(experimentNumber = 0, eventsByType = {}) {
     // Set up random number generator with different seed for each experiment
     random = seedrandom(RANDOM_SEED + experimentNumber);
     
@@ -129,6 +209,7 @@ async function runSingleExperiment(experimentNumber = 0) {
     let simLuxJS = new SimLuxJS();
     simLuxJS.enableLogging = false; // Disable logging for performance
     const pool = new SwimmingPool(simLuxJS);
+    countEvents(simLuxJS, pool, eventsByType);
 
     // Start arrival process
     simLuxJS.addSimEntity(new SimEntity(simEntity => arrivalProcess(simLuxJS, pool)));
@@ -142,49 +223,43 @@ async function runSingleExperiment(experimentNumber = 0) {
 
 async function runAllExperiments() {
     const totalTimes = [];
-    let totalCustomers = [];
-    let totalServedCustomers = [];
-    let avgWaitTimes = [];
+    const allStats = [];
+    const eventsByType = {};
 
     for (let experiment = 1; experiment <= NUMBER_SIM_EXPERIMENTS; experiment++) {
         const startTime = performance.now();
-        const stats = await runSingleExperiment(experiment);
+        const stats = await runSingleExperiment(experiment, eventsByType);
         const endTime = performance.now();
 
-        const elapsedTime = (endTime - startTime); 
-        totalTimes.push(elapsedTime);
-        totalCustomers.push(stats.totalCustomers);
-        totalServedCustomers.push(stats.servedCustomers);
-        avgWaitTimes.push(stats.waitingTimes.reduce((a, b) => a + b, 0) / stats.waitingTimes.length || 0);
+        totalTimes.push(endTime - startTime);
+        allStats.push(stats);
     }
 
-    const avgTime = totalTimes.reduce((a, b) => a + b, 0) / totalTimes.length;
-    const minTime = Math.min(...totalTimes);
-    const maxTime = Math.max(...totalTimes);
+    const average = (values) => values.reduce((a, b) => a + b, 0) / values.length || 0;
+    const avgWaitTimes = allStats.map(stats => average(stats.waitingTimes));
     const totalTime = totalTimes.reduce((a, b) => a + b, 0);
-    const avgWaitTime = avgWaitTimes.reduce((a, b) => a + b, 0) / avgWaitTimes.length;
-    const avgCustomers = totalCustomers.reduce((a, b) => a + b, 0) / totalCustomers.length || 0;
-    const avgServedCustomers = totalServedCustomers.reduce((a, b) => a + b, 0) / totalServedCustomers.length || 0;
-    const summary = {
+    return {
         framework: 'SimLuxJS',
         pool_capacity: POOL_CAPACITY,
         sim_duration: SIM_DURATION,
         num_experiments: NUMBER_SIM_EXPERIMENTS,
-        average_time: parseFloat(avgTime.toFixed(2)), // in milliseconds
-        min_time: parseFloat(minTime.toFixed(2)), // in milliseconds
-        max_time: parseFloat(maxTime.toFixed(2)), // in milliseconds
-        total_time: parseFloat(totalTime.toFixed(2)), // in milliseconds
-        avg_customers: avgCustomers, // customers
-        avg_served_customers: avgServedCustomers, // customers
-        average_waiting_time: parseFloat(avgWaitTime.toFixed(2)) // in minutes
+        ...timingSummary(totalTimes), // in milliseconds
+        avg_customers: average(allStats.map(stats => stats.totalCustomers)), // customers
+        avg_served_customers: average(allStats.map(stats => stats.servedCustomers)), // customers
+        average_waiting_time: parseFloat(average(avgWaitTimes).toFixed(2)), // in minutes
+        ...eventSummary(eventsByType, NUMBER_SIM_EXPERIMENTS, totalTime),
+        peak_rss_mb: peakRssMb() // of this process, i.e. all experiments run in it
     };
-
-    console.log(`Summary:${JSON.stringify(summary)}`);
 }
 
 async function main() {
     console.log("Starting SimLuxJS Swimming Pool Simulation...");
-    await runAllExperiments();
+    const summary = await runAllExperiments();
+    console.log(`Summary:${JSON.stringify(summary)}`);
 }
 
-main().catch(console.error);
\ No newline at end of file
+module.exports = { configure, runSingleExperiment, runAllExperiments };
+
+if (require.main === module) {
+    main().catch(console.error);
+}
\ No newline at end of file
@@ -13,13 +13,76 @@ OPTIONS:
 --sim-duration: Total simulation duration in minutes (default: 2400, which is 5 shifts of 8 hours)
 --pool-capacity: Maximum number of swimmers allowed in the pool at a time (default: 50)
 --num-experiments: Number of simulation experiments to run (default: 20)
+--admission: 'event' (default) wakes waiting customers only when the gate opens or a
+             swimmer leaves, as SLX "wait until" does; 'polling' re-checks every minute
+             (the original behaviour, kept as a reference for benchmark_admission.py)
+--engine: 'simpy' (default) or 'fast', which runs the same model on a single heapq event
+          calendar without SimPy processes (event admission only, same statistics and seeds)
+--keep-raw FILE: Also keep every single waiting time and write them to FILE as CSV
+          (experiment,waiting_time); by default only constant-memory statistics are kept
+--trace FILE: Record every arrival, entry, departure and gate change of the SimPy engine
+          as a binary event trace (see event_trace.py). FILE may contain '{experiment}',
+          which is replaced by the experiment number, e.g. trace_{experiment}.bin
+--no-occupancy: Do not collect the time-weighted occupancy and queue length metrics
+          (utilization, mean queue length, time-in-state histograms). They cost about 2-3% of
+          the run time with the SimPy engine and about 7% with the fast engine; see
+          benchmark_occupancy.py
+--target-ci-halfwidth H: Adaptive number of experiments. Experiments 1, 2, ... run until the
+          95% confidence interval of the average waiting time (over the experiments' averages)
+          is at most +/- H minutes, but at least --min-experiments (default: 5) and at most
+          --max-experiments (default: 100); --num-experiments is then ignored. The Summary
+          reports the interval reached and the number of experiments used
+--crn: Common random numbers. Each arrival's swim time is drawn from the service stream
+          when the customer arrives (also for customers who balk), so arrival n of an
+          experiment gets the same swim time at every pool capacity, not just the same
+          arrival time. Comparisons of configurations then have a smaller variance; see
+          benchmark_variance_reduction.py. Changes the draws, so results differ from the default
+--antithetic: Antithetic variates. Experiments 2k-1 and 2k form a pair with seed RANDOM_SEED + k,
+          the second drawing every variate from 1 - U where the first uses U (by inversion).
+          The confidence interval is computed over the pair averages, and the Summary adds
+          'variance_reduction', the estimated variance saved per pair compared to two
+          independent experiments. Needs an even --num-experiments
+--batch-means: Steady-state analysis of ONE long run of --num-experiments x --sim-duration
+          minutes (the simulated time of the cold-started experiments) instead of independent
+          experiments. The warm-up is cut off by MSER-5, the remaining waiting times are split
+          into --num-batches (default: 20) batches, and the CI is computed over the batch means
+          (see output_analysis.py). The Summary reports the warm-up and the batch statistics
+--count-events: Also count the scheduled and processed events per event type (timeout,
+          process_start, process_end, wait_until, stop; for --engine fast: arrival, departure,
+          gate_open, gate_close), reported as 'events_by_type'. The totals 'events_processed'
+          (per experiment), 'events_per_second' and 'ns_per_event' are always reported, as they
+          cost nothing to collect; see event_counters.py
+--tracemalloc: Trace the Python allocations of each experiment. The Summary adds the largest
+          per-experiment peak of traced memory ('tracemalloc_peak_mb') and the allocation sites
+          holding the most memory at the end of that experiment ('top_allocations'). Tracing
+          slows the run down, so its times are not comparable with untraced runs
+--workers: Number of processes running the experiments in parallel (default: 1, serial).
+           Each experiment keeps its seed (RANDOM_SEED + experiment number), so the
+           statistics are identical to a serial run. The Summary line adds the
+           wall-clock time and the speedup (sum of per-experiment times / wall time),
+           which is only meaningful when every worker has a core of its own.
 """
 
 import simpy
-import random
 import time
 import argparse
 import json
+import csv
+import heapq
+import math
+import os
+import tracemalloc
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from control_variables import ControlVariable, wait_until
+from variate_streams import create_streams
+from distributions import Exponential, Uniform
+from accumulators import SampleAccumulator, TimeWeightedAccumulator
+from output_analysis import mser_truncation, batch_means, lag1_autocorrelation
+from event_counters import CountingEnvironment, event_totals, throughput
+from run_summary import peak_rss_mb
+import event_trace
+from event_trace import TraceRecorder
 
 RANDOM_SEED = 42
 SIM_DURATION = 5 * 8 * 60 
@@ -27,84 +90,202 @@ POOL_CAPACITY = 100
 MAX_QUEUE_LENGTH = 30
 NUMBER_SIM_EXPERIMENTS = 20
 
+# Independent random number streams, as SLX 'rn_stream Ankunft, Service'
+arrival_stream = None
+service_stream = None
+# Distributions drawn from them (distributions.py)
+INTERARRIVAL_TIME = Exponential(1)  # Mean interarrival: 1 min
+LONG_SWIM_TIME = Uniform(115, 125)  # ~2h +/- 5min
+SHORT_SWIM_TIME = Uniform(75, 120)  # up to 45 min earlier
+LONG_SWIM_PROBABILITY = 0.6
+ADMISSION_MODE = 'event'  # 'event' or 'polling'
+ENGINE = 'simpy'  # 'simpy' or 'fast'
+KEEP_RAW = False  # Keep the raw waiting times in Statistics.waiting_times
+TRACK_OCCUPANCY = True  # Time-weighted num_inside / num_waiting metrics
+TRACE_FILE = None  # File name of the binary event trace, '{experiment}' is replaced
+TARGET_CI_HALFWIDTH = None  # Target 95% CI half width of the average waiting time in minutes, None: fixed count
+MIN_EXPERIMENTS = 5  # Bounds of the adaptive number of experiments
+MAX_EXPERIMENTS = 100
+CRN = False  # Draw each arrival's swim time on arrival, synchronizing the service stream across configs
+ANTITHETIC = False  # Experiments 2k-1 and 2k are an antithetic pair
+BATCH_MEANS = False  # One long run analysed by batch means instead of independent experiments
+NUM_BATCHES = 20
+COUNT_EVENTS = False  # Count events per type (the totals are always counted)
+TRACEMALLOC = False  # Trace allocations: peak and top allocation sites per experiment
+TOP_ALLOCATION_SITES = 5
+trace = None  # TraceRecorder of the running experiment, None when not tracing
+
+# Event kinds of the fast engine's calendar
+ARRIVAL, DEPARTURE, GATE_OPEN, GATE_CLOSE = range(4)
+KIND_NAMES = ['arrival', 'departure', 'gate_open', 'gate_close']
+
 class Statistics:
     def __init__(self):
-        self.waiting_times = []
+        self.waits = SampleAccumulator()
+        self.waiting_times = [] if KEEP_RAW else None  # Raw samples only with --keep-raw
         self.total_customers = 0
         self.served_customers = 0
+        # Time-weighted number of swimmers inside and customers waiting, updated on every change
+        self.occupancy = TimeWeightedAccumulator(POOL_CAPACITY) if TRACK_OCCUPANCY else None
+        self.queue_length = TimeWeightedAccumulator(MAX_QUEUE_LENGTH) if TRACK_OCCUPANCY else None
+        self.events_scheduled = 0
+        self.events_processed = 0
+        self.events_by_type = None  # {type: {'scheduled': n, 'processed': n}} with COUNT_EVENTS
+        self.tracemalloc_peak = None  # Bytes allocated at the peak of the experiment, with TRACEMALLOC
+        self.allocation_sites = None  # top_allocation_sites() at the end of the experiment, with TRACEMALLOC
 
     def record_wait(self, wait_time):
-        self.waiting_times.append(wait_time)
+        self.waits.add(wait_time)
+        if self.waiting_times is not None:
+            self.waiting_times.append(wait_time)
+
+    def finish(self, now):
+        if self.occupancy is not None:
+            self.occupancy.finish(now)
+            self.queue_length.finish(now)
 
 class SwimmingPool:
     def __init__(self, env):
         self.env = env
-        self.gate_open = True
-        self.num_inside = 0
+        self.gate_open = ControlVariable(env, True)
+        self.num_inside = ControlVariable(env, 0)
         self.num_waiting = 0
         self.capacity = POOL_CAPACITY
         self.stats = Statistics()
+        self.occupancy = self.stats.occupancy
+        self.queue_length = self.stats.queue_length
 
     def can_enter(self):
-        return self.gate_open and self.num_inside < self.capacity
+        return self.gate_open.value and self.num_inside.value < self.capacity
+
+    def try_enter(self):
+        # Waiters are woken as soon as can_enter() holds, so while anyone is
+        # waiting this is False and newcomers cannot overtake them
+        if not self.can_enter():
+            return False
+        self.add_swimmer()
+        return True
+
+    def wait_for_entry(self):
+        # SLX: wait until((Eingangstor_offen) && (Anzahl_Schwimmer < Hallenkapazitaet))
+        # The slot is taken on wake-up, so customers woken at the same instant cannot overfill the pool
+        return wait_until(self.env, self.can_enter, (self.gate_open, self.num_inside), on_wake=self.add_swimmer)
 
     def add_swimmer(self):
-        self.num_inside += 1
+        if self.occupancy is not None:
+            self.occupancy.update(self.env.now, self.num_inside.value + 1)
+        self.num_inside.add(1)
 
     def remove_swimmer(self):
-        self.num_inside -= 1
+        if self.occupancy is not None:
+            self.occupancy.update(self.env.now, self.num_inside.value - 1)
+        self.num_inside.add(-1)
+
+    def join_queue(self):
+        self.num_waiting += 1
+        if self.queue_length is not None:
+            self.queue_length.update(self.env.now, self.num_waiting)
+
+    def leave_queue(self):
+        self.num_waiting -= 1
+        if self.queue_length is not None:
+            self.queue_length.update(self.env.now, self.num_waiting)
 
     def open_gate_cycle(self):
         while self.env.now < SIM_DURATION:
-            self.gate_open = True
+            if trace is not None:
+                trace.record(self.env.now, event_trace.GATE_OPEN, 0, self.num_waiting, self.num_inside.value)
+            self.gate_open.set(True)
             yield self.env.timeout(1)
-            self.gate_open = False
+            self.gate_open.set(False)
+            if trace is not None:
+                trace.record(self.env.now, event_trace.GATE_CLOSE, 0, self.num_waiting, self.num_inside.value)
             yield self.env.timeout(59)
 
 class Customer:
     id_counter = 0
 
-    def __init__(self, env, pool):
+    def __init__(self, env, pool, swim_time=None):
         Customer.id_counter += 1
-        self.name = f"Swimmer {Customer.id_counter}"
+        self.id = Customer.id_counter
+        self.name = f"Swimmer {self.id}"
         self.pool = pool
+        self.swim_time = swim_time  # Drawn on arrival with CRN, otherwise on entry
         env.process(self.run(env, pool))
 
     def run(self, env, pool):
-        pool.num_waiting += 1
         wait_start = env.now
+        if trace is not None:
+            trace.record(env.now, event_trace.ARRIVAL, self.id, pool.num_waiting, pool.num_inside.value)
 
-        while not pool.can_enter():
-            yield env.timeout(1)
+        if ADMISSION_MODE == 'polling':
+            pool.join_queue()
+            while not pool.can_enter():
+                yield env.timeout(1)
+            pool.add_swimmer()
+            pool.leave_queue()
+        elif not pool.try_enter():
+            # Only customers who cannot enter right away join the queue
+            pool.join_queue()
+            yield pool.wait_for_entry()  # wait_for_entry() has already added us to the pool
+            pool.leave_queue()
 
-        pool.num_waiting -= 1
         wait_end = env.now
         pool.stats.record_wait(wait_end - wait_start)
-        pool.add_swimmer()
-
-        # Determine stay duration
-        w = random.random()
-        if w <= 0.6:
-            swim_time = random.uniform(115, 125)  # ~2h +/- 5min
-        else:
-            swim_time = random.uniform(75, 120)   # up to 45 min earlier
+        if trace is not None:
+            trace.record(env.now, event_trace.ENTER, self.id, pool.num_waiting, pool.num_inside.value)
 
+        swim_time = self.swim_time if self.swim_time is not None else draw_swim_time(service_stream)
         yield env.timeout(swim_time)
         pool.remove_swimmer()
         pool.stats.served_customers += 1
+        if trace is not None:
+            trace.record(env.now, event_trace.DEPARTURE, self.id, pool.num_waiting, pool.num_inside.value)
+
+def draw_swim_time(stream):
+    # Determine stay duration
+    if stream.random() <= LONG_SWIM_PROBABILITY:
+        return LONG_SWIM_TIME.sample(stream)
+    return SHORT_SWIM_TIME.sample(stream)
 
 def arrival_process(env, pool):
     while env.now < SIM_DURATION:
-        yield env.timeout(random.expovariate(1))  # Mean interarrival: 1 min
+        yield env.timeout(INTERARRIVAL_TIME.sample(arrival_stream))
+        # With CRN every arrival draws its swim time, also if it balks, so the
+        # service stream stays in step with the arrivals whatever the capacity
+        swim_time = draw_swim_time(service_stream) if CRN else None
         if pool.num_waiting < MAX_QUEUE_LENGTH:
-            Customer(env, pool)
+            Customer(env, pool, swim_time)
             pool.stats.total_customers += 1
+        elif trace is not None:
+            trace.record(env.now, event_trace.BALK, 0, pool.num_waiting, pool.num_inside.value)
 
-def run_single_experiment(experiment_number=0):
-    # Set up random number generator with different seed for each experiment
-    random.seed(RANDOM_SEED + experiment_number)
+def top_allocation_sites(limit=TOP_ALLOCATION_SITES):
+    """The source lines holding the most traced memory right now, without modules imported meanwhile"""
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    ])
+    return [{'site': f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+             'size_kb': round(stat.size / 1024, 1), 'blocks': stat.count}
+            for stat in snapshot.statistics('lineno')[:limit]]
+
+def experiment_streams(experiment_number):
+    """Arrival and service streams of an experiment, see --antithetic for the pairing"""
+    if ANTITHETIC:
+        pair = (experiment_number + 1) // 2
+        return create_streams(RANDOM_SEED + pair, 2, antithetic=experiment_number % 2 == 0)
+    return create_streams(RANDOM_SEED + experiment_number, 2)
+
+def run_single_experiment(experiment_number=0, env_class=None):
+    # Set up random number streams with different seed for each experiment
+    global arrival_stream, service_stream, trace
+    arrival_stream, service_stream = experiment_streams(experiment_number)
     Customer.id_counter = 0  
-    env = simpy.Environment()
+    if env_class is None:
+        env_class = CountingEnvironment if COUNT_EVENTS else simpy.Environment
+    env = env_class()
     pool = SwimmingPool(env)
 
     # Start arrival process
@@ -113,27 +294,364 @@ def run_single_experiment(experiment_number=0):
     # Start gate cycle process
     env.process(pool.open_gate_cycle())
     
-    env.run(until=SIM_DURATION)
+    if TRACE_FILE:
+        trace = TraceRecorder(TRACE_FILE.format(experiment=experiment_number))
+    try:
+        env.run(until=SIM_DURATION)
+    finally:
+        if trace is not None:
+            trace.close()
+            trace = None
+    pool.stats.finish(SIM_DURATION)
+    if TRACEMALLOC:
+        pool.stats.allocation_sites = top_allocation_sites()  # While env still holds the model
+    pool.stats.events_scheduled, pool.stats.events_processed = event_totals(env)
+    if isinstance(env, CountingEnvironment):
+        processed = env.processed_by_type()
+        pool.stats.events_by_type = {event_type: {'scheduled': count, 'processed': processed[event_type]}
+                                     for event_type, count in env.scheduled_by_type().items()}
     if hasattr(env, 'reset'):
         env.reset()
     return pool.stats
 
-def run_all_experiments():
+def run_single_experiment_fast(experiment_number=0):
+    """
+    The model of run_single_experiment without SimPy: arrivals, departures and the gate
+    are (time, sequence, kind) entries of one heapq calendar, waiting customers are their
+    arrival times in a FIFO deque. Events are handled in SimPy's order (time, then
+    scheduling order) and every random number stream is drawn in the same order, so the
+    statistics match the SimPy engine with event admission exactly.
+    """
+    arrivals, service = experiment_streams(experiment_number)
+    stats = Statistics()
+    occupancy = stats.occupancy
+    queue_length = stats.queue_length
+    interarrival_time = INTERARRIVAL_TIME.sampler(arrivals)
+    long_swim_time = LONG_SWIM_TIME.sampler(service)
+    short_swim_time = SHORT_SWIM_TIME.sampler(service)
+    rand = service.random
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    capacity = POOL_CAPACITY
+    sim_duration = SIM_DURATION
+    crn = CRN
+    count_events = COUNT_EVENTS
+    processed_by_kind = [0] * len(KIND_NAMES)
+
+    calendar = []
+    sequence = 0
+    waiting = deque()  # arrival times of waiting customers
+    swim_times = deque()  # with CRN: swim times of the waiting customers, drawn on arrival
+    num_inside = 0
+    gate_open = True
+
+    # Occupancy and queue length are tracked inline: before each event, the time since
+    # the previous one is credited to the current states (a method call per change
+    # would cost as much as the rest of the event handling)
+    tracking = occupancy is not None
+    if tracking:
+        occupancy_time = occupancy.time_in_state
+        queue_time = queue_length.time_in_state
+    last_event = 0.0
+
+    def enter(now, wait_start, swim_time=None):
+        nonlocal sequence
+        stats.record_wait(now - wait_start)
+        if swim_time is None:
+            # Determine stay duration
+            if rand() <= LONG_SWIM_PROBABILITY:
+                swim_time = long_swim_time()
+            else:
+                swim_time = short_swim_time()
+        sequence += 1
+        heappush(calendar, (now + swim_time, sequence, DEPARTURE))
+
+    # Same start-up order as SimPy: the arrival process draws first, then the gate opens
+    heappush(calendar, (interarrival_time(), 0, ARRIVAL))
+    heappush(calendar, (1, 1, GATE_CLOSE))
+    sequence = 1
+
+    while calendar:
+        now, _, kind = heappop(calendar)
+        if now >= sim_duration:
+            break
+        if count_events:
+            processed_by_kind[kind] += 1
+        if tracking:
+            duration = now - last_event
+            occupancy_time[num_inside] += duration
+            queue_time[len(waiting)] += duration
+            last_event = now
+        if kind == ARRIVAL:
+            accepted = len(waiting) < MAX_QUEUE_LENGTH
+            if accepted:
+                stats.total_customers += 1
+            sequence += 1
+            heappush(calendar, (now + interarrival_time(), sequence, ARRIVAL))
+            swim_time = draw_swim_time(service) if crn else None
+            if accepted:
+                if gate_open and num_inside < capacity:
+                    num_inside += 1
+                    enter(now, now, swim_time)
+                else:
+                    waiting.append(now)
+                    if crn:
+                        swim_times.append(swim_time)
+        elif kind == DEPARTURE:
+            num_inside -= 1
+            stats.served_customers += 1
+            if gate_open and waiting:
+                num_inside += 1
+                enter(now, waiting.popleft(), swim_times.popleft() if crn else None)
+        elif kind == GATE_OPEN:
+            gate_open = True
+            while waiting and num_inside < capacity:
+                num_inside += 1
+                enter(now, waiting.popleft(), swim_times.popleft() if crn else None)
+            sequence += 1
+            heappush(calendar, (now + 1, sequence, GATE_CLOSE))
+        else:
+            gate_open = False
+            sequence += 1
+            heappush(calendar, (now + 59, sequence, GATE_OPEN))
+    if tracking:
+        occupancy.value, occupancy.last_time = num_inside, last_event
+        queue_length.value, queue_length.last_time = len(waiting), last_event
+    stats.finish(sim_duration)
+    if TRACEMALLOC:
+        stats.allocation_sites = top_allocation_sites()
+    # Every scheduled event took a sequence number; the ones still in the calendar and
+    # the one popped at the end of the run were not processed
+    stats.events_scheduled = sequence + 1
+    stats.events_processed = stats.events_scheduled - len(calendar) - (1 if now >= sim_duration else 0)
+    if count_events:
+        scheduled_by_kind = processed_by_kind[:]
+        for _, _, unprocessed_kind in calendar:
+            scheduled_by_kind[unprocessed_kind] += 1
+        if now >= sim_duration:
+            scheduled_by_kind[kind] += 1
+        stats.events_by_type = {name: {'scheduled': scheduled_by_kind[kind], 'processed': processed_by_kind[kind]}
+                                for kind, name in enumerate(KIND_NAMES)}
+    return stats
+
+def run_timed_experiment(experiment_number):
+    run_experiment = run_single_experiment_fast if ENGINE == 'fast' else run_single_experiment
+    if TRACEMALLOC:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]  # Held by earlier experiments' results
+    start_time = time.perf_counter()
+    stats = run_experiment(experiment_number)
+    end_time = time.perf_counter()
+    if TRACEMALLOC:
+        stats.tracemalloc_peak = tracemalloc.get_traced_memory()[1] - baseline
+    return experiment_number, (end_time - start_time) * 1000, stats  # Time in milliseconds
+
+# Module settings that worker processes need to run experiments like the main process
+WORKER_SETTINGS = ['POOL_CAPACITY', 'SIM_DURATION', 'ADMISSION_MODE', 'ENGINE', 'KEEP_RAW', 'TRACK_OCCUPANCY', 'TRACE_FILE',
+                   'CRN', 'ANTITHETIC', 'COUNT_EVENTS',
+                   'TRACEMALLOC']
+
+def init_worker(settings):
+    # Worker processes do not run main(), so they get the configuration from here
+    globals().update(settings)
+
+def run_experiments_parallel(experiments, workers):
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=({name: globals()[name] for name in WORKER_SETTINGS},)) as executor:
+        futures = [executor.submit(run_timed_experiment, experiment) for experiment in experiments]
+        for future in as_completed(futures):
+            experiment, elapsed_time, stats = future.result()
+            results[experiment] = (elapsed_time, stats)
+            print(f"Experiment {experiment}: {elapsed_time:.2f} ms, customers: {stats.total_customers}, "
+                  f"served: {stats.served_customers}", flush=True)
+    return results
+
+def stopping_rule_met(replication_means):
+    """Whether the adaptive mode has run enough experiments"""
+    if replication_means.count >= MAX_EXPERIMENTS:
+        return True
+    return replication_means.count >= MIN_EXPERIMENTS and replication_means.ci_halfwidth() <= TARGET_CI_HALFWIDTH
+
+def run_experiments_adaptive(workers):
+    """
+    Run experiments 1, 2, ... until stopping_rule_met(). The rule is checked on the
+    experiments in order, so parallel runs stop after the same experiment as a serial
+    run and give identical statistics; experiments started beyond it are discarded.
+    """
+    results = {}
+    replication_means = SampleAccumulator()
+    if workers <= 1:
+        while not stopping_rule_met(replication_means):
+            experiment, elapsed_time, stats = run_timed_experiment(replication_means.count + 1)
+            results[experiment] = (elapsed_time, stats)
+            replication_means.add(stats.waits.mean)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=({name: globals()[name] for name in WORKER_SETTINGS},)) as executor:
+        pending = {}  # experiment -> future, a few more than workers so no worker idles
+        next_experiment = 1
+        while not stopping_rule_met(replication_means):
+            while len(pending) < 2 * workers and next_experiment <= MAX_EXPERIMENTS:
+                pending[next_experiment] = executor.submit(run_timed_experiment, next_experiment)
+                next_experiment += 1
+            experiment, elapsed_time, stats = pending.pop(replication_means.count + 1).result()
+            results[experiment] = (elapsed_time, stats)
+            replication_means.add(stats.waits.mean)
+        for future in pending.values():
+            future.cancel()
+    return results
+
+def write_raw_waiting_times(filename, results):
+    with open(filename, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['experiment', 'waiting_time'])
+        for experiment in sorted(results):
+            _, stats = results[experiment]
+            writer.writerows((experiment, wait_time) for wait_time in stats.waiting_times)
+
+def event_summary(all_stats, elapsed_time):
+    """Event counts (per experiment) and cost per event of runs taking elapsed_time ms in total"""
+    all_stats = list(all_stats)
+    scheduled = sum(stats.events_scheduled for stats in all_stats)
+    processed = sum(stats.events_processed for stats in all_stats)
+    summary = {
+        'events_scheduled': round(scheduled / len(all_stats), 1), # per experiment
+        'events_processed': round(processed / len(all_stats), 1), # per experiment
+        **throughput(processed, elapsed_time),
+    }
+    if COUNT_EVENTS:
+        events_by_type = {}  # Totals over all experiments
+        for stats in all_stats:
+            for event_type, counts in stats.events_by_type.items():
+                totals = events_by_type.setdefault(event_type, {'scheduled': 0, 'processed': 0})
+                totals['scheduled'] += counts['scheduled']
+                totals['processed'] += counts['processed']
+        summary['events_by_type'] = events_by_type
+    return summary
+
+def memory_summary(all_stats):
+    """Peak RSS, and with TRACEMALLOC the traced memory of the experiment with the highest peak"""
+    summary = {'peak_rss_mb': peak_rss_mb()}  # Of this process, i.e. all experiments run in it
+    if TRACEMALLOC:
+        peak_stats = max(all_stats, key=lambda stats: stats.tracemalloc_peak)
+        summary.update({
+            'tracemalloc_peak_mb': round(peak_stats.tracemalloc_peak / 2**20, 3),
+            'top_allocations': peak_stats.allocation_sites,
+        })
+    return summary
+
+def run_batch_means(raw_output=None):
+    """
+    One long run (experiment 1) as long as all NUMBER_SIM_EXPERIMENTS experiments together.
+    The waiting times in order of entry are truncated by MSER-5 and split into NUM_BATCHES
+    batches, whose means estimate the steady-state waiting time and its CI.
+    """
+    global SIM_DURATION, KEEP_RAW
+    settings = SIM_DURATION, KEEP_RAW
+    SIM_DURATION, KEEP_RAW = SIM_DURATION * NUMBER_SIM_EXPERIMENTS, True  # The sequence of waits is needed
+    try:
+        run_length = SIM_DURATION
+        experiment, elapsed_time, stats = run_timed_experiment(1)
+    finally:
+        SIM_DURATION, KEEP_RAW = settings
+
+    waits = stats.waiting_times
+    warmup = mser_truncation(waits)
+    means = batch_means(waits[warmup:], NUM_BATCHES)
+    batches = SampleAccumulator()
+    batches.add_many(means)
+    steady_state_waits = SampleAccumulator()
+    steady_state_waits.add_many(waits[warmup:])
+    all_waits = steady_state_waits.summary()
+    ci_halfwidth = batches.ci_halfwidth()
+    autocorrelation = lag1_autocorrelation(means)
+
+    summary = {
+        'framework': 'Heapq' if ENGINE == 'fast' else 'SimPy',
+        'analysis': 'batch_means',
+        'pool_capacity': POOL_CAPACITY,
+        'sim_duration': run_length,
+        'num_experiments': 1,
+        'average_time': round(elapsed_time, 2), # in milliseconds
+        'min_time': round(elapsed_time, 2), # in milliseconds
+        'max_time': round(elapsed_time, 2),  # in milliseconds
+        'total_time': round(elapsed_time, 2),  # in milliseconds
+        'avg_customers': stats.total_customers, # customers
+        'avg_served_customers': stats.served_customers, # customers
+        'average_waiting_time': round(batches.mean, 2), # steady state, in minutes
+        # 95% t confidence interval over the batch means, in minutes
+        'waiting_time_ci_halfwidth': round(ci_halfwidth, 3) if math.isfinite(ci_halfwidth) else None,
+        # Over the waiting times after the warm-up, in minutes
+        'waiting_time_std': all_waits['std'],
+        'waiting_time_min': all_waits['min'],
+        'waiting_time_max': all_waits['max'],
+        'waiting_time_p50': all_waits['p50'],
+        'waiting_time_p95': all_waits['p95'],
+        'waiting_time_p99': all_waits['p99'],
+        'warmup_customers': warmup, # waiting times discarded by MSER-5
+        'warmup_fraction': round(warmup / len(waits), 4) if waits else 0,
+        'num_batches': NUM_BATCHES,
+        'batch_size': len(waits[warmup:]) // NUM_BATCHES, # customers
+        # Well above ~0.2: batches too short for the CI to be trusted
+        'batch_lag1_autocorrelation': round(autocorrelation, 3) if math.isfinite(autocorrelation) else None,
+        'workers': 1,
+        'wall_time': round(elapsed_time, 2),  # in milliseconds
+        'speedup': 1.0,
+        **event_summary([stats], elapsed_time),
+        **memory_summary([stats]),
+    }
+    print(f"Summary:{json.dumps(summary)}")
+
+    if raw_output:
+        write_raw_waiting_times(raw_output, {experiment: (elapsed_time, stats)})
+    return summary
+
+def run_all_experiments(workers=1, raw_output=None):
+    if BATCH_MEANS:
+        return run_batch_means(raw_output)
     total_times = []
     total_customers = []
     total_served_customers = []
     avg_wait_times = []
 
-    for experiment in range(1, NUMBER_SIM_EXPERIMENTS + 1):
-        start_time = time.perf_counter()
-        stats = run_single_experiment(experiment)
-        end_time = time.perf_counter()
+    experiments = range(1, NUMBER_SIM_EXPERIMENTS + 1)
+    wall_start_time = time.perf_counter()
+    if TARGET_CI_HALFWIDTH is not None:
+        results = run_experiments_adaptive(workers)
+        experiments = range(1, len(results) + 1)
+    elif workers > 1:
+        results = run_experiments_parallel(experiments, workers)
+    else:
+        results = {experiment: run_timed_experiment(experiment)[1:] for experiment in experiments}
+    wall_time = (time.perf_counter() - wall_start_time) * 1000  # Convert to milliseconds
 
-        elapsed_time = (end_time - start_time) * 1000  # Convert to milliseconds
+    # Aggregate in experiment order so the sums match the serial run exactly
+    for experiment in experiments:
+        elapsed_time, stats = results[experiment]
         total_times.append(elapsed_time)
         total_customers.append(stats.total_customers)
         total_served_customers.append(stats.served_customers)
-        avg_wait_times.append(sum(stats.waiting_times) / len(stats.waiting_times) if stats.waiting_times else 0)
+        avg_wait_times.append(stats.waits.mean)
+    all_waits = SampleAccumulator.merged(results[experiment][1].waits for experiment in experiments).summary()
+    replication_means = SampleAccumulator()
+    for wait_time in avg_wait_times:
+        replication_means.add(wait_time)
+    ci_halfwidth = replication_means.ci_halfwidth()
+    if ANTITHETIC:
+        # The two experiments of a pair are correlated, only the pair averages are independent
+        pair_means = SampleAccumulator()
+        for first, second in zip(avg_wait_times[0::2], avg_wait_times[1::2]):
+            pair_means.add((first + second) / 2)
+        ci_halfwidth = pair_means.ci_halfwidth()
+        # Variance of a pair average relative to the average of two independent experiments
+        variance_ratio = pair_means.variance / (replication_means.variance / 2) if replication_means.variance > 0 else math.nan
+    if TRACK_OCCUPANCY:
+        occupancy = TimeWeightedAccumulator.merged(results[experiment][1].occupancy for experiment in experiments)
+        queue_length = TimeWeightedAccumulator.merged(results[experiment][1].queue_length for experiment in experiments)
 
     avg_time = sum(total_times) / len(total_times)
     min_time = min(total_times)
@@ -143,10 +661,10 @@ def run_all_experiments():
     avg_served_customers = sum(total_served_customers) / len(total_served_customers) if total_served_customers else 0
 
     summary = {
-        'framework': 'SimPy',
+        'framework': 'Heapq' if ENGINE == 'fast' else 'SimPy',
         'pool_capacity': POOL_CAPACITY,
         'sim_duration': SIM_DURATION,
-        'num_experiments': NUMBER_SIM_EXPERIMENTS,
+        'num_experiments': len(experiments),
         'average_time': round(avg_time, 2), # in milliseconds
         'min_time': round(min_time, 2), # in milliseconds
         'max_time': round(max_time, 2),  # in milliseconds
@@ -154,23 +672,113 @@ def run_all_experiments():
         'avg_customers': avg_customers, # customers
         'avg_served_customers': avg_served_customers, # customers
         'average_waiting_time': round(avg_wait_time, 2), # in minutes
+        # 95% t confidence interval over the experiments' averages, in minutes (None for one experiment)
+        'waiting_time_ci_halfwidth': round(ci_halfwidth, 3) if math.isfinite(ci_halfwidth) else None,
+        # Over the waiting times of all experiments, in minutes
+        'waiting_time_std': all_waits['std'],
+        'waiting_time_min': all_waits['min'],
+        'waiting_time_max': all_waits['max'],
+        'waiting_time_p50': all_waits['p50'],
+        'waiting_time_p95': all_waits['p95'],
+        'waiting_time_p99': all_waits['p99'],
+        'workers': workers,
+        'wall_time': round(wall_time, 2),  # in milliseconds
+        'speedup': round(sum(total_times) / wall_time, 2),  # serial time / wall-clock time
+        **event_summary((results[experiment][1] for experiment in experiments), sum(total_times)),
+        **memory_summary([results[experiment][1] for experiment in experiments]),
     }
+    if CRN or ANTITHETIC:
+        summary.update({'crn': CRN, 'antithetic': ANTITHETIC})
+    if ANTITHETIC:
+        summary.update({
+            'antithetic_pairs': pair_means.count,
+            # Share of the variance saved by pairing, e.g. 0.4: 40% fewer experiments for the same CI
+            'variance_reduction': round(1 - variance_ratio, 3) if math.isfinite(variance_ratio) else None,
+        })
+    if TARGET_CI_HALFWIDTH is not None:
+        summary.update({
+            'target_ci_halfwidth': TARGET_CI_HALFWIDTH, # in minutes
+            'min_experiments': MIN_EXPERIMENTS,
+            'max_experiments': MAX_EXPERIMENTS,
+            'target_reached': ci_halfwidth <= TARGET_CI_HALFWIDTH,
+        })
+    if TRACK_OCCUPANCY:
+        # Time averages over all experiments
+        summary.update({
+            'avg_swimmers_inside': round(occupancy.mean, 2), # swimmers
+            'utilization': round(occupancy.mean / POOL_CAPACITY, 4), # fraction of pool capacity
+            'avg_queue_length': round(queue_length.mean, 2), # customers
+            'queue_length_time_fractions': [round(f, 4) for f in queue_length.time_fractions()], # index = queue length
+        })
     
     print(f"Summary:{json.dumps(summary)}")
 
+    if raw_output:
+        write_raw_waiting_times(raw_output, results)
+    return summary
+
 def main():
+    global POOL_CAPACITY, SIM_DURATION, NUMBER_SIM_EXPERIMENTS, ADMISSION_MODE, ENGINE, KEEP_RAW, TRACK_OCCUPANCY, TRACE_FILE
+    global TARGET_CI_HALFWIDTH, MIN_EXPERIMENTS, MAX_EXPERIMENTS, CRN, ANTITHETIC
+    global BATCH_MEANS, NUM_BATCHES, COUNT_EVENTS, TRACEMALLOC
     parser = argparse.ArgumentParser(description='Starting SimPy Swimming Pool Simulation')
     parser.add_argument('--pool-capacity', type=int, default=100)
     parser.add_argument('--sim-duration', type=int, default=2400)
     parser.add_argument('--num-experiments', type=int, default=20)
+    parser.add_argument('--admission', choices=['event', 'polling'], default='event')
+    parser.add_argument('--engine', choices=['simpy', 'fast'], default='simpy')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--keep-raw', metavar='FILE')
+    parser.add_argument('--no-occupancy', action='store_true')
+    parser.add_argument('--trace', metavar='FILE')
+    parser.add_argument('--target-ci-halfwidth', type=float)
+    parser.add_argument('--min-experiments', type=int, default=MIN_EXPERIMENTS)
+    parser.add_argument('--max-experiments', type=int, default=MAX_EXPERIMENTS)
+    parser.add_argument('--crn', action='store_true')
+    parser.add_argument('--antithetic', action='store_true')
+    parser.add_argument('--batch-means', action='store_true')
+    parser.add_argument('--num-batches', type=int, default=NUM_BATCHES)
+    parser.add_argument('--count-events', action='store_true')
+    parser.add_argument('--tracemalloc', action='store_true')
     args = parser.parse_args()
 
-    global POOL_CAPACITY, SIM_DURATION, NUMBER_SIM_EXPERIMENTS
     POOL_CAPACITY = args.pool_capacity
     SIM_DURATION = args.sim_duration
     NUMBER_SIM_EXPERIMENTS = args.num_experiments
+    ADMISSION_MODE = args.admission
+    ENGINE = args.engine
+    KEEP_RAW = args.keep_raw is not None
+    TRACK_OCCUPANCY = not args.no_occupancy
+    TRACE_FILE = args.trace
+    TARGET_CI_HALFWIDTH = args.target_ci_halfwidth
+    MIN_EXPERIMENTS = args.min_experiments
+    MAX_EXPERIMENTS = args.max_experiments
+    CRN = args.crn
+    ANTITHETIC = args.antithetic
+    BATCH_MEANS = args.batch_means
+    NUM_BATCHES = args.num_batches
+    COUNT_EVENTS = args.count_events
+    TRACEMALLOC = args.tracemalloc
+    if TARGET_CI_HALFWIDTH is not None and not 2 <= MIN_EXPERIMENTS <= MAX_EXPERIMENTS:
+        parser.error("--target-ci-halfwidth needs 2 <= --min-experiments <= --max-experiments")
+    if ENGINE == 'fast' and ADMISSION_MODE == 'polling':
+        parser.error("--engine fast only implements event admission")
+    if TRACE_FILE and ENGINE == 'fast':
+        parser.error("--trace is only supported by --engine simpy")
+    if ANTITHETIC and TARGET_CI_HALFWIDTH is not None:
+        parser.error("--antithetic needs a fixed --num-experiments, not --target-ci-halfwidth")
+    if ANTITHETIC and NUMBER_SIM_EXPERIMENTS % 2:
+        parser.error("--antithetic needs an even --num-experiments (pairs of experiments)")
+    if BATCH_MEANS and (TARGET_CI_HALFWIDTH is not None or ANTITHETIC or args.workers > 1):
+        parser.error("--batch-means is a single run and cannot be combined with "
+                     "--target-ci-halfwidth, --antithetic or --workers")
+    if BATCH_MEANS and NUM_BATCHES < 2:
+        parser.error("--num-batches must be at least 2")
+    several_experiments = not BATCH_MEANS and (NUMBER_SIM_EXPERIMENTS > 1 or TARGET_CI_HALFWIDTH is not None)
+    if TRACE_FILE and several_experiments and '{experiment}' not in TRACE_FILE:
+        parser.error("--trace needs '{experiment}' in the file name when running several experiments")
 
-    run_all_experiments()
+    run_all_experiments(workers=args.workers, raw_output=args.keep_raw)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""
+Random Variate Streams
+======================
+SLX models draw from independent random number streams per stochastic source
+(e.g. 'rn_stream Ankunft, Service'). This module provides the same for the
+Python models on top of numpy.random.Generator:
+
+- create_streams() derives independent streams from one seed with SeedSequence.spawn,
+  so arrivals stay identical when e.g. the pool capacity changes the number of
+  service draws (common random numbers across configurations).
+- Each stream samples its variates in large vectorized blocks and hands them out
+  one at a time from a buffer, which is cheaper per draw than the random module.
+- Antithetic pairs: create_streams(seed, count, antithetic=False) and
+  create_streams(seed, count, antithetic=True) draw every variate by inversion
+  from the same uniforms U and 1 - U respectively, so the outputs of the two
+  runs are negatively correlated.
+- EntityStreams gives every entity class ('Car', 'Plate', ...) its own stream,
+  derived from the seed and the class name, so that entities of one class draw
+  the same variates however many another class draws, or whether it exists.
+- experiment_seed() numbers the seeds of experiments: seed + k for the measured
+  experiment k = 1, 2, ..., and a range of their own for the warm-up experiments
+  run before them (numbered 0, -1, ...), so the measured ones draw the same
+  variates however many warm-up experiments there are.
+
+The model-facing distributions (normal, triangular, ..., rounded to a time
+resolution) are in distributions.py.
+
+USAGE:
+    arrival_stream, service_stream = create_streams(RANDOM_SEED + experiment_number, 2)
+    yield env.timeout(arrival_stream.expovariate(1))
+    car_stream = EntityStreams(RANDOM_SEED + experiment_number)['Car']
+"""
+
+import math
+
+import numpy as np
+
+BLOCK_SIZE = 4096  # Variates sampled per refill
+
+
+class VariateStream:
+    """
+    One independent random number stream with a buffer per distribution.
+
+    antithetic=None (default) uses NumPy's fastest sampler per distribution. False
+    or True make the stream one half of an antithetic pair: all variates come from
+    the stream's uniforms U by inversion, and with True from 1 - U instead.
+    """
+    def __init__(self, seed_sequence, block_size=BLOCK_SIZE, antithetic=None):
+        self.generator = np.random.Generator(np.random.PCG64(seed_sequence))
+        self.block_size = block_size
+        self.antithetic = antithetic
+        self._uniforms = iter(())
+        self._exponentials = iter(())
+        self._normals = iter(())
+
+    def _uniform_block(self):
+        block = self.generator.random(self.block_size)
+        return 1.0 - block if self.antithetic else block
+
+    def random(self):
+        """Uniform variate in [0, 1), (0, 1] for the antithetic half of a pair"""
+        try:
+            return next(self._uniforms)
+        except StopIteration:
+            # tolist() turns the block into Python floats, which are cheaper to use than numpy scalars
+            self._uniforms = iter(self._uniform_block().tolist())
+            return next(self._uniforms)
+
+    def uniform(self, a, b):
+        """Uniform variate in [a, b)"""
+        return a + (b - a) * self.random()
+
+    def expovariate(self, lambd):
+        """Exponential variate with rate lambd (mean 1 / lambd), like random.expovariate"""
+        try:
+            return next(self._exponentials) / lambd
+        except StopIteration:
+            if self.antithetic is None:
+                block = self.generator.standard_exponential(self.block_size)
+            else:
+                block = -np.log1p(-self._uniform_block())  # Inversion: -log(1 - U)
+            self._exponentials = iter(block.tolist())
+            return next(self._exponentials) / lambd
+
+    def normalvariate(self, mu, sigma):
+        """Normal variate with mean mu and standard deviation sigma, like random.normalvariate"""
+        try:
+            return mu + sigma * next(self._normals)
+        except StopIteration:
+            block = self.generator.standard_normal(self.block_size)
+            if self.antithetic:
+                # Both halves of a pair draw the same standard normals Z, this one -Z, which is
+                # what inversion of 1 - U gives (NumPy has no vectorized inverse normal CDF)
+                block = -block
+            self._normals = iter(block.tolist())
+            return mu + sigma * next(self._normals)
+
+    def triangular(self, low, high, mode):
+        """Triangular variate between low and high with the given mode, like random.triangular"""
+        u = self.random()
+        width = high - low
+        if width <= 0:
+            return low
+        if u * width < mode - low:  # Inversion of the triangular CDF
+            return low + math.sqrt(u * width * (mode - low))
+        return high - math.sqrt((1.0 - u) * width * (high - mode))
+
+
+def create_streams(seed, count, antithetic=None):
+    """count independent streams derived from seed, see VariateStream for antithetic"""
+    return [VariateStream(child, antithetic=antithetic) for child in np.random.SeedSequence(seed).spawn(count)]
+
+
+# First spawn key word of the entity class streams, apart from the children of create_streams()
+ENTITY_STREAM_KEY = 2**32 - 1
+WARMUP_SEED_OFFSET = 2**32  # Warm-up experiment -j gets seed WARMUP_SEED_OFFSET + seed + j
+
+
+def experiment_seed(seed, experiment):
+    """Seed of experiment 1, 2, ... (seed + experiment) or of warm-up experiment 0, -1, ... (non-negative, apart)"""
+    return seed + experiment if experiment > 0 else WARMUP_SEED_OFFSET + seed - experiment
+
+
+class EntityStreams:
+    """One VariateStream per entity class name, created on first use and derived from seed and name"""
+    def __init__(self, seed, antithetic=None):
+        self.seed = seed
+        self.antithetic = antithetic
+        self._streams = {}
+
+    def __getitem__(self, name):
+        try:
+            return self._streams[name]
+        except KeyError:
+            seed_sequence = np.random.SeedSequence(self.seed, spawn_key=(ENTITY_STREAM_KEY, *name.encode()))
+            stream = self._streams[name] = VariateStream(seed_sequence, antithetic=self.antithetic)
+            return stream
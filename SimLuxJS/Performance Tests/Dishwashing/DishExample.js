@@ -9,9 +9,10 @@ class DishExampleSimulation {
 		this.washers = this.simLuxJS.createResource(washers);
 		this.rinsers = this.simLuxJS.createResource(rinsers);
 		this.driers = this.simLuxJS.createResource(driers);
+		this.cleanDishes = 0;
 		
 		let nHalf = n / 2;
-		for (let i = 1; i <= nHalf + 1; i++) {
+		for (let i = 1; i <= nHalf; i++) {
 			this.simLuxJS.addSimEntity(new Dish(this, Dish.Type.Plate, i, i % 7 == 0));
 			this.simLuxJS.addSimEntity(new Dish(this, Dish.Type.Glass, i, i % 5 == 2));
 		}
@@ -83,6 +84,7 @@ class Dish extends SimEntity {
 		}
 		await simLuxJS.advance(this.dishType == Dish.Type.Plate ? 2 : 3); // glasses take longer to dry.
 		release();
+		deSim.cleanDishes++;
 		this.log("is completely clean.");
 	}
 }
@@ -146,4 +148,8 @@ async function testPerformance() {
 	fs.closeSync(outputFile);
 }
 
-testPerformance();
\ No newline at end of file
+module.exports = { DishExampleSimulation, Dish };
+
+if (require.main === module) {
+	testPerformance();
+}
@@ -1,25 +1,107 @@
 # This is expected to do the same as the neighbouring DishExample.js.
 
+import argparse
+import os
+import sys
+from collections import deque, namedtuple
 from enum import Enum
 import simpy
 from datetime import datetime
 
+# Minutes a dish spends in each step; findGlass is the extra washing time of a glass in which another one is found
+StepDurations = namedtuple('StepDurations', ['preRinse', 'findGlass', 'wash', 'rinse', 'dryUntilDirtFound', 'rewash', 'rerinse', 'dry'])
+PLATE_STEPS = StepDurations(1, 0.4, 5, 1, 1.2, 3, 1, 2)
+GLASS_STEPS = StepDurations(1, 0.4, 5, 1, 1.2, 3, 1, 3)	# glasses take longer to dry.
+
+def fixedStepDurations(dish):
+	return PLATE_STEPS if dish.dishType == Dish.Type.Plate else GLASS_STEPS
+
 class DishExampleSimulation():
-	def __init__(self, n, preRinsers, washers, rinsers, driers, enableLogging):
+	# lookahead: None starts all n dishes up front; a number starts them lazily through a DishSource,
+	# with at most that many waiting for a pre-rinser (same simulation, less memory and setup time).
+	# stepDurations(dish) gives the StepDurations of a new dish, e.g. random ones (see dishwashing_simple.py).
+	def __init__(self, n, preRinsers, washers, rinsers, driers, enableLogging, lookahead=None, stepDurations=fixedStepDurations):
 		self.dishLogging = enableLogging
+		self.stepDurations = stepDurations
 		self.env = simpy.Environment()
-		self.preRinsers = simpy.Resource(self.env, capacity=preRinsers)
+		self.dishSource = None if lookahead is None else DishSource(self, self.initialDishes(n), lookahead)
+		if self.dishSource is None:
+			self.preRinsers = simpy.Resource(self.env, capacity=preRinsers)
+		else:
+			self.preRinsers = FeedingResource(self.env, preRinsers, self.dishSource.feed)
 		self.washers = simpy.Resource(self.env, capacity=washers)
 		self.rinsers = simpy.Resource(self.env, capacity=rinsers)
 		self.driers = simpy.Resource(self.env, capacity=driers)
+		self.cleanDishes = 0
 		
+		if self.dishSource is None:
+			for dish in self.initialDishes(n):
+				self.env.process(dish.run())
+		else:
+			self.dishSource.start()
+    
+	def initialDishes(self, n):
 		nHalf = int(n / 2);
 		for i in range(1, nHalf + 1):
-			self.env.process(Dish(self, Dish.Type.Plate, i, i % 7 == 0).run())
-			self.env.process(Dish(self, Dish.Type.Glass, i, i % 5 == 2).run())
+			yield Dish(self, Dish.Type.Plate, i, i % 7 == 0)
+			yield Dish(self, Dish.Type.Glass, i, i % 5 == 2)
+    
+	def addDish(self, dish):
+		if self.dishSource is None:
+			self.env.process(dish.run())
+		else:
+			self.dishSource.add(dish)
     
 	def run(self):
 		self.env.run()
+
+class DishSource():
+	# Starts the dishes of a DishExampleSimulation one at a time: whenever a pre-rinser is granted, the
+	# next dish is created and requests one, so only `lookahead` dishes wait in its queue instead of all
+	# of them. Dishes added during the run queue up behind the initial ones, which is where their request
+	# would be anyway. The pre-rinsers thus grant the same dishes at the same simulated times as when all
+	# dishes are started up front (a started dish's Initialize is urgent, so its request is queued before
+	# the next pre-rinser is released): every dish takes the same steps at the same times and they become
+	# clean in the same order, only events within the same instant may be processed in another order.
+	def __init__(self, dishExampleSimulation, dishes, lookahead):
+		if lookahead < 1:
+			raise ValueError("lookahead must be at least 1")
+		self.deSim = dishExampleSimulation
+		self.dishes = dishes  # The initial dishes in their order, created on demand
+		self.lookahead = lookahead
+		self.addedDishes = deque()
+		self.nextDish = next(self.dishes, None)
+	
+	def start(self):
+		for _ in range(self.lookahead):
+			self.feed()
+	
+	def feed(self):
+		if self.nextDish is not None:
+			dish = self.nextDish
+			self.nextDish = next(self.dishes, None)
+		elif self.addedDishes:
+			dish = self.addedDishes.popleft()
+		else:
+			return
+		self.deSim.env.process(dish.run())
+	
+	def add(self, dish):
+		if self.nextDish is None and not self.addedDishes:
+			self.deSim.env.process(dish.run())  # Nothing ahead of it any more
+		else:
+			self.addedDishes.append(dish)
+
+class FeedingResource(simpy.Resource):
+	# simpy.Resource that calls onGrant() whenever it grants a request
+	def __init__(self, env, capacity, onGrant):
+		super().__init__(env, capacity)
+		self.onGrant = onGrant
+	
+	def _do_put(self, event):
+		super()._do_put(event)
+		if event.triggered:
+			self.onGrant()
     
 class Dish():
 	class Type(Enum):
@@ -32,6 +114,7 @@ class Dish():
 		self.nr = nr;
 		self.hiddenDirt = hiddenDirt;
 		self.isNew = isNew
+		self.steps = dishExampleSimulation.stepDurations(self)
     
 	def log(self, message):
 		if self.deSim.dishLogging:
@@ -40,57 +123,61 @@ class Dish():
 	def run(self):
 		deSim = self.deSim
 		env = deSim.env
+		steps = self.steps
 		request = deSim.preRinsers.request()
 		yield request
 		self.log("is being pre-prinsed")
-		yield env.timeout(1)
+		yield env.timeout(steps.preRinse)
 		deSim.preRinsers.release(request)
 		request = deSim.washers.request()
 		yield request
 		self.log("is being washed.")
 		if self.dishType == Dish.Type.Glass and not self.isNew and self.nr % 10 == 1:
 			# This branch demonstrates how new SimEntities can be added into the running simulation. 
-			yield env.timeout(0.4)
+			yield env.timeout(steps.findGlass)
 			self.log("while being washed, the dish washer found out, that there was another glass inside.")
 			newGlass = Dish(deSim, Dish.Type.Glass, self.nr, False, isNew=True)
 			newGlass.log("is added to the beginning of the washing pipeline.")
-			env.process(newGlass.run())
-		yield env.timeout(5)
+			deSim.addDish(newGlass)
+		yield env.timeout(steps.wash)
 		deSim.washers.release(request)
 		request = deSim.rinsers.request()
 		yield request
 		self.log("is being rinsed.")
-		yield env.timeout(1)
+		yield env.timeout(steps.rinse)
 		deSim.rinsers.release(request)
 		request = deSim.driers.request()
 		yield request
 		self.log("is being dried.")
 		if (self.hiddenDirt):
-			yield env.timeout(1.2)
+			yield env.timeout(steps.dryUntilDirtFound)
 			deSim.driers.release(request)
 			request = deSim.washers.request()
 			yield request
 			self.log("is being washed again because the drier found some hidden dirt.")
-			yield env.timeout(3)
+			yield env.timeout(steps.rewash)
 			deSim.washers.release(request)
 			request = deSim.rinsers.request()
 			yield request
 			self.log("is being rinsed again after the hidden dirt had been washed off.")
-			yield env.timeout(1)		
+			yield env.timeout(steps.rerinse)
 			deSim.rinsers.release(request)
 			request = deSim.driers.request()
 			yield request
 			self.log("is being dried again after the hidden dirt had been rinsed.")
-		yield env.timeout(2 if self.dishType == Dish.Type.Plate else 3)	# glasses take longer to dry.
+		yield env.timeout(steps.dry)
 		deSim.driers.release(request)
+		deSim.cleanDishes += 1
 		self.log("is completely clean.")
 	
-def testPerformance():
+def testPerformance(warmup=2, gcMode='on'):
+	# The replications are timed by benchmark_harness.py: a fresh simulation each, warmup of them discarded,
+	# gcMode 'on', 'off' or 'freeze' for Python's garbage collector during each one
+	sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'PerformanceTest'))
+	from benchmark_harness import time_replications, time_stats
+
 	outputFilePath = "Performance Tests/Dishwashing/pythonOutput.csv"
 	outputFile = open(outputFilePath, 'w', 1)
-	
-	def stopTime(startTime):
-		return (datetime.now() - startTime).total_seconds()
 
 	repeatitions = 10;
 
@@ -100,33 +187,41 @@ def testPerformance():
 	driersCount = 3;
 	
 	outputFile.write(datetime.now().isoformat() + ",,,,\n")
-	outputFile.write("preRinsers: " + str(preRinsersCount) + ",washers: " + str(washersCount) + ",rinsers: " + str(rinsersCount) + ",driers: " + str(driersCount) + ",repeatitions: " + str(repeatitions) + "\n")
+	outputFile.write("preRinsers: " + str(preRinsersCount) + ",washers: " + str(washersCount) + ",rinsers: " + str(rinsersCount) + ",driers: " + str(driersCount) + ",repeatitions: " + str(repeatitions) + ",warmup: " + str(warmup) + ",gc: " + gcMode + "\n")
 	outputFile.write(",,,,\n")
 	outputFile.write("logging,n,preparationDuration,runDuration,totalDuration\n")
         
 	for logging in [True, False]:
 		for n in [100, 1000, 10000, 25000, 50000, 100000, 250000]:
 			outputFile.write(",,,,\n");
+			print("starting (logging: " + str(logging) + ", n: " + str(n) + ") at real time: " + datetime.now().isoformat())
+			finalTimes = []
+			times = time_replications(
+				lambda: DishExampleSimulation(n, preRinsersCount, washersCount, rinsersCount, driersCount, logging),
+				lambda sim: sim.run(), repeatitions, warmup, gcMode, lambda sim: finalTimes.append(sim.env.now))
 			
-			for simNr in range(repeatitions):
-				outputFile.write(str(logging) + "," + str(n))
-				preparationStartTime = datetime.now()
-				print("starting (logging: " + str(logging) + ", n: " + str(n) + ") at real time: " + preparationStartTime.isoformat())
-				sim = DishExampleSimulation(n, preRinsersCount, washersCount, rinsersCount, driersCount, logging)
-				preparationDuration = stopTime(preparationStartTime)
-				preparationDurationStr = str(preparationDuration)
-				print("preparation duration: " + preparationDurationStr + "s")
-				outputFile.write("," + preparationDurationStr)
-				
-				runStartTime = datetime.now()
-				sim.run()
-				runDuration = stopTime(runStartTime)
-				runDurationStr = str(runDuration)
-				print("run duration: " + runDurationStr + "s")
+			for (preparationNs, runNs), finalTime in zip(times, finalTimes):
+				preparationDuration = preparationNs / 1e9	# in seconds
+				runDuration = runNs / 1e9
 				totalDurationStr = str(preparationDuration + runDuration)
-				print("Finished at simulated time: " + str(sim.env.now) + " after " + totalDurationStr + " real seconds.")
-				print("Total duration: " + totalDurationStr)
-				outputFile.write("," + runDurationStr + "," + totalDurationStr + "\n")
+				print("preparation duration: " + str(preparationDuration) + "s, run duration: " + str(runDuration) + "s")
+				print("Finished at simulated time: " + str(finalTime) + " after " + totalDurationStr + " real seconds.")
+				outputFile.write(str(logging) + "," + str(n) + "," + str(preparationDuration) + "," + str(runDuration) + "," + totalDurationStr + "\n")
+			
+			# mean, min and stdev over the replications, in seconds like the rows above
+			statsByName = {
+				'preparation': time_stats([preparationNs for preparationNs, runNs in times]),
+				'run': time_stats([runNs for preparationNs, runNs in times]),
+				'total': time_stats([preparationNs + runNs for preparationNs, runNs in times])}
+			for statName in ['mean', 'min', 'stdev']:
+				row = [str(round(statsByName[name][statName] / 1000, 6)) for name in ['preparation', 'run', 'total']]
+				print(statName + " (preparation, run, total): " + ", ".join(row) + " s")
+				outputFile.write(str(logging) + "," + str(n) + " " + statName + "," + ",".join(row) + "\n")
 	outputFile.close()
 
-testPerformance()
\ No newline at end of file
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description='Time the dishwashing example for several n, with and without logging')
+	parser.add_argument('--warmup', type=int, default=2)
+	parser.add_argument('--gc', choices=['on', 'off', 'freeze'], default='on')
+	args = parser.parse_args()
+	testPerformance(args.warmup, args.gc)
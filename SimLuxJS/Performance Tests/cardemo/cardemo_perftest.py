@@ -3,9 +3,14 @@
 #//JS/const SimLuxJS = require('../../SimLuxJS.js').SimLuxJS; 
 #//JS/const SimEntity = require('../../SimLuxJS.js').SimEntity;
 # Py - specific 
-import math
-import time
+import argparse
+import os
+import sys
 import simpy
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'PerformanceTest'))
+from distributions import Normal, Uniform # block-sampled NumPy streams, see PerformanceTest/distributions.py
+from variate_streams import EntityStreams, experiment_seed # the cars' stream; seed of measured experiment k or of a warm-up one (0, -1, ...)
+from benchmark_harness import GC_MODES, time_replications, time_stats # warm-up, GC modes and mean/min/stdev, see PerformanceTest/benchmark_harness.py
 env = simpy.Environment()
 #//JS/ const simLuxJS = new SimLuxJS();
 #//JS/ const toll = simLuxJS.createResource(1);
@@ -20,7 +25,9 @@ toll = simpy.Resource(env, capacity=1)
 global_eventid = 0;
 timeDigits1 = 100; #// = 2 digits 
 UseDistributionNr = 0;
-perftime_Min=1000000; 
+RANDOM_SEED = 42;  #// seed of the cars' stream in experiment k: RANDOM_SEED + k, as in cardemo_simple.py 
+simWarmup = 2;  #// experiments run and discarded before the measured ones (--warmup) 
+simGcMode = 'on';  #// 'on', 'off' or 'freeze': Python's garbage collector during each experiment (--gc) 
 
 def simlog(dbglv, logtext ) : 
  if (dbglv_Global>=dbglv) :
@@ -31,14 +38,9 @@ def simlog(dbglv, logtext ) :
       print ( simlogtext ) ; 
      
 
-def normalDistribution(mean, sigma) :
-   i=0;  x = 0.0; n=30; xn = 0.0; 
-   for i in range (1 , n) :
-         x = x + math.random(); 
-   xn = (x/n + mean ) * sigma  ; 
-   if (dbglv>=4) :
-                  simlog("    $DIST$ xn= " +xn ) ; 
-   return xn; 
+#// Variation added to the drive times, rounded to timeDigits1 like Math.round(x * timeDigits1)/timeDigits1 
+uniformDistribution = Uniform(0, 2, time_digits=timeDigits1); #// UseDistributionNr 1 
+normalDistribution = Normal(2, 1, time_digits=timeDigits1);   #// UseDistributionNr 2 
 
 
 def car(env,simid, carid, parktime, drivetime1, tolltime,drivetime2) : 
@@ -66,91 +68,90 @@ def car(env,simid, carid, parktime, drivetime1, tolltime,drivetime2) :
     #// continue after toll station 
     simlog(3, " Car " + str(carid) + " Driving again to EXIT " + " with drivetime=" + str(drivetime2) );
     # await simLuxJS.advance(drivetime2);
-    yield env.timeout(drivetime1); global_eventid+=1;
+    yield env.timeout(drivetime2); global_eventid+=1;
     
     simlog(3," Car " + str(carid) + " EXIT and Terminate!" );
      #};
    
+def  SetupExperiment (exp) : 
+    #// a fresh environment and toll station per experiment, so no run carries over the previous one 
+    global env; global toll; global tollqueueMax; global tollqueue; global global_eventid;
+    simlog(3, "### Start Simulation-experiment Number " + str(exp) + " ################ " ) ; 
+    tollqueueMax=-1; tollqueue =0; global_eventid = 0;
+
+    # // Model specific values --------------------------
+    Maxenid = 10000;
+
+    #// const simLuxJS = new simLuxJS();
+    #// const toll = simLuxJS.createResource(1); 
+    env = simpy.Environment(); toll = simpy.Resource(env, capacity=1); 
+    if ( UseDistributionNr != 0) : #// the cars' own random number stream, seed RANDOM_SEED + experiment number, warm-ups apart 
+        carStream = EntityStreams(experiment_seed(RANDOM_SEED, exp))['Car']; 
+    for enid in range (1, Maxenid) :
+        carid = (exp-1)*Maxenid +enid; # // Count Cars up .. 
+        parktime = 2+2*enid;
+        drivetime = 6;   tolltime  = 3; 
+        drivetime1 = drivetime;    drivetime2 = drivetime; 
+        if ( UseDistributionNr == 1) : #// Use uniform distribution
+         #{
+            drivetime1 = drivetime  + uniformDistribution.sample(carStream);
+            drivetime2= drivetime  + uniformDistribution.sample(carStream);
+         #} 
+        if ( UseDistributionNr == 2) : # // Use normal distribution
+            # {
+            drivetime1 = drivetime  + normalDistribution.sample(carStream);
+            drivetime2= drivetime  + normalDistribution.sample(carStream);
+            #} 
+            # simLuxJS.addSimEntity(new SimEntity(simEntity => car(exp, carid, parktime, drivetime1, tolltime ,drivetime2))) ;
+        env.process(car(env, exp, carid, parktime, drivetime1, tolltime ,drivetime2 ))
+        simlog(3, " ... created Enitity: " +  str(carid) + " with Parktime=" + str(parktime)) ; 
+    return env;
+
 def  DoSimulationExperiments ( ) :
-    #// measure runtime over a number of simulation experiments each with 3 cars
+    #// measure runtime over a number of simulation experiments each with Maxenid-1 cars
     simlog(1, "Start Simulation-experiments  ############ " ) ; 
-    global perftime_Min;
     #simLuxJS.enableLogging = false;  
     # // simLuxJS.enableLogging = true; 
 
     #// Experiment specific iit vaulues 
-    simexperiments = 20+1; 
-    perftime_Sum =0.0; 
-    perftime_count=0.0; 
+    simexperiments = 20; 
+    #// the warm-up experiments get the numbers 1-simWarmup .. 0, the measured ones 1 .. simexperiments 
+    expNumbers = iter(range(1 - simWarmup, simexperiments + 1)); 
+    results = [];  #// (exp, tollqueueMax, events) of the measured experiments 
 
-    # // Model specific values --------------------------
-    eventid = 0;
-    Maxenid = 10000;
-    enid = 0;
-
-    genInterval =1;
-    perf_runTime =0; 
-
-    # for (exp = 1; exp<=simexperiments; exp++)
-    for exp in range ( 1, simexperiments) :
-        simlog(3, "### Start Simulation-experiment Number " + str(exp) + " ################ " ) ; 
-        global tollqueueMax; global tollqueue;
-        tollqueueMax=-1; tollqueue =0;
-        
-        #// const simLuxJS = new simLuxJS();
-        #// const toll = simLuxJS.createResource(1); 
-        for enid in range (1, Maxenid) :
-            carid = (exp-1)*Maxenid +enid; # // Count Cars up .. 
-            parktime = 2+2*enid;
-            drivetime = 6;   tolltime  = 3; 
-            drivetime1 = drivetime;    drivetime2 = drivetime; 
-            if ( UseDistributionNr == 1) : #// Use uniform distribution
-             #{
-                drivetime1 = drivetime  + 2 * Math.round(Math.random() * timeDigits1)/timeDigits1;
-                drivetime2= drivetime  + 2 * Math.round(Math.random() * timeDigits1)/timeDigits1;
-             #} 
-            if ( UseDistributionNr == 2) : # // Use uniform distribution
-                # {
-                drivetime1 = drivetime  + Math.round(normalDistribution(2,1) * timeDigits1)/timeDigits1;
-                drivetime2= drivetime  +  Math.round(Math.random(2,1) * timeDigits1)/timeDigits1;
-                #} 
-                # simLuxJS.addSimEntity(new SimEntity(simEntity => car(exp, carid, parktime, drivetime1, tolltime ,drivetime2))) ;
-            env.process(car(env, exp, carid, parktime, drivetime1, tolltime ,drivetime2 ))
-            simlog(3, " ... created Enitity: " +  str(carid) + " with Parktime=" + str(parktime)) ; 
-
-            #}
-
-        # await simLuxJS.run(until=undefined).then();
-        
-        #' LEVEL INSIDE eDPERMENT
-        perf_runTime=time.perf_counter();
-        env.run()
-        perf_runTime=time.perf_counter()-perf_runTime;
-    
-        perf_runTime_show =   perf_runTime;
-        perftime_count = perftime_count +1; 
-        perftime_Sum +=  perf_runTime_show; 
-        #// let sigma_qsum2 = (perf_runTime_show  )
-    
-        if (perf_runTime_show < perftime_Min ) :
-            perftime_Min = perf_runTime_show; 
-    
-        simlog(3, "### EndSim exp=" + str(exp) + " with " + str(perf_runTime_show) + " s  MaxtollQueue=" + str(tollqueueMax)  + "### " ) ; 
-        #}
+    def collect(model) :
+        results.append((len(results) + 1, tollqueueMax, global_eventid));
+
+    # await simLuxJS.run(until=undefined).then();
+    #' LEVEL INSIDE eDPERMENT: the harness times setup (creating the cars) and env.run() separately 
+    times = time_replications(lambda: SetupExperiment(next(expNumbers)), lambda env: env.run(),
+                              simexperiments, simWarmup, simGcMode, collect);
+
+    for (exp, expTollqueueMax, events), (setupTime, runTime) in zip(results, times) :
+        simlog(3, "### EndSim exp=" + str(exp) + " with " + str(runTime / 1e9) + " s  MaxtollQueue=" + str(expTollqueueMax)  + "### " ) ; 
+    runStats = time_stats([runTime for setupTime, runTime in times]);
+    setupStats = time_stats([setupTime for setupTime, runTime in times]);
     #// end of all simulations 
-    #// xp--; // for cpompensation of for next ++ 
     simlog(0, "End of all simulations #############################################################");
-    simlog(0, " - runs           :  " +  str(exp)  );
-    simlog(0, " - Sum of all runs:  " +  str(perftime_Sum) );
-    simlog(0, " - mean  [s]      :  " +  str(perftime_Sum/ perftime_count)  );
-    simlog(0," - min            :  " +  str(perftime_Min)  );
-    simlog(0," - events         :  " +  str(global_eventid)  );
+    simlog(0, " - runs           :  " +  str(len(times)) + " after " + str(simWarmup) + " warm-up, gc " + simGcMode );
+    simlog(0, " - Sum of all runs:  " +  str(sum(runTime for setupTime, runTime in times) / 1e9) + " s" );
+    simlog(0, " - mean  [ms]     :  " +  str(runStats['mean'])  );
+    simlog(0," - min   [ms]     :  " +  str(runStats['min'])  );
+    simlog(0," - stdev [ms]     :  " +  str(runStats['stdev'])  );
+    simlog(0," - setup [ms]     :  " +  str(setupStats['mean']) + " mean, " + str(setupStats['min']) + " min, " + str(setupStats['stdev']) + " stdev" );
+    simlog(0," - events         :  " +  str(sum(events for exp, expTollqueueMax, events in results))  );
     #// simlog(0," - events/run     :  " +  eventid/exp  );
-    simlog(0," - tollqueueMax   :  " +  str(tollqueueMax)  );
+    simlog(0," - tollqueueMax   :  " +  str(max(expTollqueueMax for exp, expTollqueueMax, events in results))  );
 
     simlog(0,"End of measurements  #############################################################");
 #} // end of DoSimulationExperiments
 
+parser = argparse.ArgumentParser(description='Car demo performance test');
+parser.add_argument('--warmup', type=int, default=simWarmup);
+parser.add_argument('--gc', choices=GC_MODES, default=simGcMode);
+args = parser.parse_args();
+simWarmup = args.warmup; simGcMode = args.gc;
+
 simlog(0,"CALL DoSimulationExperiments ...  " ) ; 
 DoSimulationExperiments()  ; 
 simlog(0,"End of Call to DoSimulationExperiments ===================================  " ) ;